@@ -1,42 +1,250 @@
-from typing import Optional, Dict, Any
-from app.db.database import get_db
-from app.models.models import DBProfile
+from datetime import datetime, timezone
+from typing import Optional, Dict, Any, Iterable, List, Tuple, Union
+from sqlalchemy import String, and_, bindparam, cast, or_, update
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+from sqlmodel import select
+from app.db.controllers.search import index_profiles
+from app.db.database import get_async_db
+from app.models.models import BioGeneration, DBProfile
 
+# Rows per INSERT statement in bulk upserts
+UPSERT_BATCH_SIZE = 1000
 
-def get_user_by_profile_url(profile_url: str) -> Optional[DBProfile]:
+
+def profile_upsert(dialect_name: str, columns: Iterable[str], update: bool):
+    """
+    Build an INSERT ... ON CONFLICT statement for profile rows, to be executed
+    with a list of parameter dicts (executemany).
+    With update=False existing rows are left untouched, otherwise the given
+    columns overwrite the stored ones.
+    """
+    table = DBProfile.__table__
+    columns = [c for c in columns if c != "url"]
+    if dialect_name == "mysql":
+        stmt = mysql.insert(table)
+        if not update:
+            return stmt.prefix_with("IGNORE")
+        return stmt.on_duplicate_key_update({c: stmt.inserted[c] for c in columns})
+
+    dialect = postgresql if dialect_name == "postgresql" else sqlite
+    stmt = dialect.insert(table)
+    if not update or not columns:
+        return stmt.on_conflict_do_nothing(index_elements=["url"])
+    return stmt.on_conflict_do_update(
+        index_elements=["url"], set_={c: stmt.excluded[c] for c in columns}
+    )
+
+
+async def get_user_by_profile_url(profile_url: str) -> Optional[DBProfile]:
     """
     Retrieve a user from the database based on their profile URL.
     """
-    with get_db() as db:
-        return db.query(DBProfile).filter(DBProfile.url == profile_url).first()
+    async with get_async_db() as db:
+        return await db.get(DBProfile, profile_url)
 
 
-def save_new_user(url: str, person: str, scrapped_data: Dict[str, Any]) -> DBProfile:
+async def get_profiles_by_urls(urls: List[str]) -> Dict[str, DBProfile]:
     """
-    Save a new user profile in the database.
+    Retrieve the stored profiles for many URLs with a single IN query.
     """
-    with get_db() as db:
-        # Check if user exists
-        user = db.query(DBProfile).filter(DBProfile.url == url).first()
-        if user:
-            return user
+    if not urls:
+        return {}
+    async with get_async_db() as db:
+        rows = await db.exec(select(DBProfile).where(DBProfile.url.in_(set(urls))))
+        return {user.url: user for user in rows.all()}
 
-        # Create new user profile
-        user = DBProfile(url=url, person=person, scrapped_data=scrapped_data)
-        db.add(user)
-        db.commit()
-        db.refresh(user)
-        return user
+
+async def save_new_user(
+    url: str,
+    person: str,
+    scrapped_data: str,
+    content_hash: Optional[str] = None,
+    etag: Optional[str] = None,
+    last_modified: Optional[str] = None,
+) -> DBProfile:
+    """
+    Save a new user profile in the database, with the validators of the
+    fetch it was scraped from.
+    """
+    async with get_async_db() as db:
+        # Insert unless the user exists; a concurrent insert cannot race this
+        row = {
+            "url": url,
+            "person": person,
+            "scrapped_data": scrapped_data,
+            "content_hash": content_hash,
+            "fetched_at": datetime.now(timezone.utc),
+            "etag": etag,
+            "last_modified": last_modified,
+        }
+        stmt = profile_upsert(db.bind.dialect.name, row, update=False)
+        await db.execute(stmt, [row])
+        await index_profiles(db, [url])
+        await db.commit()
+        return await db.get(DBProfile, url)
 
 
-def update_user_bio(url: str, bio: Dict[str, Any]) -> Optional[DBProfile]:
+async def update_user_bio(
+    url: str, bio: Union[BioGeneration, Dict[str, Any]]
+) -> Optional[DBProfile]:
     """
     Update the bio of an existing user profile.
     """
-    with get_db() as db:
-        user = db.query(DBProfile).filter(DBProfile.url == url).first()
+    async with get_async_db() as db:
+        user = await db.get(DBProfile, url)
         if user:
-            user.bio = bio
-            db.commit()
-            db.refresh(user)
+            user.bio = BioGeneration.model_validate(bio)
+            user.bio_updated_at = datetime.now(timezone.utc)
+            await db.flush()
+            await index_profiles(db, [url])
+            await db.commit()
+            await db.refresh(user)
         return user
+
+
+async def get_stale_profiles(before: datetime, limit: int) -> List[DBProfile]:
+    """
+    List up to limit profiles last fetched before the given time, never
+    fetched ones and the oldest first. Profiles whose revalidation failed
+    after that time are left out, so pages that keep failing are retried
+    once per period instead of heading every batch.
+    """
+    async with get_async_db() as db:
+        rows = await db.exec(
+            select(DBProfile)
+            .where(or_(DBProfile.fetched_at.is_(None), DBProfile.fetched_at < before))
+            .where(
+                or_(
+                    DBProfile.fetch_failed_at.is_(None),
+                    DBProfile.fetch_failed_at < before,
+                )
+            )
+            .order_by(DBProfile.fetched_at.is_not(None), DBProfile.fetched_at)
+            .limit(limit)
+        )
+        return list(rows.all())
+
+
+async def record_profile_fetch(
+    url: str,
+    etag: Optional[str],
+    last_modified: Optional[str],
+    scrapped_data: Optional[str] = None,
+    content_hash: Optional[str] = None,
+) -> None:
+    """
+    Stamp a profile as fetched now with the new validators, replacing its
+    scraped data when given.
+    """
+    values = {
+        "fetched_at": datetime.now(timezone.utc),
+        "fetch_failed_at": None,
+        "etag": etag,
+        "last_modified": last_modified,
+    }
+    if scrapped_data is not None:
+        values["scrapped_data"] = scrapped_data
+        values["content_hash"] = content_hash
+    async with get_async_db() as db:
+        await db.execute(update(DBProfile).where(DBProfile.url == url).values(values))
+        if scrapped_data is not None:
+            await index_profiles(db, [url])
+        await db.commit()
+
+
+async def record_profile_fetch_failure(url: str) -> None:
+    """
+    Stamp a profile's revalidation as failed now, keeping its data and
+    validators.
+    """
+    async with get_async_db() as db:
+        await db.execute(
+            update(DBProfile)
+            .where(DBProfile.url == url)
+            .values(fetch_failed_at=datetime.now(timezone.utc))
+        )
+        await db.commit()
+
+
+async def get_profile_names() -> List[Tuple[str, str, bool]]:
+    """
+    List (url, person, has_bio) for every stored profile.
+    """
+    async with get_async_db() as db:
+        # Legacy JSON rows may hold the text "null" until migrated
+        has_bio = and_(
+            DBProfile.bio.is_not(None), cast(DBProfile.bio, String) != "null"
+        )
+        rows = await db.exec(select(DBProfile.url, DBProfile.person, has_bio))
+        return [(url, person, bool(bio)) for url, person, bio in rows.all()]
+
+
+async def upsert_profiles(
+    rows: Iterable[Dict[str, Any]], batch_size: int = UPSERT_BATCH_SIZE
+) -> int:
+    """
+    Insert or update many profiles in one transaction.
+
+    Each row needs url and person; any other DBProfile columns it carries
+    (scrapped_data, bio, ...) overwrite the stored values. Rows with a bio get
+    bio_updated_at set. Rows are written in batches of batch_size, grouped by
+    the set of columns they carry.
+    """
+    now = datetime.now(timezone.utc)
+    written = 0
+    async with get_async_db() as db:
+        dialect_name = db.bind.dialect.name
+        batches: Dict[Tuple[str, ...], List[Dict[str, Any]]] = {}
+
+        async def flush(columns: Tuple[str, ...]) -> None:
+            batch = batches.pop(columns, [])
+            if batch:
+                stmt = profile_upsert(dialect_name, columns, update=True)
+                await db.execute(stmt, batch)
+                await index_profiles(db, [row["url"] for row in batch])
+                # Drop the rows indexing loaded so memory stays flat over a seed
+                db.expunge_all()
+
+        for row in rows:
+            if row.get("bio") is not None:
+                row = {**row, "bio_updated_at": now}
+            columns = tuple(sorted(row))
+            batches.setdefault(columns, []).append(row)
+            written += 1
+            if len(batches[columns]) >= batch_size:
+                await flush(columns)
+
+        for columns in list(batches):
+            await flush(columns)
+        await db.commit()
+    return written
+
+
+async def update_bios(bios: Dict[str, Dict[str, Any]]) -> None:
+    """
+    Set the bio of many existing profiles in one transaction (executemany
+    UPDATE keyed on url). URLs without a stored profile are ignored.
+    """
+    if not bios:
+        return
+    now = datetime.now(timezone.utc)
+    table = DBProfile.__table__
+    stmt = (
+        update(table)
+        .where(table.c.url == bindparam("match_url"))
+        .values(
+            bio=bindparam("bio", type_=table.c.bio.type),
+            bio_updated_at=bindparam("bio_updated_at"),
+        )
+    )
+    rows = [
+        {"match_url": url, "bio": bio, "bio_updated_at": now}
+        for url, bio in bios.items()
+    ]
+    async with get_async_db() as db:
+        for start in range(0, len(rows), UPSERT_BATCH_SIZE):
+            batch = rows[start : start + UPSERT_BATCH_SIZE]
+            await db.execute(stmt, batch)
+            await index_profiles(db, [row["match_url"] for row in batch])
+            db.expunge_all()
+        await db.commit()
@@ -0,0 +1,66 @@
+import time
+from typing import Any, Dict, Optional
+from sqlalchemy import delete, func, update
+from sqlmodel import select
+from app.db.database import get_async_db
+from app.models.models import DBGenerationCache
+
+
+async def get_cached_generation(key: str) -> Optional[Dict[str, Any]]:
+    """
+    Retrieve a cached generation and mark it as recently used.
+    """
+    async with get_async_db() as db:
+        entry = await db.get(DBGenerationCache, key)
+        if entry is None:
+            return None
+        await db.execute(
+            update(DBGenerationCache)
+            .where(DBGenerationCache.key == key)
+            .values(last_accessed=time.time())
+        )
+        await db.commit()
+        return entry.value
+
+
+async def save_cached_generation(key: str, value: Dict[str, Any], size: int) -> None:
+    """
+    Store a generation, replacing any previous value for the key.
+    """
+    async with get_async_db() as db:
+        await db.merge(
+            DBGenerationCache(
+                key=key, value=value, size=size, last_accessed=time.time()
+            )
+        )
+        await db.commit()
+
+
+async def evict_cached_generations(max_bytes: int) -> int:
+    """
+    Delete least recently used generations until the cache fits in max_bytes.
+    Returns the number of entries removed.
+    """
+    async with get_async_db() as db:
+        total = (
+            await db.exec(select(func.coalesce(func.sum(DBGenerationCache.size), 0)))
+        ).one()
+        if total <= max_bytes:
+            return 0
+
+        evicted = []
+        oldest = await db.exec(
+            select(DBGenerationCache.key, DBGenerationCache.size).order_by(
+                DBGenerationCache.last_accessed
+            )
+        )
+        for key, size in oldest.all():
+            if total <= max_bytes:
+                break
+            evicted.append(key)
+            total -= size
+        await db.execute(
+            delete(DBGenerationCache).where(DBGenerationCache.key.in_(evicted))
+        )
+        await db.commit()
+        return len(evicted)
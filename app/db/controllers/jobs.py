@@ -0,0 +1,111 @@
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+from sqlalchemy import update
+from sqlmodel import select
+from app.db.database import get_async_db
+from app.models.models import DBJob
+
+# Jobs in these states are still being worked on and absorb duplicates
+ACTIVE_STATUSES = ("queued", "running")
+
+# How often a claim is retried when another worker takes the same job
+CLAIM_ATTEMPTS = 5
+
+
+async def get_job(job_id: str) -> Optional[DBJob]:
+    """
+    Retrieve a job by id.
+    """
+    async with get_async_db() as db:
+        return await db.get(DBJob, job_id)
+
+
+async def get_active_job(dedup_key: str) -> Optional[DBJob]:
+    """
+    Retrieve the queued or running job for a dedupe key, if any.
+    """
+    async with get_async_db() as db:
+        rows = await db.exec(
+            select(DBJob)
+            .where(DBJob.dedup_key == dedup_key, DBJob.status.in_(ACTIVE_STATUSES))
+            .order_by(DBJob.created_at)
+            .limit(1)
+        )
+        return rows.first()
+
+
+async def create_job(job: DBJob) -> DBJob:
+    """
+    Insert a new job.
+    """
+    async with get_async_db() as db:
+        db.add(job)
+        await db.commit()
+        return job
+
+
+async def claim_next_job() -> Optional[DBJob]:
+    """
+    Mark the highest-priority available job as running and return it.
+    The status check in the UPDATE keeps two workers from claiming the
+    same job.
+    """
+    async with get_async_db() as db:
+        for _ in range(CLAIM_ATTEMPTS):
+            now = datetime.now(timezone.utc)
+            rows = await db.exec(
+                select(DBJob.id)
+                .where(DBJob.status == "queued", DBJob.available_at <= now)
+                .order_by(DBJob.priority.desc(), DBJob.created_at)
+                .limit(1)
+            )
+            job_id = rows.first()
+            if job_id is None:
+                return None
+            claimed = await db.execute(
+                update(DBJob)
+                .where(DBJob.id == job_id, DBJob.status == "queued")
+                .values(status="running", attempts=DBJob.attempts + 1, updated_at=now)
+            )
+            await db.commit()
+            if claimed.rowcount == 1:
+                return await db.get(DBJob, job_id)
+        return None
+
+
+async def update_job(job_id: str, **values: Any) -> None:
+    """
+    Set fields of a job and stamp it as updated.
+    """
+    values["updated_at"] = datetime.now(timezone.utc)
+    async with get_async_db() as db:
+        await db.execute(update(DBJob).where(DBJob.id == job_id).values(values))
+        await db.commit()
+
+
+async def finish_job(
+    job_id: str,
+    status: str,
+    result: Optional[Dict[str, Any]] = None,
+    error: Optional[str] = None,
+) -> None:
+    """
+    Record the final status of a job.
+    """
+    await update_job(job_id, status=status, result=result, error=error)
+
+
+async def requeue_expired_jobs(before: datetime) -> int:
+    """
+    Put jobs still running since before the given time back in the queue;
+    their worker is gone or has outlived the job timeout.
+    """
+    now = datetime.now(timezone.utc)
+    async with get_async_db() as db:
+        result = await db.execute(
+            update(DBJob)
+            .where(DBJob.status == "running", DBJob.updated_at < before)
+            .values(status="queued", available_at=now, updated_at=now)
+        )
+        await db.commit()
+        return result.rowcount
@@ -0,0 +1,207 @@
+import os
+import re
+from typing import Iterable, List, Optional, Tuple
+
+from sqlalchemy import bindparam, text
+from sqlalchemy.engine import Connection
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.db.database import get_async_db
+from app.models.models import BioGeneration, DBProfile
+
+# Leading characters of the scraped text that are indexed; the headline,
+# current role and company come first on profile pages
+SEARCH_INDEX_CONTENT_CHARS = int(os.getenv("SEARCH_INDEX_CONTENT_CHARS", "8000"))
+# Rows indexed per statement when (re)building the index
+SEARCH_INDEX_BATCH_SIZE = 500
+
+# bm25 column weights: person, bio, content
+SEARCH_WEIGHTS = (10.0, 3.0, 1.0)
+
+_TERM = re.compile(r"\w+")
+
+# rowid is the profiles table's rowid, so maintenance and joins are point lookups
+CREATE_SEARCH_INDEX = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS profiles_fts USING fts5("
+    "person, bio, content, "
+    "tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3')"
+)
+
+
+def create_search_index(conn: Connection) -> bool:
+    """
+    Create the FTS5 index over profiles (SQLite only).
+
+    Returns:
+        bool: True if the index was created and still has to be filled
+    """
+    if conn.dialect.name != "sqlite":
+        return False
+    exists = conn.execute(
+        text(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'profiles_fts'"
+        )
+    ).first()
+    conn.execute(text(CREATE_SEARCH_INDEX))
+    return exists is None
+
+
+def search_supported(db: AsyncSession) -> bool:
+    return db.bind.dialect.name == "sqlite"
+
+
+def bio_text(bio: Optional[BioGeneration]) -> str:
+    if bio is None:
+        return ""
+    return " ".join(
+        [
+            bio.summary,
+            *bio.interesting_facts,
+            *bio.topics_of_interest,
+            *bio.ice_breakers,
+        ]
+    )
+
+
+def match_query(query: str) -> Optional[str]:
+    """
+    Turn free text into an FTS5 query: every word must match, the last one
+    as a prefix so results follow the user as they type.
+    """
+    terms = _TERM.findall(query)
+    if not terms:
+        return None
+    quoted = [f'"{term}"' for term in terms]
+    quoted[-1] += "*"
+    return " ".join(quoted)
+
+
+async def index_profiles(db: AsyncSession, urls: Iterable[str]) -> None:
+    """
+    Refresh the index entries of the given profiles inside the caller's
+    transaction. Call after writing the profile rows, before committing.
+    """
+    urls = list(set(urls))
+    if not urls or not search_supported(db):
+        return
+    for start in range(0, len(urls), SEARCH_INDEX_BATCH_SIZE):
+        batch = urls[start : start + SEARCH_INDEX_BATCH_SIZE]
+        rowids = (
+            await db.execute(
+                text("SELECT rowid, url FROM profiles WHERE url IN :urls").bindparams(
+                    bindparam("urls", expanding=True)
+                ),
+                {"urls": batch},
+            )
+        ).all()
+        profiles = await db.exec(select(DBProfile).where(DBProfile.url.in_(batch)))
+        by_url = {profile.url: profile for profile in profiles.all()}
+        await _write_entries(
+            db, [(rowid, by_url[url]) for rowid, url in rowids if url in by_url]
+        )
+
+
+async def _write_entries(
+    db: AsyncSession, entries: List[Tuple[int, DBProfile]]
+) -> None:
+    if not entries:
+        return
+    await db.execute(
+        text("DELETE FROM profiles_fts WHERE rowid = :rowid"),
+        [{"rowid": rowid} for rowid, _ in entries],
+    )
+    await db.execute(
+        text(
+            "INSERT INTO profiles_fts (rowid, person, bio, content)"
+            " VALUES (:rowid, :person, :bio, :content)"
+        ),
+        [
+            {
+                "rowid": rowid,
+                "person": profile.person,
+                "bio": bio_text(profile.bio),
+                "content": (profile.scrapped_data or "")[:SEARCH_INDEX_CONTENT_CHARS],
+            }
+            for rowid, profile in entries
+        ],
+    )
+
+
+async def rebuild_search_index() -> int:
+    """
+    Re-index every stored profile, batch by batch. Returns the number of
+    profiles indexed.
+    """
+    indexed = 0
+    last_url = ""
+    async with get_async_db() as db:
+        if not search_supported(db):
+            return 0
+        await db.execute(text("DELETE FROM profiles_fts"))
+        await db.commit()
+        while True:
+            urls = (
+                await db.exec(
+                    select(DBProfile.url)
+                    .where(DBProfile.url > last_url)
+                    .order_by(DBProfile.url)
+                    .limit(SEARCH_INDEX_BATCH_SIZE)
+                )
+            ).all()
+            if not urls:
+                break
+            await index_profiles(db, urls)
+            await db.commit()
+            # Drop the loaded rows so memory stays flat over large tables
+            db.expunge_all()
+            indexed += len(urls)
+            last_url = urls[-1]
+    return indexed
+
+
+async def search_profiles(
+    query: str, limit: int = 20, offset: int = 0
+) -> List[Tuple[str, str, float, str, bool]]:
+    """
+    Rank stored profiles against a free-text query (name, company, keywords).
+
+    Returns:
+        List[Tuple[str, str, float, str, bool]]: (url, person, score, snippet,
+        has_bio), best first; higher scores are better matches
+    """
+    fts_query = match_query(query)
+    if fts_query is None:
+        return []
+    async with get_async_db() as db:
+        if not search_supported(db):
+            # No FTS engine: fall back to a name prefix match
+            rows = await db.exec(
+                select(DBProfile.url, DBProfile.person, DBProfile.bio.is_not(None))
+                .where(DBProfile.person.ilike(f"{query.strip()}%"))
+                .order_by(DBProfile.person)
+                .offset(offset)
+                .limit(limit)
+            )
+            return [
+                (url, person, 0.0, "", bool(has_bio))
+                for url, person, has_bio in rows.all()
+            ]
+
+        weights = ", ".join(str(w) for w in SEARCH_WEIGHTS)
+        rows = await db.execute(
+            text(
+                "SELECT p.url, p.person, bm25(profiles_fts, " + weights + ") AS score,"
+                " snippet(profiles_fts, -1, '[', ']', '...', 12),"
+                " p.bio IS NOT NULL"
+                " FROM profiles_fts JOIN profiles AS p ON p.rowid = profiles_fts.rowid"
+                " WHERE profiles_fts MATCH :query"
+                " ORDER BY score LIMIT :limit OFFSET :offset"
+            ),
+            {"query": fts_query, "limit": limit, "offset": offset},
+        )
+        # bm25 is lower-is-better; flip it so callers sort descending
+        return [
+            (url, person, -score, snippet, bool(has_bio))
+            for url, person, score, snippet, has_bio in rows.all()
+        ]
@@ -1,29 +1,143 @@
+import os
+from datetime import datetime, timezone
 from sqlmodel import SQLModel, create_engine, Session
-from sqlalchemy.pool import StaticPool
-from contextlib import contextmanager
-from typing import Generator
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlalchemy import event, inspect, text
+from sqlalchemy.engine import Connection, make_url
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from contextlib import asynccontextmanager, contextmanager
+from dotenv import load_dotenv
+from typing import AsyncGenerator, Generator
+from app.graph.utils.metrics import instrument_engine
 
-DATABASE_URL = "sqlite:///./sql_app.db"
+load_dotenv()
 
-engine = create_engine(
-    DATABASE_URL,
-    connect_args={"check_same_thread": False},
-    poolclass=StaticPool,
+DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./sql_app.db")
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+
+# Async drivers used when DATABASE_URL does not name one explicitly
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "mysql": "mysql+aiomysql",
+}
+
+# Applied to every new SQLite connection: WAL lets readers proceed while a
+# writer commits, NORMAL sync is durable under WAL, and the page cache and
+# mmap keep hot profile rows out of the read syscall path.
+SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "busy_timeout": "5000",
+    "cache_size": "-20000",
+    "temp_store": "MEMORY",
+    "mmap_size": "268435456",
+}
+
+# Values given to existing rows when a column is added. Profiles stored
+# before fetched_at existed count as fetched when their bio was generated
+# (or now), rather than as never fetched and all due at the first sweep.
+COLUMN_BACKFILLS = {
+    ("profiles", "fetched_at"): "COALESCE(bio_updated_at, :now)",
+}
+
+
+def to_async_url(url: str) -> str:
+    """Return the async-driver variant of a database URL."""
+    parsed = make_url(url)
+    async_driver = ASYNC_DRIVERS.get(parsed.drivername)
+    if async_driver:
+        parsed = parsed.set(drivername=async_driver)
+    return parsed.render_as_string(hide_password=False)
+
+
+def is_sqlite(url: str) -> bool:
+    return make_url(url).get_backend_name() == "sqlite"
+
+
+def engine_options(url: str, asynchronous: bool = False) -> dict:
+    """Pool and connect options for the sync or async engine."""
+    pool = {"pool_size": DB_POOL_SIZE, "max_overflow": DB_MAX_OVERFLOW}
+    if not is_sqlite(url):
+        return pool
+    options = {"connect_args": {"check_same_thread": False}}
+    if make_url(url).database not in (None, "", ":memory:"):
+        # SQLite dialects default to NullPool/SingletonThreadPool; pool file
+        # connections so the pragmas and page cache survive between requests
+        pool["poolclass"] = AsyncAdaptedQueuePool if asynchronous else QueuePool
+        options.update(pool)
+    return options
+
+
+def set_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    cursor = dbapi_connection.cursor()
+    for pragma, value in SQLITE_PRAGMAS.items():
+        cursor.execute(f"PRAGMA {pragma}={value}")
+    cursor.close()
+
+
+engine = create_engine(DATABASE_URL, echo=False, **engine_options(DATABASE_URL))
+
+async_engine = create_async_engine(
+    to_async_url(DATABASE_URL),
     echo=False,
+    pool_pre_ping=not is_sqlite(DATABASE_URL),
+    **engine_options(DATABASE_URL, asynchronous=True),
 )
 
+if is_sqlite(DATABASE_URL):
+    event.listen(engine, "connect", set_sqlite_pragmas)
+    event.listen(async_engine.sync_engine, "connect", set_sqlite_pragmas)
+
+instrument_engine(engine)
+instrument_engine(async_engine.sync_engine)
 
-def init_db():
+
+async def init_db():
     """Initialize the database, creating all tables."""
     from app.models.models import DBProfile
+    from app.db.controllers.search import create_search_index, rebuild_search_index
+
+    async with async_engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+        await conn.run_sync(add_missing_columns)
+        index_created = await conn.run_sync(create_search_index)
+    if index_created:
+        # Existing databases get their profiles indexed once
+        await rebuild_search_index()
 
-    SQLModel.metadata.create_all(bind=engine)
+
+def add_missing_columns(conn: Connection):
+    """
+    Add nullable columns introduced after a table was first created,
+    backfilling those listed in COLUMN_BACKFILLS.
+    """
+    inspector = inspect(conn)
+    now = datetime.now(timezone.utc)
+    for table in SQLModel.metadata.sorted_tables:
+        existing = {column["name"] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in existing or not column.nullable:
+                continue
+            column_type = column.type.compile(dialect=conn.dialect)
+            conn.execute(
+                text(f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}")
+            )
+            backfill = COLUMN_BACKFILLS.get((table.name, column.name))
+            if backfill:
+                conn.execute(
+                    text(f"UPDATE {table.name} SET {column.name} = {backfill}"),
+                    {"now": now},
+                )
 
 
 @contextmanager
 def get_db() -> Generator[Session, None, None]:
     """
-    Create a new database session and close it after use.
+    Create a new synchronous database session and close it after use.
+    Intended for scripts; request handlers use get_async_db.
     Yields:
         Session: SQLModel database session
     """
@@ -32,3 +146,14 @@ def get_db() -> Generator[Session, None, None]:
         yield db
     finally:
         db.close()
+
+
+@asynccontextmanager
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Check out a pooled async database session and close it after use.
+    Yields:
+        AsyncSession: SQLModel async database session
+    """
+    async with AsyncSession(async_engine, expire_on_commit=False) as db:
+        yield db
@@ -0,0 +1,113 @@
+import json
+import os
+import zlib
+from typing import Any, Optional, Type
+
+from pydantic import BaseModel
+from sqlalchemy import LargeBinary, Text
+from sqlalchemy.types import TypeDecorator
+
+# "zlib" (stdlib) or "zstd" (needs the zstandard package) for newly written text
+PROFILE_COMPRESSION = os.getenv("PROFILE_COMPRESSION", "zlib")
+PROFILE_COMPRESSION_LEVEL = int(os.getenv("PROFILE_COMPRESSION_LEVEL", "6"))
+
+# First byte of a stored value names its codec, so rows written with
+# different settings (or before compression existed) stay readable
+ZLIB_HEADER = b"z"
+ZSTD_HEADER = b"s"
+RAW_HEADER = b"r"
+
+
+def _zstd():
+    import zstandard
+
+    return zstandard
+
+
+def compress_text(
+    text: str,
+    codec: str = PROFILE_COMPRESSION,
+    level: int = PROFILE_COMPRESSION_LEVEL,
+) -> bytes:
+    """Encode text as a codec header followed by the compressed UTF-8 bytes"""
+    data = text.encode("utf-8")
+    if codec == "zstd":
+        return ZSTD_HEADER + _zstd().ZstdCompressor(level=level).compress(data)
+    if codec == "zlib":
+        return ZLIB_HEADER + zlib.compress(data, level)
+    if codec == "none":
+        return RAW_HEADER + data
+    raise ValueError(f"Unknown PROFILE_COMPRESSION: {codec}")
+
+
+def decompress_text(value: Any) -> Optional[str]:
+    """
+    Decode a stored value: compressed bytes, or the JSON-encoded text of
+    the legacy JSON column.
+    """
+    if value is None:
+        return None
+    if isinstance(value, memoryview):
+        value = value.tobytes()
+    if isinstance(value, bytes):
+        header, payload = value[:1], value[1:]
+        if header == ZLIB_HEADER:
+            return zlib.decompress(payload).decode("utf-8")
+        if header == ZSTD_HEADER:
+            return _zstd().ZstdDecompressor().decompress(payload).decode("utf-8")
+        if header == RAW_HEADER:
+            return payload.decode("utf-8")
+        value = value.decode("utf-8")
+    try:
+        legacy = json.loads(value)
+    except ValueError:
+        return value
+    if legacy is None:
+        return None
+    return legacy if isinstance(legacy, str) else json.dumps(legacy)
+
+
+class CompressedText(TypeDecorator):
+    """Text column stored compressed in a BLOB, decompressed on load"""
+
+    impl = LargeBinary
+    cache_ok = True
+
+    def process_bind_param(self, value: Any, dialect) -> Optional[bytes]:
+        if value is None:
+            return None
+        if not isinstance(value, str):
+            # Structured scrapes (e.g. seed files) are kept as their JSON text
+            value = json.dumps(value, ensure_ascii=False)
+        return compress_text(value)
+
+    def process_result_value(self, value: Any, dialect) -> Optional[str]:
+        return decompress_text(value)
+
+
+class PydanticJSON(TypeDecorator):
+    """
+    Pydantic model stored as compact JSON text and validated straight from
+    that text on load, without building an intermediate dict.
+    """
+
+    impl = Text
+    cache_ok = True
+
+    def __init__(self, model: Type[BaseModel], *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.model = model
+
+    def process_bind_param(self, value: Any, dialect) -> Optional[str]:
+        if value is None:
+            return None
+        if not isinstance(value, self.model):
+            value = self.model.model_validate(value)
+        return value.model_dump_json()
+
+    def process_result_value(self, value: Any, dialect) -> Optional[BaseModel]:
+        if value is None or value == "null":
+            return None
+        if isinstance(value, (bytes, memoryview)):
+            value = bytes(value)
+        return self.model.model_validate_json(value)
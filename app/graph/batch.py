@@ -0,0 +1,150 @@
+import asyncio
+import os
+from typing import AsyncGenerator, Dict, List, Optional, Tuple
+
+import structlog
+
+from app.db.controllers.bio import get_profiles_by_urls
+from app.graph.checkpoints import graph_runner
+from app.graph.utils.bio_cache import bio_cache
+from app.graph.utils.profile_index import normalize_name, profile_index
+from app.schemas.schema import BatchItem, BatchItemResult
+
+logger = structlog.get_logger()
+
+BATCH_MAX_ITEMS = int(os.getenv("BATCH_MAX_ITEMS", "1000"))
+BATCH_MAX_CONCURRENCY = int(os.getenv("BATCH_MAX_CONCURRENCY", "8"))
+BATCH_ITEM_TIMEOUT_SECONDS = float(os.getenv("BATCH_ITEM_TIMEOUT_SECONDS", "60"))
+
+BatchKey = Tuple[str, Optional[str], bool]
+
+
+def batch_key(item: BatchItem) -> BatchKey:
+    """Identity used to dedupe batch items"""
+    return normalize_name(item.person), item.url, item.force_refresh
+
+
+async def resolve_cached(
+    items: Dict[BatchKey, BatchItem],
+) -> Dict[BatchKey, BatchItemResult]:
+    """
+    Answer cache hits for unique batch items with one bulk profiles query.
+
+    Args:
+        items: Unique batch items by dedupe key
+
+    Returns:
+        Dict[BatchKey, BatchItemResult]: Results for the items with a fresh bio
+    """
+    urls: Dict[BatchKey, str] = {}
+    for key, item in items.items():
+        if item.force_refresh:
+            continue
+        url = item.url or await profile_index.lookup(item.person)
+        if url:
+            urls[key] = url
+
+    profiles = await get_profiles_by_urls(list(urls.values()))
+    cached = {}
+    for key, url in urls.items():
+        bio = bio_cache.fresh_bio(profiles.get(url))
+        if bio:
+            cached[key] = BatchItemResult(
+                person=items[key].person,
+                url=url,
+                status="cached",
+                bio=bio.model_dump(),
+            )
+    return cached
+
+
+async def run_item(item: BatchItem, timeout: float) -> BatchItemResult:
+    """
+    Run one batch item through the graph with a timeout.
+
+    Args:
+        item: Batch item to process
+        timeout: Seconds before the item is abandoned
+
+    Returns:
+        BatchItemResult: Outcome of the graph run
+    """
+    try:
+        state = await asyncio.wait_for(
+            graph_runner.ainvoke(item.model_dump(exclude_none=True)), timeout=timeout
+        )
+    except asyncio.TimeoutError:
+        return BatchItemResult(person=item.person, url=item.url, status="timeout")
+    except Exception as e:
+        logger.error("batch_item_failed", person=item.person, error=str(e))
+        return BatchItemResult(
+            person=item.person, url=item.url, status="error", error=str(e)
+        )
+
+    bio = state.get("bio")
+    if hasattr(bio, "model_dump"):
+        bio = bio.model_dump()
+    return BatchItemResult(
+        person=item.person,
+        url=state.get("url"),
+        status="generated" if bio else "not_found",
+        bio=bio,
+    )
+
+
+async def run_batch(
+    items: List[BatchItem],
+    max_concurrency: Optional[int] = None,
+    item_timeout: Optional[float] = None,
+) -> AsyncGenerator[BatchItemResult, None]:
+    """
+    Process a batch of people, yielding one result per input item as soon as
+    it is available: deduped cache hits first, then graph runs in completion
+    order with bounded concurrency.
+
+    Args:
+        items: People to process
+        max_concurrency: Maximum graph runs in flight
+        item_timeout: Per-item timeout in seconds
+
+    Yields:
+        BatchItemResult: Result for each input item, tagged with its index
+    """
+    max_concurrency = min(
+        max_concurrency or BATCH_MAX_CONCURRENCY, BATCH_MAX_CONCURRENCY
+    )
+    item_timeout = item_timeout or BATCH_ITEM_TIMEOUT_SECONDS
+
+    indices: Dict[BatchKey, List[int]] = {}
+    unique: Dict[BatchKey, BatchItem] = {}
+    for index, item in enumerate(items):
+        key = batch_key(item)
+        indices.setdefault(key, []).append(index)
+        unique.setdefault(key, item)
+
+    def fan_out(key: BatchKey, result: BatchItemResult):
+        for index in indices[key]:
+            yield result.model_copy(update={"index": index})
+
+    cached = await resolve_cached(unique)
+    for key, result in cached.items():
+        for line in fan_out(key, result):
+            yield line
+
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def bounded(key: BatchKey) -> Tuple[BatchKey, BatchItemResult]:
+        async with semaphore:
+            return key, await run_item(unique[key], item_timeout)
+
+    pending = [
+        asyncio.ensure_future(bounded(key)) for key in unique if key not in cached
+    ]
+    try:
+        for next_done in asyncio.as_completed(pending):
+            key, result = await next_done
+            for line in fan_out(key, result):
+                yield line
+    finally:
+        for task in pending:
+            task.cancel()
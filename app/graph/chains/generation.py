@@ -1,18 +1,105 @@
 import os
-from typing import Optional
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
 from dataclasses import dataclass
 from dotenv import load_dotenv
 from langchain.prompts import ChatPromptTemplate
-from langchain_core.runnables import RunnableSequence
-from langchain_openai import ChatOpenAI
+from langchain_core.callbacks import AsyncCallbackHandler
+from langchain_core.outputs import LLMResult
+from langchain_core.runnables import Runnable, RunnableSequence
 
+from app.graph.utils.generation_cache import (
+    GenerationCache,
+    build_generation_cache,
+    generation_cache_key,
+)
+from app.graph.utils.context import CHARS_PER_TOKEN, profile_signals
+from app.graph.utils.metrics import (
+    LLM_CALL_SECONDS,
+    LLM_COST,
+    LLM_ESCALATIONS,
+    LLM_ROUTES,
+    LLM_TOKENS,
+    track_call,
+)
+from app.graph.utils.progress import report_progress
+from app.graph.utils.rate_limit import rate_limiter
 from app.models.models import BioGeneration
 
+if TYPE_CHECKING:
+    from langchain_openai import ChatOpenAI
+
 # Load environment variables from .env file
 load_dotenv()
 
 # Retrieve the OPENAI_MODEL from environment variables
 OPENAI_MODEL = os.getenv("OPENAI_MODEL")
+# Cheaper model for thin profiles; every request uses OPENAI_MODEL when unset
+OPENAI_SMALL_MODEL = os.getenv("OPENAI_SMALL_MODEL")
+# Contexts up to this many tokens, or with fewer professional terms than
+# MODEL_ROUTING_MIN_SIGNALS, go to the small model in the balanced tier
+MODEL_ROUTING_SMALL_MAX_TOKENS = int(
+    os.getenv("MODEL_ROUTING_SMALL_MAX_TOKENS", "1500")
+)
+MODEL_ROUTING_MIN_SIGNALS = int(os.getenv("MODEL_ROUTING_MIN_SIGNALS", "8"))
+# Retry on OPENAI_MODEL when the small model leaves fields ungenerated
+MODEL_ROUTING_CASCADE = os.getenv("MODEL_ROUTING_CASCADE", "true").lower() == "true"
+# Tier used when the request names none
+MODEL_ROUTING_DEFAULT_TIER = os.getenv("MODEL_ROUTING_DEFAULT_TIER", "balanced")
+# USD per million prompt:completion tokens, e.g. "gpt-4o-mini=0.15:0.6,gpt-4o=2.5:10"
+MODEL_PRICES = os.getenv("MODEL_PRICES", "")
+
+# "fast" always uses the small model, "quality" the large one and "balanced"
+# routes on the context
+MODEL_TIERS = ("fast", "balanced", "quality")
+
+# What the prompt asks the model to write for fields it has no data for
+UNABLE_TO_GENERATE = "Unable to generate"
+
+# Bump whenever the prompt changes so cached generations are not reused
+PROMPT_VERSION = "2"
+
+
+def parse_model_prices(spec: str) -> Dict[str, Tuple[float, float]]:
+    """
+    Parse MODEL_PRICES into {model: (prompt, completion)} USD per million
+    tokens. Malformed entries raise ValueError.
+    """
+    prices = {}
+    for entry in filter(None, (part.strip() for part in spec.split(","))):
+        model, _, rates = entry.partition("=")
+        prompt, _, completion = rates.partition(":")
+        prices[model.strip()] = (float(prompt), float(completion))
+    return prices
+
+
+class TokenUsageHandler(AsyncCallbackHandler):
+    """
+    Count the prompt and completion tokens reported by each LLM call, and
+    their estimated cost when the model has a price
+    """
+
+    def __init__(self, model: str, price: Optional[Tuple[float, float]] = None):
+        self.model = model
+        self.price = price
+
+    async def on_llm_end(self, response: LLMResult, **kwargs: Any) -> None:
+        for generations in response.generations:
+            for generation in generations:
+                usage = getattr(
+                    getattr(generation, "message", None), "usage_metadata", None
+                )
+                if not usage:
+                    continue
+                LLM_TOKENS.inc(usage["input_tokens"], model=self.model, kind="prompt")
+                LLM_TOKENS.inc(
+                    usage["output_tokens"], model=self.model, kind="completion"
+                )
+                if self.price is not None:
+                    cost = (
+                        usage["input_tokens"] * self.price[0]
+                        + usage["output_tokens"] * self.price[1]
+                    ) / 1_000_000
+                    LLM_COST.inc(cost, model=self.model)
 
 
 @dataclass
@@ -22,32 +109,139 @@ class BioGenerationConfig:
     temperature: float = 0.0
     model_name: str = OPENAI_MODEL
     max_tokens: Optional[int] = None
+    small_model_name: Optional[str] = OPENAI_SMALL_MODEL
+    small_max_tokens: int = MODEL_ROUTING_SMALL_MAX_TOKENS
+    min_signals: int = MODEL_ROUTING_MIN_SIGNALS
+    cascade: bool = MODEL_ROUTING_CASCADE
+
+
+@dataclass
+class ModelRoute:
+    """Model picked for one generation"""
+
+    model: str
+    reason: str
+    # Larger model to retry on when the output comes back incomplete
+    escalate_to: Optional[str] = None
+
+
+def needs_escalation(bio: BioGeneration) -> bool:
+    """Whether the model left any field ungenerated"""
+    values = [
+        bio.summary,
+        *bio.interesting_facts,
+        *bio.topics_of_interest,
+        *bio.ice_breakers,
+    ]
+    return any(UNABLE_TO_GENERATE.casefold() in value.casefold() for value in values)
 
 
 class BioGenerationChain:
     """Chain for generating structured biographies from LinkedIn data"""
 
-    def __init__(self, config: Optional[BioGenerationConfig] = None):
+    def __init__(
+        self,
+        config: Optional[BioGenerationConfig] = None,
+        cache: Optional[GenerationCache] = None,
+    ):
         """
         Initialize the bio generation chain with optional configuration.
         Args:
             config: Optional configuration for the generation process
+            cache: Optional generation cache, built from the environment by default
         """
         self.config = config or BioGenerationConfig()
-        self.llm = self._setup_llm()
-        self.chain = self._build_chain()
+        self.cache = cache or build_generation_cache()
+        self.prices = parse_model_prices(MODEL_PRICES)
+        self._token_usage: Dict[str, TokenUsageHandler] = {}
+        # OpenAI clients are built on first use (or by warm_up in the app
+        # lifespan) so importing this module stays cheap and works offline
+        self._chains: Dict[str, Runnable] = {}
+        self._fixed_chain: Optional[Runnable] = None
+
+    @property
+    def models(self) -> List[str]:
+        """Models requests can be routed to, largest first"""
+        small = self.config.small_model_name
+        if small and small != self.config.model_name:
+            return [self.config.model_name, small]
+        return [self.config.model_name]
 
-    def _setup_llm(self) -> ChatOpenAI:
+    def chain_for(self, model: str) -> Runnable:
+        """The generation chain of a model, built on first access"""
+        if self._fixed_chain is not None:
+            return self._fixed_chain
+        if model not in self._chains:
+            self._chains[model] = self._build_chain(model)
+        return self._chains[model]
+
+    @property
+    def chain(self) -> Runnable:
+        """The generation chain of the default model"""
+        return self.chain_for(self.config.model_name)
+
+    @chain.setter
+    def chain(self, chain: Runnable) -> None:
+        # Serve every model with this chain, e.g. a stand-in for load tests
+        self._fixed_chain = chain
+
+    def warm_up(self) -> None:
+        """Build the chains ahead of the first request"""
+        for model in self.models:
+            self.chain_for(model)
+
+    def token_usage(self, model: str) -> TokenUsageHandler:
+        if model not in self._token_usage:
+            self._token_usage[model] = TokenUsageHandler(model, self.prices.get(model))
+        return self._token_usage[model]
+
+    def route(self, scrapped_data: str, tier: Optional[str] = None) -> ModelRoute:
+        """
+        Pick the model for a generation. Thin profiles gain little from the
+        large model, so they go to the small one, with a retry on the large
+        one if the output still comes back incomplete.
+
+        Args:
+            scrapped_data: Profile data to generate from
+            tier: One of MODEL_TIERS, MODEL_ROUTING_DEFAULT_TIER when None
+
+        Returns:
+            ModelRoute: The model to call first and the one to escalate to
+        """
+        tier = tier or MODEL_ROUTING_DEFAULT_TIER
+        if tier not in MODEL_TIERS:
+            raise ValueError(f"Unknown model tier: {tier}")
+        large = self.config.model_name
+        if len(self.models) == 1:
+            return ModelRoute(large, "single_model")
+        small = self.config.small_model_name
+        if tier == "quality":
+            return ModelRoute(large, "quality_tier")
+        if tier == "fast":
+            return ModelRoute(small, "fast_tier")
+
+        escalate_to = large if self.config.cascade else None
+        # Character estimate: routing only needs the order of magnitude
+        if len(scrapped_data) / CHARS_PER_TOKEN <= self.config.small_max_tokens:
+            return ModelRoute(small, "small_context", escalate_to)
+        if profile_signals(scrapped_data) < self.config.min_signals:
+            return ModelRoute(small, "few_signals", escalate_to)
+        return ModelRoute(large, "rich_profile")
+
+    def _setup_llm(self, model: str) -> "ChatOpenAI":
         """Configure the language model with structured output"""
+        from langchain_openai import ChatOpenAI
 
         llm = ChatOpenAI(
             temperature=self.config.temperature,
-            model_name=self.config.model_name,
+            model_name=model,
             max_tokens=self.config.max_tokens,
+            # Report token usage on streamed responses as well
+            stream_usage=True,
         )
         return llm.with_structured_output(BioGeneration)
 
-    def _build_chain(self) -> RunnableSequence:
+    def _build_chain(self, model: str) -> RunnableSequence:
         """Build the generation chain with optimized prompt"""
         system = """Generate LinkedIn bio from provided profile data.
                     If field cannot be generated due to insufficient data, mark as 'Unable to generate - needs authentication'.
@@ -55,8 +249,7 @@ class BioGenerationChain:
                     1. Summary: Role & achievements
                     2. Facts: Professional insights
                     3. Interests: Discussion topics
-                    4. Ice-breakers: Conversation starters
-                    Context: {scrapped_data}"""
+                    4. Ice-breakers: Conversation starters"""
 
         prompt = ChatPromptTemplate.from_messages(
             [
@@ -65,7 +258,52 @@ class BioGenerationChain:
             ]
         )
 
-        return prompt | self.llm
+        return prompt | self._setup_llm(model)
+
+    async def agenerate(
+        self,
+        person: str,
+        scrapped_data: str,
+        tags: Optional[List[str]] = None,
+        tier: Optional[str] = None,
+    ) -> BioGeneration:
+        """
+        Generate a bio on the routed model, reusing a cached generation for
+        identical inputs.
+        Args:
+            person: Name of the person
+            scrapped_data: Profile data to generate from
+            tags: Optional run tags, e.g. to tell streamed drafts apart
+            tier: Latency/quality tier, one of MODEL_TIERS
+        """
+        route = self.route(scrapped_data, tier)
+        LLM_ROUTES.inc(model=route.model, reason=route.reason)
+        bio = await self._agenerate(route.model, person, scrapped_data, tags)
+        if route.escalate_to and needs_escalation(bio):
+            LLM_ESCALATIONS.inc(from_model=route.model, to_model=route.escalate_to)
+            # Lets streaming clients discard the fields streamed so far
+            await report_progress(
+                "generate", "escalated", model=route.escalate_to, tags=tags or []
+            )
+            bio = await self._agenerate(route.escalate_to, person, scrapped_data, tags)
+        return bio
+
+    async def _agenerate(
+        self, model: str, person: str, scrapped_data: str, tags: Optional[List[str]]
+    ) -> BioGeneration:
+        key = generation_cache_key(model, PROMPT_VERSION, person, scrapped_data)
+        cached = await self.cache.get(key)
+        if cached is not None:
+            return BioGeneration.model_validate(cached)
+
+        await rate_limiter("openai").acquire()
+        with track_call("openai"), LLM_CALL_SECONDS.time(model=model):
+            bio = await self.chain_for(model).ainvoke(
+                {"person": person, "scrapped_data": scrapped_data},
+                config={"callbacks": [self.token_usage(model)], "tags": tags or []},
+            )
+        await self.cache.set(key, bio.model_dump())
+        return bio
 
     @property
     def generation_chain(self) -> RunnableSequence:
@@ -75,4 +313,10 @@ class BioGenerationChain:
 
 # Initialize the optimized chain with default config
 bio_generator = BioGenerationChain()
-generation_chain: RunnableSequence = bio_generator.generation_chain
+
+
+def __getattr__(name: str) -> Any:
+    # Resolve the module-level chain lazily, on first access
+    if name == "generation_chain":
+        return bio_generator.generation_chain
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,342 @@
+import asyncio
+import hashlib
+import json
+import os
+import time
+import uuid
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
+
+import aiosqlite
+import structlog
+from langchain_core.runnables import RunnableConfig
+from langgraph.graph.state import CompiledStateGraph
+
+from app.graph.graph import build_graph, graph
+from app.graph.utils.metrics import CHECKPOINT_THREADS_COLLECTED, GRAPH_RUNS
+from app.graph.utils.profile_index import normalize_name
+from app.graph.utils.single_flight import SingleFlight
+
+logger = structlog.get_logger()
+
+# "sqlite" saves graph state after every node so failed runs can resume,
+# "none" runs the graph without checkpoints
+CHECKPOINT_BACKEND = os.getenv("CHECKPOINT_BACKEND", "sqlite")
+CHECKPOINT_PATH = os.getenv("CHECKPOINT_PATH", "./checkpoints.db")
+# How long a failed run stays resumable
+CHECKPOINT_TTL_SECONDS = float(os.getenv("CHECKPOINT_TTL_SECONDS", "3600"))
+CHECKPOINT_GC_INTERVAL_SECONDS = float(
+    os.getenv("CHECKPOINT_GC_INTERVAL_SECONDS", "300")
+)
+# A running run renews its claim on the thread; a crashed worker's lapses
+CHECKPOINT_LEASE_SECONDS = float(os.getenv("CHECKPOINT_LEASE_SECONDS", "30"))
+# How often a request checks whether another worker's run of its thread is over
+CHECKPOINT_POLL_INTERVAL_SECONDS = float(
+    os.getenv("CHECKPOINT_POLL_INTERVAL_SECONDS", "0.2")
+)
+
+# Request fields that identify a run: a retry with the same ones resumes it
+THREAD_FIELDS = ("person", "url", "force_refresh", "speculative", "tier")
+
+
+def thread_id(request: Dict[str, Any]) -> str:
+    """Checkpoint thread of a graph request, identical in every process"""
+    identity = {field: request.get(field) for field in THREAD_FIELDS}
+    identity["person"] = normalize_name(identity["person"] or "")
+    identity["force_refresh"] = bool(identity["force_refresh"])
+    encoded = json.dumps(identity, sort_keys=True).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()[:32]
+
+
+class GraphRunner:
+    """
+    Runs the graph with a SQLite checkpointer. The state is saved after every
+    node, so when a run fails (an LLM timeout, a database write that gives up)
+    a retry of the same request resumes from the last completed node instead
+    of paying for the search and scrape again. Checkpoints of finished runs
+    are deleted right away; those of failed runs expire after ttl seconds.
+
+    Identical requests in one worker share a single run. Across workers a
+    run owns its thread while it executes (a row in checkpoint_runs with
+    the owning process and a heartbeat): a request in another worker waits
+    for that run to end instead of executing nodes on the same thread, and
+    resumes only once the owner has released the thread or stopped renewing
+    its lease.
+    """
+
+    def __init__(
+        self,
+        backend: str = CHECKPOINT_BACKEND,
+        path: str = CHECKPOINT_PATH,
+        ttl: float = CHECKPOINT_TTL_SECONDS,
+        gc_interval: float = CHECKPOINT_GC_INTERVAL_SECONDS,
+        lease_seconds: float = CHECKPOINT_LEASE_SECONDS,
+        poll_interval: float = CHECKPOINT_POLL_INTERVAL_SECONDS,
+    ):
+        if backend not in ("sqlite", "none"):
+            raise ValueError(f"Unknown CHECKPOINT_BACKEND: {backend}")
+        self.backend = backend
+        self.path = path
+        self.ttl = ttl
+        self.gc_interval = gc_interval
+        self.lease_seconds = lease_seconds
+        self.poll_interval = poll_interval
+        self.graph: CompiledStateGraph = graph
+        # Identifies this process's claims
+        self.owner = uuid.uuid4().hex
+        self._db: Optional[aiosqlite.Connection] = None
+        self._lock: Optional[asyncio.Lock] = None
+        # Concurrent identical invocations share one run
+        self._flight: SingleFlight[Dict[str, Any]] = SingleFlight()
+        # One run per thread at a time in this process, and how many want it
+        self._turns: Dict[str, asyncio.Lock] = {}
+        self._turn_users: Dict[str, int] = {}
+        self._gc_task: Optional[asyncio.Task] = None
+        self.logger = logger.bind(module="checkpoints")
+
+    @property
+    def enabled(self) -> bool:
+        return self._db is not None
+
+    async def start(self) -> None:
+        """Open the checkpoint database and compile the checkpointed graph"""
+        if self.backend == "none" or self._db is not None:
+            return
+        try:
+            from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+        except ImportError:
+            self.logger.warning(
+                "checkpoints_unavailable",
+                reason="langgraph-checkpoint-sqlite is not installed",
+            )
+            return
+
+        db = await aiosqlite.connect(self.path)
+        await db.execute("PRAGMA synchronous=NORMAL")
+        await db.execute("PRAGMA busy_timeout=5000")
+        saver = AsyncSqliteSaver(db)
+        # Enables WAL and creates the checkpoints and writes tables
+        await saver.setup()
+        await db.execute(
+            "CREATE TABLE IF NOT EXISTS checkpoint_runs ("
+            " thread_id TEXT PRIMARY KEY, started_at REAL NOT NULL,"
+            " owner TEXT, heartbeat_at REAL NOT NULL DEFAULT 0)"
+        )
+        async with db.execute("PRAGMA table_info(checkpoint_runs)") as cursor:
+            columns = {row[1] for row in await cursor.fetchall()}
+        if "owner" not in columns:
+            await db.execute("ALTER TABLE checkpoint_runs ADD COLUMN owner TEXT")
+            await db.execute(
+                "ALTER TABLE checkpoint_runs"
+                " ADD COLUMN heartbeat_at REAL NOT NULL DEFAULT 0"
+            )
+        await db.execute(
+            "CREATE INDEX IF NOT EXISTS ix_checkpoint_runs_started_at"
+            " ON checkpoint_runs (started_at)"
+        )
+        await db.commit()
+        self._db = db
+        # Statements of ours share the connection with the saver's
+        self._lock = saver.lock
+        self.graph = build_graph(saver)
+        self._gc_task = asyncio.create_task(self._gc_loop())
+
+    async def close(self) -> None:
+        if self._gc_task is not None:
+            self._gc_task.cancel()
+            await asyncio.gather(self._gc_task, return_exceptions=True)
+            self._gc_task = None
+        if self._db is not None:
+            await self._db.close()
+            self._db = None
+        self.graph = graph
+
+    async def _try_claim(self, thread: str) -> bool:
+        """Take ownership of a thread unless a live run elsewhere holds it"""
+        now = time.time()
+        async with self._lock:
+            await self._db.execute(
+                "INSERT INTO checkpoint_runs VALUES (?, ?, ?, ?)"
+                " ON CONFLICT(thread_id) DO UPDATE"
+                " SET owner = excluded.owner, heartbeat_at = excluded.heartbeat_at"
+                " WHERE checkpoint_runs.owner IS NULL"
+                " OR checkpoint_runs.owner = excluded.owner"
+                " OR checkpoint_runs.heartbeat_at < ?",
+                (thread, now, self.owner, now, now - self.lease_seconds),
+            )
+            await self._db.commit()
+            async with self._db.execute(
+                "SELECT owner FROM checkpoint_runs WHERE thread_id = ?", (thread,)
+            ) as cursor:
+                row = await cursor.fetchone()
+        return row is not None and row[0] == self.owner
+
+    @asynccontextmanager
+    async def _turn(self, thread: str) -> AsyncIterator[None]:
+        """
+        Hold the thread against other runs in this process; the database
+        claim cannot tell them apart.
+        """
+        lock = self._turns.setdefault(thread, asyncio.Lock())
+        self._turn_users[thread] = self._turn_users.get(thread, 0) + 1
+        try:
+            async with lock:
+                yield
+        finally:
+            self._turn_users[thread] -= 1
+            if not self._turn_users[thread]:
+                del self._turn_users[thread]
+                del self._turns[thread]
+
+    async def _claim(self, thread: str) -> None:
+        """Wait until no run in another worker holds the thread, then own it"""
+        waited = False
+        while not await self._try_claim(thread):
+            if not waited:
+                waited = True
+                self.logger.info("run_waiting", thread_id=thread)
+            await asyncio.sleep(self.poll_interval)
+
+    async def _heartbeat(self, thread: str) -> None:
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            try:
+                async with self._lock:
+                    await self._db.execute(
+                        "UPDATE checkpoint_runs SET heartbeat_at = ?"
+                        " WHERE thread_id = ? AND owner = ?",
+                        (time.time(), thread, self.owner),
+                    )
+                    await self._db.commit()
+            except Exception as e:
+                self.logger.warning("checkpoint_heartbeat_failed", error=str(e))
+
+    async def _release(self, thread: str, finished: bool) -> None:
+        """
+        Give up a thread: a finished run drops its checkpoints, a failed one
+        keeps them for the next identical request to resume.
+        """
+        async with self._lock:
+            if finished:
+                await self._delete(thread, ("checkpoints", "writes", "checkpoint_runs"))
+            else:
+                await self._db.execute(
+                    "UPDATE checkpoint_runs SET owner = NULL"
+                    " WHERE thread_id = ? AND owner = ?",
+                    (thread, self.owner),
+                )
+            await self._db.commit()
+
+    async def _delete(self, thread: str, tables: Tuple[str, ...]) -> None:
+        for table in tables:
+            await self._db.execute(
+                f"DELETE FROM {table} WHERE thread_id = ?", (thread,)
+            )
+
+    async def _prepare(
+        self, request: Dict[str, Any], thread: str
+    ) -> Tuple[Optional[Dict[str, Any]], RunnableConfig]:
+        """
+        Graph input and config for a request on a thread it owns: no input
+        (resume) when the thread has a run that stopped before the end.
+        """
+        config: RunnableConfig = {"configurable": {"thread_id": thread}}
+        snapshot = await self.graph.aget_state(config)
+        if snapshot.next:
+            GRAPH_RUNS.inc(mode="resumed")
+            self.logger.info("run_resumed", thread_id=thread, next=list(snapshot.next))
+            return None, config
+        GRAPH_RUNS.inc(mode="fresh")
+        async with self._lock:
+            if snapshot.metadata is not None:
+                # A finished run whose cleanup did not happen: start clean
+                await self._delete(thread, ("checkpoints", "writes"))
+            await self._db.execute(
+                "UPDATE checkpoint_runs SET started_at = ? WHERE thread_id = ?",
+                (time.time(), thread),
+            )
+            await self._db.commit()
+        return request, config
+
+    @asynccontextmanager
+    async def _run(
+        self, request: Dict[str, Any]
+    ) -> AsyncIterator[Tuple[Optional[Dict[str, Any]], RunnableConfig]]:
+        """Own the request's thread for the duration of one graph run"""
+        if not self.enabled:
+            GRAPH_RUNS.inc(mode="unchecked")
+            yield request, {}
+            return
+        thread = thread_id(request)
+        async with self._turn(thread):
+            await self._claim(thread)
+            heartbeat = asyncio.create_task(self._heartbeat(thread))
+            finished = False
+            try:
+                yield await self._prepare(request, thread)
+                finished = True
+            finally:
+                heartbeat.cancel()
+                await asyncio.gather(heartbeat, return_exceptions=True)
+                await self._release(thread, finished)
+
+    async def ainvoke(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Run the graph for a request, resuming its failed run if there is one"""
+        return await self._flight.do(thread_id(request), lambda: self._invoke(request))
+
+    async def _invoke(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        async with self._run(request) as (graph_input, config):
+            return await self.graph.ainvoke(graph_input, config)
+
+    async def astream_events(
+        self, request: Dict[str, Any]
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Stream the events of a run (v2 format), resuming like ainvoke"""
+        async with self._run(request) as (graph_input, config):
+            async for event in self.graph.astream_events(
+                graph_input, config, version="v2"
+            ):
+                yield event
+
+    async def collect_garbage(self) -> int:
+        """
+        Delete the checkpoints of runs started more than ttl seconds ago
+        that no live run owns, and of threads whose run record is gone.
+
+        Returns:
+            int: Number of expired runs removed
+        """
+        if self._db is None:
+            return 0
+        idle = "started_at < ? AND (owner IS NULL OR heartbeat_at < ?)"
+        expired = f"SELECT thread_id FROM checkpoint_runs WHERE {idle}"
+        known = "SELECT thread_id FROM checkpoint_runs"
+        now = time.time()
+        cutoff = (now - self.ttl, now - self.lease_seconds)
+        async with self._lock:
+            for table in ("checkpoints", "writes"):
+                await self._db.execute(
+                    f"DELETE FROM {table} WHERE thread_id IN ({expired})"
+                    f" OR thread_id NOT IN ({known})",
+                    cutoff,
+                )
+            cursor = await self._db.execute(
+                f"DELETE FROM checkpoint_runs WHERE {idle}", cutoff
+            )
+            await self._db.commit()
+        collected = cursor.rowcount
+        if collected:
+            CHECKPOINT_THREADS_COLLECTED.inc(collected)
+            self.logger.info("checkpoints_collected", runs=collected)
+        return collected
+
+    async def _gc_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.gc_interval)
+            try:
+                await self.collect_garbage()
+            except Exception as e:
+                self.logger.warning("checkpoint_gc_failed", error=str(e))
+
+
+graph_runner = GraphRunner()
@@ -1,2 +1,3 @@
 GENERATE = "generate"
+PREPARE_CONTEXT = "prepare_context"
 WEB_SEARCH = "web_search"
@@ -1,8 +1,11 @@
+from typing import Optional
 from dotenv import load_dotenv, find_dotenv
+from langgraph.checkpoint.base import BaseCheckpointSaver
 from langgraph.graph import END, StateGraph
 from app.graph.state import GraphState
-from app.graph.nodes import generate, process_profiles
-from app.graph.consts import WEB_SEARCH, GENERATE
+from app.graph.nodes import compact_context, generate, process_profiles
+from app.graph.consts import WEB_SEARCH, PREPARE_CONTEXT, GENERATE
+from app.graph.utils.metrics import timed_node
 
 # Load environment variables
 _ = load_dotenv(find_dotenv())
@@ -14,20 +17,29 @@ def save_graph_visualization(graph: StateGraph, filename: str = "graph.png") ->
         f.write(graph.get_graph().draw_mermaid_png())
 
 
-def should_continue(state: GraphState) -> bool:
+def should_continue(state: GraphState) -> str:
     url = state.url
     if url is None:
         return "NO_URL_FOUND"
+    if state.bio is not None:
+        return "BIO_CACHED"
     return "URL_FOUND"
 
 
-def build_graph() -> StateGraph:
-    """Construct and compile the state graph."""
+def build_graph(checkpointer: Optional[BaseCheckpointSaver] = None) -> StateGraph:
+    """
+    Construct and compile the state graph.
+
+    Args:
+        checkpointer: Saves the state after every node so failed runs can
+            resume; runs then need a thread_id in their config
+    """
     workflow = StateGraph(GraphState)
 
-    # Add nodes
-    workflow.add_node(WEB_SEARCH, process_profiles)
-    workflow.add_node(GENERATE, generate)
+    # Add nodes, timed per stage
+    workflow.add_node(WEB_SEARCH, timed_node(WEB_SEARCH, process_profiles))
+    workflow.add_node(PREPARE_CONTEXT, timed_node(PREPARE_CONTEXT, compact_context))
+    workflow.add_node(GENERATE, timed_node(GENERATE, generate))
 
     # Set entry point
     workflow.set_entry_point(WEB_SEARCH)
@@ -36,14 +48,19 @@ def build_graph() -> StateGraph:
     workflow.add_conditional_edges(
         WEB_SEARCH,
         should_continue,
-        path_map={"NO_URL_FOUND": END, "URL_FOUND": GENERATE},
+        path_map={
+            "NO_URL_FOUND": END,
+            "BIO_CACHED": END,
+            "URL_FOUND": PREPARE_CONTEXT,
+        },
     )
+    workflow.add_edge(PREPARE_CONTEXT, GENERATE)
     workflow.add_edge(GENERATE, END)
 
-    return workflow.compile()
+    return workflow.compile(checkpointer=checkpointer)
 
 
-# Build and compile the graph
+# Build and compile the graph; render it with `python -m scripts.render_graph`.
+# Request handlers run it through graph_runner (app.graph.checkpoints), which
+# adds checkpointing; LangServe routes use it as is.
 graph = build_graph()
-
-save_graph_visualization(graph)
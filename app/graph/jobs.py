@@ -0,0 +1,225 @@
+import asyncio
+import os
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import AsyncGenerator, Dict, List
+
+import structlog
+
+from app.db.controllers.jobs import (
+    claim_next_job,
+    create_job,
+    finish_job,
+    get_active_job,
+    get_job,
+    requeue_expired_jobs,
+    update_job,
+)
+from app.graph.checkpoints import graph_runner
+from app.graph.utils.profile_index import normalize_name, profile_index
+from app.models.models import DBJob
+from app.schemas.schema import JobRequest, JobStatus
+
+logger = structlog.get_logger()
+
+# Jobs run concurrently by each process
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "4"))
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+JOB_TIMEOUT_SECONDS = float(os.getenv("JOB_TIMEOUT_SECONDS", "120"))
+# Base delay before a failed job is retried, doubled on every attempt
+JOB_RETRY_BACKOFF_SECONDS = float(os.getenv("JOB_RETRY_BACKOFF_SECONDS", "5"))
+# How often idle workers and status subscribers check the table for changes
+# made by other processes
+JOB_POLL_INTERVAL_SECONDS = float(os.getenv("JOB_POLL_INTERVAL_SECONDS", "1"))
+
+TERMINAL_STATUSES = ("succeeded", "not_found", "failed")
+
+
+def job_status(job: DBJob) -> JobStatus:
+    """Public view of a job row"""
+    return JobStatus.model_validate(job, from_attributes=True)
+
+
+class JobQueue:
+    """
+    Persistent bio generation queue backed by the jobs table, drained by a
+    pool of in-process workers running the compiled graph. Active jobs are
+    deduped by profile URL (or normalized name while the URL is unknown).
+    """
+
+    def __init__(
+        self,
+        workers: int = JOB_WORKERS,
+        max_attempts: int = JOB_MAX_ATTEMPTS,
+        timeout: float = JOB_TIMEOUT_SECONDS,
+    ):
+        """
+        Initialize the queue; workers are started by start().
+        Args:
+            workers: Number of concurrent workers in this process
+            max_attempts: Default runs allowed per job
+            timeout: Seconds before a graph run is abandoned
+        """
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.timeout = timeout
+        self._tasks: List[asyncio.Task] = []
+        self._wakeup = asyncio.Event()
+        # Status changes made in this process, to push to subscribers
+        self._changed: Dict[str, asyncio.Event] = {}
+        self._submit_lock = asyncio.Lock()
+        self.logger = logger.bind(module="job_queue")
+
+    def start(self) -> None:
+        """Start the worker pool (idempotent)"""
+        if self._tasks:
+            return
+        self._wakeup = asyncio.Event()
+        self._tasks = [
+            asyncio.create_task(self._worker(n)) for n in range(self.workers)
+        ]
+
+    async def stop(self) -> None:
+        """Cancel the workers; their running jobs are requeued once expired"""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def submit(self, request: JobRequest) -> DBJob:
+        """
+        Queue a bio generation, or return the active job for the same profile.
+
+        Args:
+            request: Person, optional URL and scheduling options
+
+        Returns:
+            DBJob: The new or already active job
+        """
+        url = request.url or await profile_index.lookup(request.person)
+        dedup_key = url or f"person:{normalize_name(request.person)}"
+        async with self._submit_lock:
+            if not request.force_refresh:
+                active = await get_active_job(dedup_key)
+                if active:
+                    return active
+            now = datetime.now(timezone.utc)
+            job = await create_job(
+                DBJob(
+                    id=uuid.uuid4().hex,
+                    dedup_key=dedup_key,
+                    person=request.person,
+                    url=url,
+                    force_refresh=request.force_refresh,
+                    priority=request.priority,
+                    max_attempts=self.max_attempts,
+                    created_at=now,
+                    updated_at=now,
+                    available_at=now,
+                )
+            )
+        self.logger.info("job_submitted", job_id=job.id, person=job.person)
+        self._wakeup.set()
+        return job
+
+    async def watch(self, job_id: str) -> AsyncGenerator[JobStatus, None]:
+        """
+        Yield the status of a job every time it changes, ending once it is
+        finished.
+
+        Args:
+            job_id: Job to follow
+
+        Yields:
+            JobStatus: Current job status
+        """
+        last = None
+        while True:
+            changed = self._changed.setdefault(job_id, asyncio.Event())
+            changed.clear()
+            job = await get_job(job_id)
+            if job is None:
+                return
+            status = job_status(job)
+            if (status.status, status.attempts) != last:
+                last = (status.status, status.attempts)
+                yield status
+            if status.status in TERMINAL_STATUSES:
+                self._changed.pop(job_id, None)
+                return
+            try:
+                await asyncio.wait_for(changed.wait(), JOB_POLL_INTERVAL_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+
+    def _notify(self, job_id: str) -> None:
+        changed = self._changed.pop(job_id, None)
+        if changed:
+            changed.set()
+
+    async def _worker(self, number: int) -> None:
+        while True:
+            try:
+                job = await claim_next_job()
+            except Exception as e:
+                self.logger.error("job_claim_failed", worker=number, error=str(e))
+                job = None
+
+            if job is None:
+                await self._idle()
+                continue
+
+            self._notify(job.id)
+            await self._run(job)
+            self._notify(job.id)
+
+    async def _idle(self) -> None:
+        """Wait for a submission in this process or the next poll"""
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), JOB_POLL_INTERVAL_SECONDS)
+            self._wakeup.clear()
+        except asyncio.TimeoutError:
+            # Reclaim jobs whose worker died without finishing them
+            expired = datetime.now(timezone.utc) - timedelta(seconds=self.timeout * 2)
+            await requeue_expired_jobs(expired)
+
+    async def _run(self, job: DBJob) -> None:
+        """Run a claimed job through the graph and record the outcome"""
+        if job.attempts > job.max_attempts:
+            await finish_job(job.id, "failed", error=job.error or "Too many attempts")
+            return
+
+        self.logger.info("job_started", job_id=job.id, attempt=job.attempts)
+        request = {"person": job.person, "force_refresh": job.force_refresh}
+        if job.url:
+            request["url"] = job.url
+        try:
+            # A retried job resumes after the last node its failed attempt finished
+            state = await asyncio.wait_for(graph_runner.ainvoke(request), self.timeout)
+        except Exception as e:
+            error = str(e) or type(e).__name__
+            self.logger.error("job_failed", job_id=job.id, error=error)
+            if job.attempts >= job.max_attempts:
+                await finish_job(job.id, "failed", error=error)
+                return
+            delay = JOB_RETRY_BACKOFF_SECONDS * 2 ** (job.attempts - 1)
+            await update_job(
+                job.id,
+                status="queued",
+                error=error,
+                available_at=datetime.now(timezone.utc) + timedelta(seconds=delay),
+            )
+            return
+
+        bio = state.get("bio")
+        if hasattr(bio, "model_dump"):
+            bio = bio.model_dump()
+        await finish_job(
+            job.id,
+            "succeeded" if bio else "not_found",
+            result={"url": state.get("url"), "bio": bio},
+        )
+        self.logger.info("job_finished", job_id=job.id, found=bool(bio))
+
+
+job_queue = JobQueue()
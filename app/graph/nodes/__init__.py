@@ -1,4 +1,5 @@
 from app.graph.nodes.generate import generate
+from app.graph.nodes.prepare_context import compact_context
 from app.graph.nodes.web_search import process_profiles
 
-__all__ = ["generate", "process_profiles"]
+__all__ = ["compact_context", "generate", "process_profiles"]
@@ -2,13 +2,20 @@ from typing import Any, Dict, Optional
 import structlog
 from tenacity import retry, stop_after_attempt, wait_exponential
 
-from app.db.controllers.bio import get_user_by_profile_url, update_user_bio
-from app.graph.chains.generation import generation_chain
+from app.db.controllers.bio import update_user_bio
+from app.graph.chains.generation import bio_generator as bio_chain
 from app.graph.state import GraphState
+from app.graph.utils.progress import report_progress
+from app.graph.utils.rate_limit import RateLimitExceeded
+from app.graph.utils.shared_state import SharedSingleFlight
 
 # Configure structured logging
 logger = structlog.get_logger()
 
+# Concurrent generations for the same profile URL, in any worker, share one
+# LLM call and write
+generation_flight: SharedSingleFlight[Dict[str, Any]] = SharedSingleFlight("generate")
+
 
 class BioGenerator:
     """
@@ -20,7 +27,7 @@ class BioGenerator:
         self.logger = logger.bind(module="bio_generator")
 
     async def generate_bio(
-        self, person: str, scrapped_data: Dict[str, Any]
+        self, person: str, scrapped_data: Dict[str, Any], tier: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Generate a bio using the generation chain.
@@ -28,6 +35,7 @@ class BioGenerator:
         Args:
             person (str): Name of the person
             scrapped_data (Dict[str, Any]): Scraped LinkedIn data
+            tier (Optional[str]): Latency/quality tier used to pick the model
 
         Returns:
             Dict[str, Any]: Generated bio
@@ -36,31 +44,14 @@ class BioGenerator:
             ValueError: If generation fails
         """
         try:
-            bio_response = await generation_chain.ainvoke(
-                {"person": person, "scrapped_data": scrapped_data}
-            )
-            return bio_response.dict()
+            bio_response = await bio_chain.agenerate(person, scrapped_data, tier=tier)
+            return bio_response.model_dump()
+        except RateLimitExceeded:
+            raise
         except Exception as e:
             self.logger.error("bio_generation_failed", person=person, error=str(e))
             raise ValueError(f"Failed to generate bio: {str(e)}")
 
-    def get_bio_from_db(self, url: str) -> Optional[Dict[str, Any]]:
-        """
-        Retrieve bio from database.
-
-        Args:
-            url (str): LinkedIn profile URL
-
-        Returns:
-            Optional[Dict[str, Any]]: Returns bio if exists, None otherwise
-        """
-        try:
-            user = get_user_by_profile_url(url)
-            return user.bio if user and user.bio else None
-        except Exception as e:
-            self.logger.error("bio_retrieval_from_db_failed", url=url, error=str(e))
-            return None
-
     @retry(
         stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=4, max=10)
     )
@@ -76,21 +67,45 @@ class BioGenerator:
             ValueError: If update fails after retries
         """
         try:
-            update_user_bio(url=url, bio=bio)
+            await update_user_bio(url=url, bio=bio)
             self.logger.info("bio_updated", url=url)
         except Exception as e:
             self.logger.error("bio_update_failed", url=url, error=str(e))
             raise ValueError(f"Failed to update bio in db: {str(e)}")
 
+    async def generate_and_store_bio(
+        self,
+        url: str,
+        person: str,
+        scrapped_data: Dict[str, Any],
+        tier: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Generate a bio and persist it for the profile URL.
+
+        Args:
+            url (str): LinkedIn profile URL
+            person (str): Name of the person
+            scrapped_data (Dict[str, Any]): Scraped LinkedIn data
+            tier (Optional[str]): Latency/quality tier used to pick the model
+
+        Returns:
+            Dict[str, Any]: Generated bio
+        """
+        bio = await self.generate_bio(person, scrapped_data, tier)
+        await self.update_bio(url, bio)
+        return bio
+
     async def process_bio(self, state: GraphState):
         """
-        Process bio generation request, using bio from db when available.
+        Process bio generation request. Cached bios are routed around this
+        node by the graph, so reaching it always means generating.
 
         Args:
             state (GraphState): Current state containing person information
 
         Returns:
-            UserBioData: Generated or db bio data
+            GraphState: State with the generated bio
 
         Raises:
             ValueError: If processing fails
@@ -101,17 +116,16 @@ class BioGenerator:
             url=state.url,
         )
 
-        # Check db first
-        bio = self.get_bio_from_db(state.url)
-        if bio:
-            self.logger.info("using_bio_from_db", person=state.person)
-            state.bio = bio
-
         # Generate new bio
         self.logger.info("generating_new_bio", person=state.person)
+        await report_progress("generate", "started", url=state.url)
         try:
-            bio = await self.generate_bio(state.person, state.scrapped_data)
-            await self.update_bio(state.url, bio)
+            bio = await generation_flight.do(
+                state.url,
+                lambda: self.generate_and_store_bio(
+                    state.url, state.person, state.scrapped_data, state.tier
+                ),
+            )
             state.bio = bio
             return state
         except Exception as e:
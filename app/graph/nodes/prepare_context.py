@@ -0,0 +1,46 @@
+import structlog
+
+from app.graph.chains.generation import OPENAI_MODEL
+from app.graph.state import GraphState
+from app.graph.utils.context import CONTEXT_TOKEN_BUDGET, prepare_context
+from app.graph.utils.executor import cpu_executor
+from app.graph.utils.progress import report_progress
+
+# Configure structured logging
+logger = structlog.get_logger()
+
+
+async def compact_context(state: GraphState) -> GraphState:
+    """
+    Deduplicate and trim the gathered profile data to the token budget
+    before generation.
+
+    Args:
+        state (GraphState): Current state containing the scraped data
+
+    Returns:
+        GraphState: State with compacted scrapped_data and tokens_saved
+    """
+    scrapped_data = state.scrapped_data or ""
+    context, report = await cpu_executor.run(
+        prepare_context,
+        state.person,
+        scrapped_data,
+        CONTEXT_TOKEN_BUDGET,
+        OPENAI_MODEL,
+        size_hint=len(scrapped_data),
+    )
+    logger.info(
+        "context_prepared",
+        person=state.person,
+        original_tokens=report.original_tokens,
+        final_tokens=report.final_tokens,
+        tokens_saved=report.tokens_saved,
+        duplicate_sentences=report.duplicate_sentences,
+        dropped_sentences=report.dropped_sentences,
+        truncated_sentences=report.truncated_sentences,
+    )
+    await report_progress("context", "done", tokens_saved=report.tokens_saved)
+    state.scrapped_data = context
+    state.tokens_saved = report.tokens_saved
+    return state
@@ -1,7 +1,30 @@
+import asyncio
+import os
 from typing import Any, Dict, List, Optional, TypedDict, Tuple
+import structlog
 from langchain_community.tools import TavilySearchResults
+from app.graph.nodes.generate import BioGenerator
 from app.graph.state import GraphState
-from app.graph.utils.scrape_profile import scrape_profile
+from app.graph.utils.bio_cache import bio_cache
+from app.graph.utils.context import CHARS_PER_TOKEN, CONTEXT_TOKEN_BUDGET
+from app.graph.utils.metrics import track_call
+from app.graph.utils.profile_index import normalize_name, profile_index
+from app.graph.utils.progress import report_progress
+from app.graph.utils.rate_limit import RateLimitExceeded, rate_limiter
+from app.graph.utils.scrape_profile import fetch_profile, scrape_profile
+from app.graph.utils.shared_state import SharedCache, SharedSingleFlight
+from app.graph.utils.speculation import Speculation, speculation_enabled
+from app.graph.utils.ttl_cache import TTLCache
+
+# Search results are reused for repeated queries within this window
+SEARCH_CACHE_TTL_SECONDS = int(os.getenv("SEARCH_CACHE_TTL_SECONDS", "3600"))
+SEARCH_CACHE_MAX_ENTRIES = int(os.getenv("SEARCH_CACHE_MAX_ENTRIES", "1024"))
+# Search results scraped in parallel, including the primary profile
+SCRAPE_TOP_K = int(os.getenv("SCRAPE_TOP_K", "3"))
+# Extra sources slower than this are dropped
+SCRAPE_SOURCE_TIMEOUT_SECONDS = float(os.getenv("SCRAPE_SOURCE_TIMEOUT_SECONDS", "15"))
+
+logger = structlog.get_logger()
 
 
 class SearchResult(TypedDict):
@@ -11,6 +34,17 @@ class SearchResult(TypedDict):
     content: str
 
 
+search_cache: TTLCache[List[SearchResult]] = TTLCache(
+    max_entries=SEARCH_CACHE_MAX_ENTRIES, ttl_seconds=SEARCH_CACHE_TTL_SECONDS
+)
+
+
+# Lets other workers reuse a search without calling Tavily again
+shared_search_cache = SharedCache("search", ttl=SEARCH_CACHE_TTL_SECONDS)
+
+search_flight: SharedSingleFlight[List[SearchResult]] = SharedSingleFlight("search")
+
+
 class ProfileData(TypedDict):
     """Type definition for profile data"""
 
@@ -63,10 +97,100 @@ async def search_profile(
     if not state.person:
         return []
 
-    web_search_tool = TavilySearchResults(max_results=max_search_results)
-    results = await web_search_tool.ainvoke({"query": state.person})
+    cache_key = (normalize_name(state.person), max_search_results)
+    cached = search_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    async def run_search() -> List[SearchResult]:
+        shared = await shared_search_cache.get(cache_key)
+        if shared is not None:
+            search_cache.set(cache_key, shared)
+            return shared
+
+        web_search_tool = TavilySearchResults(max_results=max_search_results)
+        await rate_limiter("tavily").acquire()
+        with track_call("tavily"):
+            results = await web_search_tool.ainvoke({"query": state.person})
+        results = results if results else []
+
+        if results:
+            search_cache.set(cache_key, results)
+            await shared_search_cache.set(cache_key, results)
+        return results
+
+    # Concurrent searches for the same person, in any worker, share one Tavily call
+    return await search_flight.do(cache_key, run_search)
+
+
+def candidate_urls(
+    search_results: List[SearchResult], primary_url: str, top_k: int = SCRAPE_TOP_K
+) -> List[str]:
+    """Distinct result URLs other than the primary one, best ranked first"""
+    urls = []
+    for result in search_results:
+        url = result.get("url")
+        if url and url != primary_url and url not in urls:
+            urls.append(url)
+    return urls[: max(0, top_k - 1)]
+
+
+async def fetch_source(url: str) -> str:
+    """Fetch and clean an extra source without storing it as a profile"""
+    result = await asyncio.wait_for(
+        fetch_profile(url), timeout=SCRAPE_SOURCE_TIMEOUT_SECONDS
+    )
+    return result.text or ""
+
+
+async def gather_sources(
+    primary: "asyncio.Task[str]",
+    urls: List[str],
+    token_budget: int = CONTEXT_TOKEN_BUDGET,
+) -> Tuple[str, List[str]]:
+    """
+    Wait for the primary scrape and fetch extra sources alongside it. Extra
+    sources that fail or time out are skipped, and the ones still running are
+    cancelled once the gathered text covers the token budget.
 
-    return results if results else []
+    Args:
+        primary: Running scrape of the primary profile URL
+        urls: Extra source URLs, best ranked first
+        token_budget: Context tokens after which stragglers are cancelled
+
+    Returns:
+        Tuple[str, List[str]]: Primary text followed by the extra sources in
+        rank order, and the extra URLs that were used
+    """
+    extras = {asyncio.create_task(fetch_source(url)): url for url in urls}
+    texts: Dict[str, str] = {}
+    pending = set(extras)
+    try:
+        primary_text = await primary
+        gathered = len(primary_text or "")
+        while pending and gathered < token_budget * CHARS_PER_TOKEN:
+            done, pending = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in done:
+                if task.exception() is not None:
+                    logger.warning(
+                        "source_fetch_failed",
+                        url=extras[task],
+                        error=repr(task.exception()),
+                    )
+                    continue
+                texts[extras[task]] = task.result()
+                gathered += len(texts[extras[task]])
+    finally:
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    used = [url for url in urls if texts.get(url)]
+    combined = " ".join([primary_text or ""] + [texts[url] for url in used])
+    return combined, used
 
 
 async def process_profiles(state: GraphState) -> GraphState:
@@ -81,20 +205,81 @@ async def process_profiles(state: GraphState) -> GraphState:
         Updated graph state with profile data
     """
     max_search_results: int = 5
+    scrape: Optional["asyncio.Task[str]"] = None
+    speculation: Optional[Speculation] = None
+    search_results: List[SearchResult] = []
     try:
-        # Search for profiles
-        search_results = await search_profile(state, max_search_results)
+        # Only search the web when the URL was given or the person is known locally
+        known_url = state.url
+        if not known_url and state.person:
+            known_url = await profile_index.lookup(state.person)
+        if known_url:
+            state.url = known_url
+            state.scrapped_data = ""
+            await report_progress("search", "skipped", url=state.url)
+        else:
+            await report_progress("search", "started")
+            search_results = await search_profile(state, max_search_results)
+
+            # Extract data and update state
+            state = extract_profile_scrapped_data(state, search_results)
+            await report_progress(
+                "search", "done", results=len(search_results), url=state.url
+            )
+
+        if not state.url or state.url == "no_url_found":
+            return state
+
+        # Start scraping as soon as the URL is known, while the bio cache is
+        # checked; a stored profile makes the scrape a database read
+        await report_progress("scrape", "started", url=state.url)
+        scrape = asyncio.create_task(scrape_profile(state.url, person=state.person))
+
+        # Return the stored bio right away when it is still fresh
+        bio = await bio_cache.lookup(state.url, force_refresh=state.force_refresh)
+        if bio:
+            await report_progress("cache", "hit", url=state.url)
+            state.bio = bio
+            return state
+
+        # Draft a bio from the search snippets while the scrape runs
+        if search_results and speculation_enabled(
+            state.speculative, state.scrapped_data
+        ):
+            speculation = Speculation(state.person, state.scrapped_data)
 
-        # Extract data and update state
-        state = extract_profile_scrapped_data(state, search_results)
+        # Gather the other top results alongside the primary profile
+        scrapped_data, sources = await gather_sources(
+            scrape, candidate_urls(search_results, state.url)
+        )
+        state.sources = [state.url] + sources
+        await report_progress("scrape", "done", url=state.url, sources=len(sources) + 1)
 
-        # Scrape profile if URL was found
-        if state.url and state.url != "no_url_found":
-            state.scrapped_data += await scrape_profile(state.url, person=state.person)
+        if speculation is not None:
+            draft = await speculation.resolve(scrapped_data)
+            speculation = None
+            if draft is not None:
+                # The scrape adds too little to be worth a second generation
+                await BioGenerator().update_bio(state.url, draft.model_dump())
+                await report_progress("draft", "kept", url=state.url)
+                state.scrapped_data += scrapped_data
+                state.bio = draft
+                return state
+            await report_progress("draft", "refining", url=state.url)
 
+        state.scrapped_data += scrapped_data
         return state
 
+    except RateLimitExceeded:
+        # Surfaced to the client as 429 with Retry-After
+        raise
     except Exception as e:
         # Log error if needed
         state.error = str(e)
         return state
+    finally:
+        if scrape is not None and not scrape.done():
+            # Only the waiter is cancelled: the shared scrape work goes on
+            scrape.cancel()
+        if speculation is not None:
+            await speculation.cancel()
@@ -0,0 +1,123 @@
+from typing import Dict, Union
+
+from app.graph.chains.generation import bio_generator
+from app.graph.nodes.generate import generation_flight
+from app.graph.nodes.web_search import search_cache, search_flight
+from app.graph.utils.bio_cache import bio_cache
+from app.graph.utils.executor import cpu_executor
+from app.graph.utils.metrics import LabelValues, MetricsRegistry, stats_collector
+from app.graph.utils.profile_refresh import profile_refresher
+from app.graph.utils.scrape_profile import scrape_flight
+from app.graph.utils.shared_state import SharedSingleFlight
+from app.graph.utils.single_flight import SingleFlight, StreamSingleFlight
+
+Flight = Union[SingleFlight, StreamSingleFlight]
+
+
+def flight_roles(flight: Flight) -> Dict[str, float]:
+    roles = {"leader": flight.leaders, "follower": flight.followers}
+    if isinstance(flight, SharedSingleFlight):
+        # Waited on a leader in another worker process
+        roles["remote_follower"] = flight.remote_followers
+    return roles
+
+
+def register_runtime_metrics(
+    registry: MetricsRegistry, flights: Dict[str, Flight]
+) -> None:
+    """
+    Expose the counters the caches, single-flights and pools already keep,
+    read at scrape time so the hot paths are unchanged.
+
+    Args:
+        registry: Registry rendered by /metrics
+        flights: Extra named SingleFlight/StreamSingleFlight instances, e.g. the
+            server's stream coalescer
+    """
+    generation_cache = bio_generator.cache
+    registry.callback(
+        "cache_lookups_total",
+        "Cache lookups by cache and result",
+        "counter",
+        ("cache", "result"),
+        stats_collector(
+            {
+                "bio": lambda: {
+                    "hit": bio_cache.stats.hits,
+                    "miss": bio_cache.stats.misses,
+                    "stale": bio_cache.stats.stale,
+                    "bypassed": bio_cache.stats.bypassed,
+                },
+                "search": lambda: {
+                    "hit": search_cache.hits,
+                    "miss": search_cache.misses,
+                },
+                "generation": lambda: {
+                    "hit": getattr(generation_cache, "hits", 0),
+                    "miss": getattr(generation_cache, "misses", 0),
+                },
+            }
+        ),
+    )
+
+    all_flights: Dict[str, Flight] = {
+        "search": search_flight,
+        "scrape": scrape_flight,
+        "generate": generation_flight,
+        **flights,
+    }
+    registry.callback(
+        "single_flight_calls_total",
+        "Coalesced calls by flight and role (leader ran the work, followers shared it)",
+        "counter",
+        ("flight", "role"),
+        stats_collector(
+            {
+                name: (lambda f=flight: flight_roles(f))
+                for name, flight in all_flights.items()
+            }
+        ),
+    )
+
+    def flights_in_flight() -> Dict[LabelValues, float]:
+        values = {}
+        for name, flight in all_flights.items():
+            values[(name,)] = flight.in_flight()
+        return values
+
+    registry.callback(
+        "single_flight_in_flight",
+        "Keys currently being worked on by each flight",
+        "gauge",
+        ("flight",),
+        flights_in_flight,
+    )
+
+    registry.callback(
+        "cpu_executor_tasks",
+        "CPU executor task counts by state",
+        "gauge",
+        ("state",),
+        lambda: {
+            ("inline",): cpu_executor.stats.inline,
+            ("submitted",): cpu_executor.stats.submitted,
+            ("completed",): cpu_executor.stats.completed,
+            ("failed",): cpu_executor.stats.failed,
+            ("pending",): cpu_executor.stats.pending,
+            ("queued",): cpu_executor.queue_depth,
+        },
+    )
+
+    registry.callback(
+        "profile_refresh_total",
+        "Background profile revalidations by outcome",
+        "counter",
+        ("outcome",),
+        lambda: {
+            ("not_modified",): profile_refresher.stats.not_modified,
+            ("unchanged",): profile_refresher.stats.unchanged,
+            ("changed",): profile_refresher.stats.changed,
+            ("regenerated",): profile_refresher.stats.regenerated,
+            ("failed",): profile_refresher.stats.failed,
+        },
+    )
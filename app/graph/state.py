@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import List, Literal, Optional
 
 from pydantic import BaseModel, Field
 
@@ -13,9 +13,31 @@ class GraphState(BaseModel):
         url: The URL of the person.
         bio: An optional BioGeneration object containing the generated bio.
         scrapped_data: An optional dictionary containing the scraped data.
+        force_refresh: Regenerate the bio even when a fresh one is stored.
+        tokens_saved: Prompt tokens removed by context compaction.
+        sources: URLs whose content was gathered, primary profile first.
+        speculative: Draft a bio from search snippets while scraping; None
+            follows SPECULATIVE_GENERATION.
+        tier: Latency/quality trade-off used to pick the model; None follows
+            MODEL_ROUTING_DEFAULT_TIER.
     """
 
     person: str = Field(..., description="The person to generate a bio for")
     url: Optional[str] = Field(None, description="Profile URL")
     bio: Optional[BioGeneration] = None
     scrapped_data: Optional[str] = None
+    force_refresh: bool = Field(
+        False, description="Regenerate the bio even if a cached one exists"
+    )
+    tokens_saved: Optional[int] = Field(
+        None, description="Prompt tokens removed by context compaction"
+    )
+    sources: Optional[List[str]] = Field(
+        None, description="URLs whose content was gathered, primary profile first"
+    )
+    speculative: Optional[bool] = Field(
+        None, description="Stream a draft bio from search snippets while scraping"
+    )
+    tier: Optional[Literal["fast", "balanced", "quality"]] = Field(
+        None, description="Latency/quality trade-off used to pick the model"
+    )
@@ -0,0 +1,99 @@
+from typing import Any, AsyncGenerator, Dict, List
+
+import structlog
+from langchain_core.messages import AIMessageChunk
+
+from app.graph.checkpoints import graph_runner
+from app.graph.consts import GENERATE
+from app.graph.state import GraphState
+from app.graph.utils.bio_stream import BioStreamParser, format_sse
+from app.graph.utils.progress import PROGRESS_EVENT
+from app.graph.utils.speculation import DRAFT_EVENT, DRAFT_TAG
+
+logger = structlog.get_logger()
+
+
+def llm_fragments(chunk: AIMessageChunk) -> List[str]:
+    """
+    Raw JSON fragments carried by a streamed chunk: tool-call argument
+    deltas for function-calling structured output, content for JSON mode.
+    """
+    fragments = [
+        tool_chunk["args"]
+        for tool_chunk in getattr(chunk, "tool_call_chunks", None) or []
+        if tool_chunk.get("args")
+    ]
+    if not fragments and isinstance(chunk.content, str) and chunk.content:
+        fragments.append(chunk.content)
+    return fragments
+
+
+def final_payload(output: Dict[str, Any], streamed: bool) -> Dict[str, Any]:
+    bio = output.get("bio")
+    if hasattr(bio, "model_dump"):
+        bio = bio.model_dump()
+    return {
+        "person": output.get("person"),
+        "url": output.get("url"),
+        "cached": not streamed,
+        "bio": bio,
+    }
+
+
+async def bio_event_stream(request: GraphState) -> AsyncGenerator[str, None]:
+    """
+    Run the graph and stream server-sent events: progress for the search,
+    scrape and generate stages, bio fields as the LLM produces them, and a
+    final "bio" event with the complete result (the only bio event for a
+    cached profile).
+
+    In speculative mode a draft generated from the search snippets streams
+    first as "draft_"-prefixed field events and one complete "draft" event;
+    the final "bio" event then either repeats the draft or carries the bio
+    refined from the scraped profile, which replaces it.
+
+    A "progress" event with status "escalated" means a generation is being
+    retried on a larger model: fields streamed before it are superseded.
+    """
+    parser = BioStreamParser()
+    draft_parser = BioStreamParser()
+    streamed = False
+    # Flush the response headers and a first event before any slow work
+    yield format_sse("progress", {"stage": "request", "status": "accepted"})
+    try:
+        async for event in graph_runner.astream_events(request.model_dump()):
+            kind = event["event"]
+            if kind == "on_custom_event" and event["name"] == PROGRESS_EVENT:
+                if event["data"].get("status") == "escalated":
+                    # The larger model starts over: drop the partial fields
+                    if DRAFT_TAG in event["data"].get("tags", []):
+                        draft_parser = BioStreamParser()
+                    else:
+                        parser = BioStreamParser()
+                yield format_sse("progress", event["data"])
+            elif kind == "on_custom_event" and event["name"] == DRAFT_EVENT:
+                streamed = True
+                yield format_sse("draft", event["data"])
+            elif kind == "on_chat_model_stream" and DRAFT_TAG in event.get("tags", []):
+                for fragment in llm_fragments(event["data"]["chunk"]):
+                    for name, data in draft_parser.feed(fragment):
+                        yield format_sse(f"draft_{name}", data)
+            elif (
+                kind == "on_chat_model_stream"
+                and event["metadata"].get("langgraph_node") == GENERATE
+            ):
+                for fragment in llm_fragments(event["data"]["chunk"]):
+                    for name, data in parser.feed(fragment):
+                        streamed = True
+                        yield format_sse(name, data)
+            elif kind == "on_chain_end" and not event.get("parent_ids"):
+                output = event["data"].get("output") or {}
+                if output.get("bio"):
+                    yield format_sse("bio", final_payload(output, streamed))
+                else:
+                    yield format_sse("not_found", {"person": request.person})
+    except Exception as e:
+        logger.error("bio_stream_failed", person=request.person, error=str(e))
+        yield format_sse("error", {"error": str(e)})
+        return
+    yield format_sse("done", {})
@@ -0,0 +1,98 @@
+import os
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+import structlog
+
+from app.db.controllers.bio import get_user_by_profile_url
+from app.models.models import BioGeneration, DBProfile
+
+logger = structlog.get_logger()
+
+# Maximum age of a stored bio before it is regenerated (0 disables expiry)
+BIO_CACHE_TTL_SECONDS = int(os.getenv("BIO_CACHE_TTL_SECONDS", "0"))
+
+
+@dataclass
+class BioCacheStats:
+    """Hit/miss counters for the stored bio cache"""
+
+    hits: int = 0
+    misses: int = 0
+    stale: int = 0
+    bypassed: int = 0
+
+
+class BioCache:
+    """Cache-first lookup of generated bios stored on DBProfile rows"""
+
+    def __init__(self, ttl_seconds: int = BIO_CACHE_TTL_SECONDS):
+        """
+        Initialize the bio cache.
+        Args:
+            ttl_seconds: Maximum bio age in seconds, 0 means bios never go stale
+        """
+        self.ttl = timedelta(seconds=ttl_seconds) if ttl_seconds > 0 else None
+        self.stats = BioCacheStats()
+        self.logger = logger.bind(module="bio_cache")
+
+    def is_fresh(self, updated_at: Optional[datetime]) -> bool:
+        """Check whether a bio updated at the given time is still within the TTL"""
+        if self.ttl is None:
+            return True
+        if updated_at is None:
+            return False
+        if updated_at.tzinfo is None:
+            updated_at = updated_at.replace(tzinfo=timezone.utc)
+        return datetime.now(timezone.utc) - updated_at <= self.ttl
+
+    async def lookup(
+        self, url: str, force_refresh: bool = False
+    ) -> Optional[BioGeneration]:
+        """
+        Return the stored bio for a profile URL when it exists and is fresh.
+
+        Args:
+            url (str): Profile URL
+            force_refresh (bool): Skip the cache and count the request as bypassed
+
+        Returns:
+            Optional[BioGeneration]: Stored bio, None on miss
+        """
+        if force_refresh:
+            self.stats.bypassed += 1
+            return None
+
+        try:
+            user = await get_user_by_profile_url(url)
+        except Exception as e:
+            self.logger.error("bio_cache_lookup_failed", url=url, error=str(e))
+            self.stats.misses += 1
+            return None
+
+        return self.fresh_bio(user)
+
+    def fresh_bio(self, user: Optional[DBProfile]) -> Optional[BioGeneration]:
+        """
+        Return a loaded profile's bio if it is fresh, counting the hit or miss.
+
+        Args:
+            user (Optional[DBProfile]): Profile row, None if not stored
+
+        Returns:
+            Optional[BioGeneration]: Stored bio, None on miss
+        """
+        if not user or not user.bio:
+            self.stats.misses += 1
+            return None
+
+        if not self.is_fresh(user.bio_updated_at):
+            self.stats.stale += 1
+            return None
+
+        self.stats.hits += 1
+        return user.bio
+
+
+bio_cache = BioCache()
@@ -0,0 +1,156 @@
+import json
+from typing import Any, Dict, List, Optional, Tuple
+
+# SSE event emitted for each completed item of a BioGeneration list field
+LIST_FIELD_EVENTS = {
+    "interesting_facts": "interesting_fact",
+    "topics_of_interest": "topic_of_interest",
+    "ice_breakers": "ice_breaker",
+}
+
+# SSE event emitted with text deltas of a BioGeneration string field
+TEXT_FIELD_EVENTS = {"summary": "summary_delta"}
+
+BioStreamEvent = Tuple[str, Dict[str, Any]]
+
+_ESCAPES = {
+    '"': '"',
+    "\\": "\\",
+    "/": "/",
+    "b": "\b",
+    "f": "\f",
+    "n": "\n",
+    "r": "\r",
+    "t": "\t",
+}
+
+
+def format_sse(event: str, data: Any) -> str:
+    """Format one server-sent event"""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+class BioStreamParser:
+    """
+    Incremental parser for the JSON arguments of a BioGeneration tool call.
+
+    Feed it argument fragments as they stream from the LLM; it returns events
+    as soon as they can be emitted: text deltas for summary, and each fact,
+    topic and ice-breaker once its string is complete. Only the string
+    values of a flat object of strings and string lists are tracked.
+    """
+
+    def __init__(self):
+        # Stack of open containers: ["object", key, expecting_key] or ["array", key, index]
+        self._stack: List[list] = []
+        self._in_string = False
+        self._string_is_key = False
+        self._chars: List[str] = []
+        self._emitted = 0
+        self._escape: Optional[str] = None
+        self._high_surrogate: Optional[int] = None
+
+    def _field(self) -> Tuple[Optional[str], Optional[int]]:
+        """Top-level field and list index the current string value belongs to"""
+        if len(self._stack) == 1 and self._stack[0][0] == "object":
+            return self._stack[0][1], None
+        if (
+            len(self._stack) == 2
+            and self._stack[0][0] == "object"
+            and self._stack[1][0] == "array"
+        ):
+            return self._stack[1][1], self._stack[1][2]
+        return None, None
+
+    def _append(self, char: str) -> None:
+        code = ord(char)
+        if self._high_surrogate is not None:
+            high, self._high_surrogate = self._high_surrogate, None
+            if 0xDC00 <= code <= 0xDFFF:
+                char = chr(0x10000 + ((high - 0xD800) << 10) + (code - 0xDC00))
+            else:
+                self._chars.append(chr(high))
+        if 0xD800 <= ord(char) <= 0xDBFF:
+            self._high_surrogate = ord(char)
+            return
+        self._chars.append(char)
+
+    def _text_delta(self, events: List[BioStreamEvent]) -> None:
+        field, index = self._field()
+        if field in TEXT_FIELD_EVENTS and index is None and not self._string_is_key:
+            if len(self._chars) > self._emitted:
+                delta = "".join(self._chars[self._emitted :])
+                self._emitted = len(self._chars)
+                events.append((TEXT_FIELD_EVENTS[field], {"delta": delta}))
+
+    def _end_string(self, events: List[BioStreamEvent]) -> None:
+        value = "".join(self._chars)
+        top = self._stack[-1] if self._stack else None
+        if self._string_is_key and top is not None:
+            top[1] = value
+            top[2] = False
+        else:
+            self._text_delta(events)
+            field, index = self._field()
+            if field in LIST_FIELD_EVENTS and index is not None:
+                events.append(
+                    (LIST_FIELD_EVENTS[field], {"index": index, "text": value})
+                )
+        self._in_string = False
+        self._chars = []
+        self._emitted = 0
+
+    def feed(self, fragment: str) -> List[BioStreamEvent]:
+        """
+        Consume the next fragment of tool-call arguments.
+
+        Args:
+            fragment (str): Raw JSON text as streamed by the model
+
+        Returns:
+            List[BioStreamEvent]: (event name, data) pairs ready to send
+        """
+        events: List[BioStreamEvent] = []
+        for char in fragment:
+            if self._in_string:
+                if self._escape is not None:
+                    if self._escape == "":
+                        if char == "u":
+                            self._escape = "u"
+                        else:
+                            self._append(_ESCAPES.get(char, char))
+                            self._escape = None
+                    else:
+                        self._escape += char
+                        if len(self._escape) == 5:
+                            self._append(chr(int(self._escape[1:], 16)))
+                            self._escape = None
+                elif char == "\\":
+                    self._escape = ""
+                elif char == '"':
+                    self._end_string(events)
+                else:
+                    self._append(char)
+                continue
+
+            top = self._stack[-1] if self._stack else None
+            if char == '"':
+                self._in_string = True
+                self._string_is_key = bool(top and top[0] == "object" and top[2])
+            elif char == "{":
+                self._stack.append(["object", None, True])
+            elif char == "[":
+                key = top[1] if top and top[0] == "object" else None
+                self._stack.append(["array", key, 0])
+            elif char in "}]":
+                if self._stack:
+                    self._stack.pop()
+            elif char == ",":
+                if top and top[0] == "object":
+                    top[2] = True
+                elif top and top[0] == "array":
+                    top[2] += 1
+
+        if self._in_string:
+            self._text_delta(events)
+        return events
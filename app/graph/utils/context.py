@@ -0,0 +1,188 @@
+import math
+import os
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Callable, List, Optional, Tuple
+
+import structlog
+
+logger = structlog.get_logger()
+
+# Maximum tokens of profile data sent to the LLM per request
+CONTEXT_TOKEN_BUDGET = int(os.getenv("CONTEXT_TOKEN_BUDGET", "6000"))
+
+# Rough characters-per-token ratio used when no tokenizer is available
+CHARS_PER_TOKEN = 4
+
+# Sentence ends, line breaks and bullet markers: scraped pages often list
+# facts without punctuation
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+|\s*\n\s*|\s+[*\u2022\u00b7]\s+")
+_WORD = re.compile(r"\w+")
+
+# Words that mark a sentence as useful for a professional bio
+PROFILE_TERMS = frozenset("""
+    founder cofounder co ceo cto cfo president director head lead manager
+    engineer scientist researcher professor author investor partner chair
+    experience work works worked working role company startup team teams
+    university college school degree phd education graduated studied
+    award awards built launched led founded created published speaker
+    interests passionate skills expertise career previously currently
+    """.split())
+
+
+@dataclass
+class ContextReport:
+    """Token accounting for one context-preparation run"""
+
+    original_tokens: int
+    final_tokens: int
+    duplicate_sentences: int
+    dropped_sentences: int
+    truncated_sentences: int = 0
+
+    @property
+    def tokens_saved(self) -> int:
+        return self.original_tokens - self.final_tokens
+
+
+@lru_cache(maxsize=8)
+def get_token_counter(model: Optional[str]) -> Callable[[str], int]:
+    """
+    Return a token counting function for the model, using tiktoken when its
+    encoding is available and a character-based estimate otherwise.
+    """
+    try:
+        import tiktoken
+
+        try:
+            encoding = tiktoken.encoding_for_model(model or "")
+        except KeyError:
+            encoding = tiktoken.get_encoding("cl100k_base")
+        return lambda text: len(encoding.encode(text, disallowed_special=()))
+    except Exception as e:
+        logger.warning("tokenizer_unavailable", model=model, error=str(e))
+        return lambda text: math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def count_tokens(text: str, model: Optional[str] = None) -> int:
+    """Count the tokens text uses for the given model"""
+    return get_token_counter(model)(text) if text else 0
+
+
+def profile_signals(text: str) -> int:
+    """Distinct professional terms in text, a rough measure of how much a
+    profile has to say"""
+    return len(set(_WORD.findall(text.casefold())) & PROFILE_TERMS)
+
+
+def sentence_key(sentence: str) -> str:
+    """Normalized form of a sentence used to spot repeats"""
+    return " ".join(_WORD.findall(sentence.casefold()))
+
+
+def split_sentences(text: str) -> List[str]:
+    return [s.strip() for s in _SENTENCE_END.split(text) if s.strip()]
+
+
+def truncate_to_budget(
+    sentence: str, token_budget: int, counter: Callable[[str], int]
+) -> str:
+    """Longest word prefix of sentence that costs at most token_budget tokens"""
+    words = sentence.split(" ")
+    low, high = 0, len(words)
+    while low < high:
+        middle = (low + high + 1) // 2
+        if counter(" ".join(words[:middle])) + 1 <= token_budget:
+            low = middle
+        else:
+            high = middle - 1
+    return " ".join(words[:low])
+
+
+def relevance(sentence: str, name_terms: frozenset, position: float) -> float:
+    """
+    Score a sentence by mentions of the person and of profile vocabulary,
+    with a mild preference for earlier sentences.
+    """
+    words = set(_WORD.findall(sentence.casefold()))
+    if not words:
+        return 0.0
+    score = 3.0 * len(words & name_terms) + len(words & PROFILE_TERMS)
+    return score + (1.0 - position)
+
+
+def prepare_context(
+    person: str,
+    scrapped_data: str,
+    token_budget: int = CONTEXT_TOKEN_BUDGET,
+    model: Optional[str] = None,
+) -> Tuple[str, ContextReport]:
+    """
+    Compact profile data for the prompt: drop sentences repeated across search
+    results and the scraped page, then keep the most relevant sentences (in
+    their original order) until the token budget is used. A sentence larger
+    than the whole budget is cut to what is left rather than dropped.
+
+    Args:
+        person (str): Name of the person, used for relevance
+        scrapped_data (str): Search snippets and scraped page text
+        token_budget (int): Maximum tokens to keep
+        model (Optional[str]): Model whose tokenizer to count with
+
+    Returns:
+        Tuple[str, ContextReport]: Compacted context and token accounting
+    """
+    counter = get_token_counter(model)
+    original_tokens = counter(scrapped_data) if scrapped_data else 0
+
+    seen = set()
+    sentences: List[str] = []
+    duplicates = 0
+    for sentence in split_sentences(scrapped_data or ""):
+        key = sentence_key(sentence)
+        if not key:
+            continue
+        if key in seen:
+            duplicates += 1
+            continue
+        seen.add(key)
+        sentences.append(sentence)
+
+    costs = [counter(sentence) + 1 for sentence in sentences]
+    truncated = 0
+    if sum(costs) <= token_budget:
+        kept = list(range(len(sentences)))
+    else:
+        name_terms = frozenset(_WORD.findall(person.casefold()))
+        total = max(len(sentences), 1)
+        ranked = sorted(
+            range(len(sentences)),
+            key=lambda i: relevance(sentences[i], name_terms, i / total),
+            reverse=True,
+        )
+        kept, used = [], 0
+        for i in ranked:
+            if costs[i] > token_budget and used < token_budget:
+                # Text without sentence breaks would never fit otherwise
+                sentences[i] = truncate_to_budget(
+                    sentences[i], token_budget - used, counter
+                )
+                costs[i] = counter(sentences[i]) + 1
+                if not sentences[i]:
+                    continue
+                truncated += 1
+            if used + costs[i] <= token_budget:
+                kept.append(i)
+                used += costs[i]
+        kept.sort()
+
+    context = " ".join(sentences[i] for i in kept)
+    report = ContextReport(
+        original_tokens=original_tokens,
+        final_tokens=counter(context) if context else 0,
+        duplicate_sentences=duplicates,
+        dropped_sentences=len(sentences) - len(kept),
+        truncated_sentences=truncated,
+    )
+    return context, report
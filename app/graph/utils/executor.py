@@ -0,0 +1,149 @@
+import asyncio
+import os
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import partial
+from typing import Any, Callable, Optional, Tuple, TypeVar
+
+import structlog
+
+from app.graph.utils.metrics import CPU_TASK_SECONDS
+
+logger = structlog.get_logger()
+
+T = TypeVar("T")
+
+# "thread" or "process"; processes sidestep the GIL but pickle arguments
+CPU_EXECUTOR_KIND = os.getenv("CPU_EXECUTOR_KIND", "thread")
+CPU_EXECUTOR_WORKERS = int(os.getenv("CPU_EXECUTOR_WORKERS", str(os.cpu_count() or 2)))
+
+# Inputs smaller than this run inline: they finish faster than a pool hop
+CPU_OFFLOAD_MIN_SIZE = int(os.getenv("CPU_OFFLOAD_MIN_SIZE", "65536"))
+
+
+@dataclass
+class ExecutorStats:
+    """Queue depth and wait-time metrics for the CPU executor"""
+
+    inline: int = 0
+    submitted: int = 0
+    completed: int = 0
+    failed: int = 0
+    pending: int = 0
+    total_wait_seconds: float = 0.0
+    max_wait_seconds: float = 0.0
+    total_run_seconds: float = 0.0
+
+    @property
+    def mean_wait_seconds(self) -> float:
+        done = self.completed + self.failed
+        return self.total_wait_seconds / done if done else 0.0
+
+
+def task_name(fn: Callable[..., Any]) -> str:
+    """Metric label for a task, unwrapping functools.partial"""
+    return getattr(getattr(fn, "func", fn), "__name__", "unknown")
+
+
+def _timed_call(fn: Callable[..., T], *args: Any) -> Tuple[float, float, T]:
+    """Run fn in the worker and report when it started and how long it ran."""
+    started_at = time.time()
+    result = fn(*args)
+    return started_at, time.time() - started_at, result
+
+
+class CpuExecutor:
+    """Thread or process pool for CPU-heavy transforms called from graph nodes"""
+
+    def __init__(
+        self,
+        kind: str = CPU_EXECUTOR_KIND,
+        max_workers: int = CPU_EXECUTOR_WORKERS,
+        offload_min_size: int = CPU_OFFLOAD_MIN_SIZE,
+    ):
+        """
+        Initialize the executor; the pool itself is created on first use.
+        Args:
+            kind: "thread" or "process"
+            max_workers: Pool size
+            offload_min_size: Inputs with a smaller size_hint run inline
+        """
+        if kind not in ("thread", "process"):
+            raise ValueError(f"Unknown CPU_EXECUTOR_KIND: {kind}")
+        self.kind = kind
+        self.max_workers = max_workers
+        self.offload_min_size = offload_min_size
+        self.stats = ExecutorStats()
+        self._pool: Optional[Executor] = None
+        self.logger = logger.bind(module="cpu_executor")
+
+    def start(self) -> None:
+        """Create the pool (idempotent)"""
+        if self._pool is not None:
+            return
+        if self.kind == "process":
+            self._pool = ProcessPoolExecutor(max_workers=self.max_workers)
+        else:
+            self._pool = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="cpu"
+            )
+        self.logger.info(
+            "cpu_executor_started", kind=self.kind, workers=self.max_workers
+        )
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of submitted tasks still waiting for a free worker"""
+        return max(0, self.stats.pending - self.max_workers)
+
+    def shutdown(self) -> None:
+        """Shut the pool down, waiting for running work to finish"""
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+
+    async def run(
+        self, fn: Callable[..., T], *args: Any, size_hint: Optional[int] = None
+    ) -> T:
+        """
+        Run fn(*args) in the pool without blocking the event loop.
+
+        Args:
+            fn: Function to run; must be picklable for the process pool
+            *args: Positional arguments for fn
+            size_hint: Input size; below offload_min_size fn runs inline
+
+        Returns:
+            The result of fn
+        """
+        if size_hint is not None and size_hint < self.offload_min_size:
+            self.stats.inline += 1
+            with CPU_TASK_SECONDS.time(task=task_name(fn)):
+                return fn(*args)
+
+        self.start()
+        stats = self.stats
+        stats.submitted += 1
+        stats.pending += 1
+        submitted_at = time.time()
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(self._pool, partial(_timed_call, fn, *args))
+        try:
+            started_at, run_seconds, result = await future
+        except BaseException:
+            stats.pending -= 1
+            stats.failed += 1
+            raise
+
+        wait_seconds = max(0.0, started_at - submitted_at)
+        stats.pending -= 1
+        stats.completed += 1
+        stats.total_wait_seconds += wait_seconds
+        stats.max_wait_seconds = max(stats.max_wait_seconds, wait_seconds)
+        stats.total_run_seconds += run_seconds
+        CPU_TASK_SECONDS.observe(run_seconds, task=task_name(fn))
+        return result
+
+
+cpu_executor = CpuExecutor()
@@ -0,0 +1,146 @@
+import hashlib
+import json
+import os
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Optional
+
+import structlog
+
+from app.db.controllers.generation_cache import (
+    evict_cached_generations,
+    get_cached_generation,
+    save_cached_generation,
+)
+from app.graph.utils.profile_index import normalize_name
+from app.graph.utils.ttl_cache import TTLCache
+
+logger = structlog.get_logger()
+
+# "tiered" (memory in front of the database), "memory" or "none"
+GENERATION_CACHE_BACKEND = os.getenv("GENERATION_CACHE_BACKEND", "tiered")
+GENERATION_CACHE_MEMORY_ENTRIES = int(
+    os.getenv("GENERATION_CACHE_MEMORY_ENTRIES", "512")
+)
+GENERATION_CACHE_MAX_BYTES = int(
+    os.getenv("GENERATION_CACHE_MAX_BYTES", str(64 * 1024 * 1024))
+)
+# Check the persistent tier's size after this many writes
+GENERATION_CACHE_EVICT_EVERY = 50
+
+
+def generation_cache_key(
+    model: str, prompt_version: str, person: str, context: str
+) -> str:
+    """
+    Content address of a generation: identical model, prompt template and
+    normalized inputs give identical output at temperature 0.
+    """
+    normalized = {
+        "model": model,
+        "prompt_version": prompt_version,
+        "person": normalize_name(person),
+        "context": " ".join((context or "").split()),
+    }
+    payload = json.dumps(normalized, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class GenerationCache(ABC):
+    """Interface of a generation cache tier"""
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the cached generation for key, or None"""
+
+    @abstractmethod
+    async def set(self, key: str, value: Dict[str, Any]) -> None:
+        """Store a generation under key"""
+
+
+class NullGenerationCache(GenerationCache):
+    """Cache that never hits, for disabling generation caching"""
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        return None
+
+    async def set(self, key: str, value: Dict[str, Any]) -> None:
+        return None
+
+
+class MemoryGenerationCache(GenerationCache):
+    """In-process LRU tier"""
+
+    def __init__(self, max_entries: int = GENERATION_CACHE_MEMORY_ENTRIES):
+        self.entries: TTLCache[Dict[str, Any]] = TTLCache(
+            max_entries=max_entries, ttl_seconds=0
+        )
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        return self.entries.get(key)
+
+    async def set(self, key: str, value: Dict[str, Any]) -> None:
+        self.entries.set(key, value)
+
+
+class DatabaseGenerationCache(GenerationCache):
+    """Persistent tier in the generation_cache table with size-based LRU eviction"""
+
+    def __init__(self, max_bytes: int = GENERATION_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._writes = 0
+        self.logger = logger.bind(module="generation_cache")
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        return await get_cached_generation(key)
+
+    async def set(self, key: str, value: Dict[str, Any]) -> None:
+        size = len(json.dumps(value, ensure_ascii=False).encode("utf-8"))
+        await save_cached_generation(key, value, size)
+        self._writes += 1
+        if self._writes % GENERATION_CACHE_EVICT_EVERY == 0:
+            evicted = await evict_cached_generations(self.max_bytes)
+            if evicted:
+                self.logger.info("generation_cache_evicted", entries=evicted)
+
+
+class TieredGenerationCache(GenerationCache):
+    """Looks up tiers in order, promoting hits into the faster tiers"""
+
+    def __init__(self, *tiers: GenerationCache):
+        self.tiers = tiers
+        self.hits = 0
+        self.misses = 0
+        self.logger = logger.bind(module="generation_cache")
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        for depth, tier in enumerate(self.tiers):
+            try:
+                value = await tier.get(key)
+            except Exception as e:
+                self.logger.error("generation_cache_get_failed", error=str(e))
+                continue
+            if value is not None:
+                self.hits += 1
+                for faster in self.tiers[:depth]:
+                    await faster.set(key, value)
+                return value
+        self.misses += 1
+        return None
+
+    async def set(self, key: str, value: Dict[str, Any]) -> None:
+        for tier in self.tiers:
+            try:
+                await tier.set(key, value)
+            except Exception as e:
+                self.logger.error("generation_cache_set_failed", error=str(e))
+
+
+def build_generation_cache(backend: str = GENERATION_CACHE_BACKEND) -> GenerationCache:
+    """Create the generation cache selected by GENERATION_CACHE_BACKEND"""
+    if backend == "none":
+        return TieredGenerationCache(NullGenerationCache())
+    if backend == "memory":
+        return TieredGenerationCache(MemoryGenerationCache())
+    if backend == "tiered":
+        return TieredGenerationCache(MemoryGenerationCache(), DatabaseGenerationCache())
+    raise ValueError(f"Unknown GENERATION_CACHE_BACKEND: {backend}")
@@ -0,0 +1,186 @@
+import asyncio
+import os
+from dataclasses import dataclass
+from typing import Optional
+
+import aiohttp
+import structlog
+from tenacity import (
+    AsyncRetrying,
+    retry_if_exception,
+    stop_after_attempt,
+    wait_random_exponential,
+)
+
+from app.graph.utils.rate_limit import TokenBucket
+
+logger = structlog.get_logger()
+
+
+@dataclass
+class FetchResult:
+    """Outcome of a (possibly conditional) GET"""
+
+    status: int
+    text: Optional[str]
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+    @property
+    def not_modified(self) -> bool:
+        return self.status == 304
+
+
+# Status codes worth retrying: throttling and transient upstream failures
+RETRYABLE_STATUSES = {408, 429, 500, 502, 503, 504}
+
+
+@dataclass
+class HttpClientConfig:
+    """Configuration for the shared outbound HTTP client"""
+
+    max_connections: int = int(os.getenv("HTTP_MAX_CONNECTIONS", "100"))
+    max_connections_per_host: int = int(
+        os.getenv("HTTP_MAX_CONNECTIONS_PER_HOST", "20")
+    )
+    keepalive_timeout: float = float(os.getenv("HTTP_KEEPALIVE_TIMEOUT", "30"))
+    total_timeout: float = float(os.getenv("HTTP_TOTAL_TIMEOUT", "30"))
+    connect_timeout: float = float(os.getenv("HTTP_CONNECT_TIMEOUT", "5"))
+    read_timeout: float = float(os.getenv("HTTP_READ_TIMEOUT", "20"))
+    max_concurrency: int = int(os.getenv("HTTP_MAX_CONCURRENCY", "16"))
+    retry_attempts: int = int(os.getenv("HTTP_RETRY_ATTEMPTS", "3"))
+    retry_max_wait: float = float(os.getenv("HTTP_RETRY_MAX_WAIT", "4"))
+
+
+def is_retryable(error: BaseException) -> bool:
+    """Retry connection errors, timeouts and retryable HTTP statuses"""
+    if isinstance(error, aiohttp.ClientResponseError):
+        return error.status in RETRYABLE_STATUSES
+    return isinstance(error, (aiohttp.ClientConnectionError, asyncio.TimeoutError))
+
+
+class HttpClient:
+    """
+    Application-lifetime HTTP client with keep-alive pooling, timeouts,
+    jittered retries and a cap on concurrent outbound requests.
+    """
+
+    def __init__(self, config: Optional[HttpClientConfig] = None):
+        """
+        Initialize the client; the underlying session is opened by start().
+        Args:
+            config: Optional configuration for pooling, timeouts and retries
+        """
+        self.config = config or HttpClientConfig()
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self.in_flight = 0
+        self.logger = logger.bind(module="http_client")
+
+    async def start(self) -> None:
+        """Open the pooled session (idempotent)"""
+        if self._session is not None and not self._session.closed:
+            return
+        connector = aiohttp.TCPConnector(
+            limit=self.config.max_connections,
+            limit_per_host=self.config.max_connections_per_host,
+            keepalive_timeout=self.config.keepalive_timeout,
+            ttl_dns_cache=300,
+        )
+        timeout = aiohttp.ClientTimeout(
+            total=self.config.total_timeout,
+            sock_connect=self.config.connect_timeout,
+            sock_read=self.config.read_timeout,
+        )
+        self._session = aiohttp.ClientSession(connector=connector, timeout=timeout)
+        self._semaphore = asyncio.Semaphore(self.config.max_concurrency)
+
+    async def close(self) -> None:
+        """Close the pooled session and its connections"""
+        if self._session is not None:
+            await self._session.close()
+        self._session = None
+        self._semaphore = None
+
+    async def get_text(self, url: str, **kwargs) -> str:
+        """
+        GET a URL and return the response body as text, retrying transient
+        failures with jittered exponential backoff.
+
+        Args:
+            url (str): URL to fetch
+            **kwargs: Extra arguments passed to aiohttp's session.get
+
+        Returns:
+            str: Response body
+
+        Raises:
+            aiohttp.ClientError: If the request still fails after all retries
+        """
+        result = await self.fetch(url, **kwargs)
+        return result.text
+
+    async def fetch(
+        self,
+        url: str,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+        limiter: Optional[TokenBucket] = None,
+        **kwargs,
+    ) -> FetchResult:
+        """
+        GET a URL, conditionally when validators from a previous fetch are
+        given, with the same retries as get_text.
+
+        Args:
+            url (str): URL to fetch
+            etag (Optional[str]): ETag to send as If-None-Match
+            last_modified (Optional[str]): Date to send as If-Modified-Since
+            limiter (Optional[TokenBucket]): Provider rate limit, taken per attempt
+            **kwargs: Extra arguments passed to aiohttp's session.get
+
+        Returns:
+            FetchResult: Status, body (None on 304) and the new validators
+
+        Raises:
+            aiohttp.ClientError: If the request still fails after all retries
+            RateLimitExceeded: If the limiter cannot grant a call in time
+        """
+        headers = dict(kwargs.pop("headers", None) or {})
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        await self.start()
+        async for attempt in AsyncRetrying(
+            stop=stop_after_attempt(self.config.retry_attempts),
+            wait=wait_random_exponential(
+                multiplier=0.5, max=self.config.retry_max_wait
+            ),
+            retry=retry_if_exception(is_retryable),
+            reraise=True,
+        ):
+            with attempt:
+                # Retries count against the provider's quota too
+                if limiter is not None:
+                    await limiter.acquire()
+                async with self._semaphore:
+                    self.in_flight += 1
+                    try:
+                        async with self._session.get(
+                            url, headers=headers, **kwargs
+                        ) as response:
+                            response.raise_for_status()
+                            if response.status == 304:
+                                return FetchResult(304, None, etag, last_modified)
+                            return FetchResult(
+                                status=response.status,
+                                text=await response.text(),
+                                etag=response.headers.get("ETag"),
+                                last_modified=response.headers.get("Last-Modified"),
+                            )
+                    finally:
+                        self.in_flight -= 1
+
+
+http_client = HttpClient()
@@ -0,0 +1,392 @@
+import bisect
+import functools
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Sequence, Tuple
+
+import structlog
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = structlog.get_logger()
+
+# Latency buckets in seconds, wide enough for multi-second LLM calls
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+LabelValues = Tuple[str, ...]
+Sample = Tuple[str, Dict[str, str], float]
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    pairs = ",".join(
+        '{}="{}"'.format(
+            key,
+            str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"),
+        )
+        for key, value in labels.items()
+    )
+    return "{" + pairs + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class Metric(ABC):
+    """Base of a labelled metric family"""
+
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(labels)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, Any]) -> LabelValues:
+        if set(labels) != set(self.label_names):
+            raise ValueError(f"{self.name} expects labels {self.label_names}")
+        return tuple(str(labels[name]) for name in self.label_names)
+
+    def _labels(self, key: LabelValues) -> Dict[str, str]:
+        return dict(zip(self.label_names, key))
+
+    @abstractmethod
+    def samples(self) -> List[Sample]:
+        """Current (sample name, labels, value) samples of the family"""
+
+
+class Counter(Metric):
+    """Monotonically increasing count"""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = ()):
+        super().__init__(name, documentation, labels)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1, **labels: Any) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def samples(self) -> List[Sample]:
+        with self._lock:
+            values = list(self._values.items())
+        return [(self.name, self._labels(key), value) for key, value in values]
+
+
+class Gauge(Metric):
+    """Value that goes up and down"""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = ()):
+        super().__init__(name, documentation, labels)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1, **labels: Any) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels: Any) -> None:
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels: Any) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def samples(self) -> List[Sample]:
+        with self._lock:
+            values = list(self._values.items())
+        return [(self.name, self._labels(key), value) for key, value in values]
+
+
+class Histogram(Metric):
+    """Distribution of observations in cumulative buckets"""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labels: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: per-bucket counts (last one is +Inf), sum
+        self._values: Dict[LabelValues, Tuple[List[int], List[float]]] = {}
+
+    def observe(self, value: float, **labels: Any) -> None:
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts, total = self._values.setdefault(
+                key, ([0] * (len(self.buckets) + 1), [0.0])
+            )
+            counts[index] += 1
+            total[0] += value
+
+    @contextmanager
+    def time(self, **labels: Any) -> Iterator[None]:
+        """Observe the duration of the block, including when it raises"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def samples(self) -> List[Sample]:
+        with self._lock:
+            values = [
+                (key, list(counts), total[0])
+                for key, (counts, total) in self._values.items()
+            ]
+        samples = []
+        for key, counts, total in values:
+            labels = self._labels(key)
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                samples.append(
+                    (
+                        f"{self.name}_bucket",
+                        {**labels, "le": _format_value(bound)},
+                        cumulative,
+                    )
+                )
+            samples.append((f"{self.name}_sum", labels, total))
+            samples.append((f"{self.name}_count", labels, cumulative))
+        return samples
+
+
+class CallbackMetric(Metric):
+    """Metric whose values are read from existing stats at scrape time"""
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        kind: str,
+        labels: Sequence[str],
+        collect: Callable[[], Dict[LabelValues, float]],
+    ):
+        super().__init__(name, documentation, labels)
+        self.kind = kind
+        self.collect = collect
+
+    def samples(self) -> List[Sample]:
+        return [
+            (self.name, self._labels(key), value)
+            for key, value in self.collect().items()
+        ]
+
+
+class MetricsRegistry:
+    """Set of metrics rendered in the Prometheus text exposition format"""
+
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = {}
+
+    def register(self, metric: Metric) -> Metric:
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(
+        self, name: str, documentation: str, labels: Sequence[str] = ()
+    ) -> Counter:
+        return self.register(Counter(name, documentation, labels))
+
+    def gauge(self, name: str, documentation: str, labels: Sequence[str] = ()) -> Gauge:
+        return self.register(Gauge(name, documentation, labels))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labels: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self.register(Histogram(name, documentation, labels, buckets))
+
+    def callback(
+        self,
+        name: str,
+        documentation: str,
+        kind: str,
+        labels: Sequence[str],
+        collect: Callable[[], Dict[LabelValues, float]],
+    ) -> CallbackMetric:
+        return self.register(CallbackMetric(name, documentation, kind, labels, collect))
+
+    def render(self) -> str:
+        """Render every metric in the Prometheus text format (version 0.0.4)"""
+        lines = []
+        for metric in self._metrics.values():
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for name, labels, value in metric.samples():
+                lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+HTTP_REQUEST_SECONDS = registry.histogram(
+    "http_request_duration_seconds",
+    "Time to produce a response, by route and status",
+    ("method", "route", "status"),
+)
+HTTP_REQUESTS_IN_FLIGHT = registry.gauge(
+    "http_requests_in_flight", "Requests being handled"
+)
+STAGE_SECONDS = registry.histogram(
+    "graph_stage_duration_seconds", "Time spent in each graph node", ("stage",)
+)
+STAGES_IN_FLIGHT = registry.gauge(
+    "graph_stages_in_flight", "Graph nodes currently running", ("stage",)
+)
+EXTERNAL_CALL_SECONDS = registry.histogram(
+    "external_call_duration_seconds",
+    "Latency of calls to external services, by outcome",
+    ("service", "outcome"),
+)
+CPU_TASK_SECONDS = registry.histogram(
+    "cpu_task_duration_seconds", "Run time of CPU-bound transforms", ("task",)
+)
+DB_QUERY_SECONDS = registry.histogram(
+    "db_query_duration_seconds", "Database statement latency", ("operation",)
+)
+LLM_TOKENS = registry.counter(
+    "llm_tokens_total", "Tokens used by LLM calls", ("model", "kind")
+)
+LLM_CALL_SECONDS = registry.histogram(
+    "llm_call_duration_seconds", "Latency of LLM calls, by model", ("model",)
+)
+LLM_COST = registry.counter(
+    "llm_cost_usd_total", "Estimated spend on LLM calls, by model", ("model",)
+)
+LLM_ROUTES = registry.counter(
+    "llm_routes_total", "Model chosen per generation, by reason", ("model", "reason")
+)
+LLM_ESCALATIONS = registry.counter(
+    "llm_escalations_total",
+    "Generations retried on the larger model after incomplete output",
+    ("from_model", "to_model"),
+)
+RATE_LIMIT_WAIT_SECONDS = registry.histogram(
+    "rate_limit_wait_seconds", "Time calls waited for a provider token", ("provider",)
+)
+ADMISSION_QUEUED = registry.gauge(
+    "admission_queued_requests", "Requests waiting for an admission slot"
+)
+ADMISSION_REJECTED = registry.counter(
+    "admission_rejected_total", "Requests shed by admission control", ("reason",)
+)
+GRAPH_RUNS = registry.counter(
+    "graph_runs_total", "Graph runs, fresh or resumed from a checkpoint", ("mode",)
+)
+CHECKPOINT_THREADS_COLLECTED = registry.counter(
+    "checkpoint_threads_collected_total", "Failed runs whose checkpoints expired"
+)
+SPECULATIVE_DRAFTS = registry.counter(
+    "speculative_drafts_total",
+    "Draft bios generated from search snippets, by outcome",
+    ("outcome",),
+)
+SPECULATIVE_DIVERGENCE = registry.histogram(
+    "speculative_divergence_ratio",
+    "Share of scraped words the search snippets did not contain",
+    buckets=(0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 1.0),
+)
+
+
+@contextmanager
+def track_call(service: str) -> Iterator[None]:
+    """Time a call to an external service, labelled with its outcome"""
+    start = time.perf_counter()
+    outcome = "error"
+    try:
+        yield
+        outcome = "ok"
+    finally:
+        duration = time.perf_counter() - start
+        EXTERNAL_CALL_SECONDS.observe(duration, service=service, outcome=outcome)
+        logger.debug(
+            "external_call_finished",
+            service=service,
+            outcome=outcome,
+            duration_ms=round(duration * 1000, 2),
+        )
+
+
+def timed_node(stage: str, node: Callable[..., Any]) -> Callable[..., Any]:
+    """Wrap an async graph node to record its duration and concurrency"""
+
+    @functools.wraps(node)
+    async def wrapper(*args: Any, **kwargs: Any) -> Any:
+        STAGES_IN_FLIGHT.inc(stage=stage)
+        start = time.perf_counter()
+        try:
+            return await node(*args, **kwargs)
+        finally:
+            duration = time.perf_counter() - start
+            STAGES_IN_FLIGHT.dec(stage=stage)
+            STAGE_SECONDS.observe(duration, stage=stage)
+            logger.info(
+                "stage_finished", stage=stage, duration_ms=round(duration * 1000, 2)
+            )
+
+    return wrapper
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Record the latency of every statement executed on an engine"""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(
+        conn, cursor, statement, parameters, context, executemany
+    ):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info["query_start"].pop()
+        operation = statement.lstrip().split(None, 1)[0].upper() if statement else ""
+        DB_QUERY_SECONDS.observe(time.perf_counter() - started, operation=operation)
+
+    @event.listens_for(engine, "handle_error")
+    def handle_error(context):
+        starts = (
+            context.connection.info.get("query_start") if context.connection else None
+        )
+        if starts:
+            starts.pop()
+
+
+def stats_collector(
+    sources: Dict[str, Callable[[], Dict[str, float]]],
+) -> Callable[[], Dict[LabelValues, float]]:
+    """
+    Build a callback reading named counters from existing stats objects,
+    labelled (source, field).
+    """
+
+    def collect() -> Dict[LabelValues, float]:
+        values = {}
+        for source, read in sources.items():
+            for field, value in read().items():
+                values[(source, field)] = value
+        return values
+
+    return collect
@@ -0,0 +1,97 @@
+import difflib
+import os
+import re
+import unicodedata
+from typing import Dict, Optional
+
+import structlog
+
+from app.db.controllers.bio import get_profile_names
+
+logger = structlog.get_logger()
+
+# Minimum similarity (0-1) for fuzzy name matches, 0 disables fuzzy matching
+PROFILE_INDEX_FUZZY_CUTOFF = float(os.getenv("PROFILE_INDEX_FUZZY_CUTOFF", "0"))
+
+_NON_WORD = re.compile(r"[^\w\s]")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_name(name: str) -> str:
+    """
+    Normalize a person name for lookups: strip accents and punctuation,
+    lowercase and collapse whitespace.
+    """
+    decomposed = unicodedata.normalize("NFKD", name)
+    ascii_name = "".join(c for c in decomposed if not unicodedata.combining(c))
+    ascii_name = _NON_WORD.sub(" ", ascii_name.casefold())
+    return _WHITESPACE.sub(" ", ascii_name).strip()
+
+
+class ProfileIndex:
+    """Local person name -> profile URL index over the profiles table"""
+
+    def __init__(self, fuzzy_cutoff: float = PROFILE_INDEX_FUZZY_CUTOFF):
+        """
+        Initialize an empty index; it is loaded from the database on first lookup.
+        Args:
+            fuzzy_cutoff: Minimum similarity for fuzzy matches, 0 disables them
+        """
+        self.fuzzy_cutoff = fuzzy_cutoff
+        self._urls: Dict[str, str] = {}
+        self._loaded = False
+        self.logger = logger.bind(module="profile_index")
+
+    async def load(self) -> None:
+        """(Re)build the index from the profiles table, preferring rows with a bio"""
+        urls: Dict[str, str] = {}
+        with_bio = set()
+        for url, person, has_bio in await get_profile_names():
+            key = normalize_name(person)
+            if not key:
+                continue
+            if key not in urls or (has_bio and key not in with_bio):
+                urls[key] = url
+            if has_bio:
+                with_bio.add(key)
+        self._urls = urls
+        self._loaded = True
+        self.logger.info("profile_index_loaded", profiles=len(urls))
+
+    def add(self, person: str, url: str) -> None:
+        """Register a newly stored profile without reloading the whole index"""
+        key = normalize_name(person)
+        if key:
+            self._urls.setdefault(key, url)
+
+    async def lookup(self, person: str) -> Optional[str]:
+        """
+        Find the stored profile URL for a person.
+
+        Args:
+            person (str): Person name as typed by the caller
+
+        Returns:
+            Optional[str]: Profile URL, None if the person is unknown locally
+        """
+        if not self._loaded:
+            try:
+                await self.load()
+            except Exception as e:
+                self.logger.error("profile_index_load_failed", error=str(e))
+                return None
+
+        key = normalize_name(person)
+        if not key:
+            return None
+        url = self._urls.get(key)
+        if url or not self.fuzzy_cutoff:
+            return url
+
+        matches = difflib.get_close_matches(
+            key, self._urls.keys(), n=1, cutoff=self.fuzzy_cutoff
+        )
+        return self._urls[matches[0]] if matches else None
+
+
+profile_index = ProfileIndex()
@@ -0,0 +1,231 @@
+import asyncio
+import os
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+import structlog
+
+from app.db.controllers.bio import (
+    get_stale_profiles,
+    record_profile_fetch,
+    record_profile_fetch_failure,
+    update_user_bio,
+)
+from app.graph.chains.generation import OPENAI_MODEL, bio_generator
+from app.graph.utils.context import CONTEXT_TOKEN_BUDGET, prepare_context
+from app.graph.utils.executor import cpu_executor
+from app.graph.utils.scrape_profile import content_hash, fetch_profile
+from app.graph.utils.shared_state import SharedSingleFlight, shared_store
+from app.models.models import DBProfile
+
+logger = structlog.get_logger()
+
+# Profiles fetched longer ago than this are revalidated
+PROFILE_STALE_AFTER_SECONDS = int(os.getenv("PROFILE_STALE_AFTER_SECONDS", "604800"))
+# Seconds between background sweeps for stale profiles (0 disables them)
+PROFILE_REFRESH_INTERVAL_SECONDS = int(
+    os.getenv("PROFILE_REFRESH_INTERVAL_SECONDS", "3600")
+)
+# Stale profiles revalidated per sweep, and how many at once
+PROFILE_REFRESH_BATCH_SIZE = int(os.getenv("PROFILE_REFRESH_BATCH_SIZE", "50"))
+PROFILE_REFRESH_CONCURRENCY = int(os.getenv("PROFILE_REFRESH_CONCURRENCY", "4"))
+
+# Shared lease electing the one worker that sweeps
+SWEEPER_LEASE_KEY = "profile_refresh"
+
+# Refresh outcomes
+NOT_MODIFIED = "not_modified"
+UNCHANGED = "unchanged"
+CHANGED = "changed"
+FAILED = "failed"
+
+
+@dataclass
+class RefreshStats:
+    """Counters of background refresh outcomes"""
+
+    not_modified: int = 0
+    unchanged: int = 0
+    changed: int = 0
+    regenerated: int = 0
+    failed: int = 0
+
+
+class ProfileRefresher:
+    """
+    Background revalidation of stored profiles. Pages are re-fetched with
+    conditional requests, and a bio is only regenerated when the cleaned
+    content hash differs from the stored one.
+
+    Every worker runs the loop, but only the one holding the sweeper lease
+    in the shared store sweeps; the others take over when its lease lapses.
+    """
+
+    def __init__(
+        self,
+        stale_after_seconds: int = PROFILE_STALE_AFTER_SECONDS,
+        interval_seconds: int = PROFILE_REFRESH_INTERVAL_SECONDS,
+        batch_size: int = PROFILE_REFRESH_BATCH_SIZE,
+        concurrency: int = PROFILE_REFRESH_CONCURRENCY,
+    ):
+        """
+        Initialize the refresher; the sweep loop is started by start().
+        Args:
+            stale_after_seconds: Age after which a profile is revalidated
+            interval_seconds: Seconds between sweeps, 0 disables the loop
+            batch_size: Maximum profiles revalidated per sweep
+            concurrency: Maximum profiles revalidated at once
+        """
+        self.stale_after = timedelta(seconds=stale_after_seconds)
+        self.interval = interval_seconds
+        self.batch_size = batch_size
+        self.concurrency = concurrency
+        self.stats = RefreshStats()
+        self._task: Optional[asyncio.Task] = None
+        # A URL refreshed by a sweep and on demand at once is fetched once,
+        # whichever worker asks
+        self._flight: SharedSingleFlight[str] = SharedSingleFlight("refresh")
+        self.logger = logger.bind(module="profile_refresh")
+
+    def start(self) -> None:
+        """Start the periodic sweep loop (idempotent, no-op when disabled)"""
+        if self.interval <= 0 or (self._task and not self._task.done()):
+            return
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Cancel the sweep loop and wait for it to exit"""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        try:
+            await shared_store.release(SWEEPER_LEASE_KEY)
+        except Exception as e:
+            self.logger.warning("profile_refresh_release_failed", error=str(e))
+
+    async def _run(self) -> None:
+        # The lease outlives one interval, so the sweeper keeps it between
+        # sweeps and a standby only takes over once the sweeper is gone
+        lease_seconds = self.interval * 2
+        while True:
+            # Wait one interval first: a restart should not trigger a sweep
+            await asyncio.sleep(self.interval)
+            try:
+                if await shared_store.acquire(SWEEPER_LEASE_KEY, lease_seconds):
+                    await self.sweep()
+                    # Renew after a long sweep so the lease covers the sleep
+                    await shared_store.acquire(SWEEPER_LEASE_KEY, lease_seconds)
+            except Exception as e:
+                self.logger.error("profile_refresh_sweep_failed", error=str(e))
+
+    async def sweep(self) -> int:
+        """
+        Revalidate one batch of stale profiles.
+
+        Returns:
+            int: Number of profiles revalidated
+        """
+        before = datetime.now(timezone.utc) - self.stale_after
+        profiles = await get_stale_profiles(before, self.batch_size)
+        if not profiles:
+            return 0
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def bounded(profile: DBProfile) -> str:
+            async with semaphore:
+                return await self.refresh(profile)
+
+        outcomes = await asyncio.gather(*(bounded(p) for p in profiles))
+        self.logger.info(
+            "profile_refresh_sweep",
+            profiles=len(profiles),
+            changed=outcomes.count(CHANGED),
+            failed=outcomes.count(FAILED),
+        )
+        return len(profiles)
+
+    async def refresh(self, profile: DBProfile) -> str:
+        """
+        Revalidate one stored profile.
+
+        Args:
+            profile (DBProfile): Stored profile row
+
+        Returns:
+            str: One of NOT_MODIFIED, UNCHANGED, CHANGED or FAILED
+        """
+        return await self._flight.do(profile.url, lambda: self._refresh(profile))
+
+    async def _refresh(self, profile: DBProfile) -> str:
+        try:
+            result = await fetch_profile(
+                profile.url, etag=profile.etag, last_modified=profile.last_modified
+            )
+            if result.not_modified:
+                await record_profile_fetch(
+                    profile.url, result.etag, result.last_modified
+                )
+                self.stats.not_modified += 1
+                return NOT_MODIFIED
+
+            # Rows stored before hashing was added are compared by their data
+            stored_hash = profile.content_hash or content_hash(profile.scrapped_data)
+            new_hash = content_hash(result.text)
+            if new_hash == stored_hash:
+                await record_profile_fetch(
+                    profile.url, result.etag, result.last_modified
+                )
+                self.stats.unchanged += 1
+                return UNCHANGED
+
+            # Profiles nobody asked a bio for are not worth an LLM call. The
+            # new hash is stored only after the bio made from it, so a failed
+            # regeneration is retried by the next sweep
+            if profile.bio:
+                await self.regenerate(profile, result.text)
+            await record_profile_fetch(
+                profile.url,
+                result.etag,
+                result.last_modified,
+                scrapped_data=result.text,
+                content_hash=new_hash,
+            )
+            self.stats.changed += 1
+            return CHANGED
+        except Exception as e:
+            self.stats.failed += 1
+            self.logger.error("profile_refresh_failed", url=profile.url, error=str(e))
+            try:
+                await record_profile_fetch_failure(profile.url)
+            except Exception as record_error:
+                self.logger.error(
+                    "profile_refresh_failure_not_recorded",
+                    url=profile.url,
+                    error=str(record_error),
+                )
+            return FAILED
+
+    async def regenerate(self, profile: DBProfile, scrapped_data: str) -> None:
+        """Regenerate and store the bio of a profile whose content changed"""
+        context, _ = await cpu_executor.run(
+            prepare_context,
+            profile.person,
+            scrapped_data,
+            CONTEXT_TOKEN_BUDGET,
+            OPENAI_MODEL,
+            size_hint=len(scrapped_data),
+        )
+        bio = await bio_generator.agenerate(profile.person, context)
+        await update_user_bio(url=profile.url, bio=bio.model_dump())
+        self.stats.regenerated += 1
+        self.logger.info("profile_bio_regenerated", url=profile.url)
+
+
+profile_refresher = ProfileRefresher()
@@ -0,0 +1,31 @@
+from typing import Any
+
+import structlog
+from langchain_core.callbacks import adispatch_custom_event
+
+logger = structlog.get_logger()
+
+PROGRESS_EVENT = "progress"
+
+
+async def report_progress(stage: str, status: str, **data: Any) -> None:
+    """
+    Emit a pipeline progress event to streaming clients.
+
+    Dispatched as a LangChain custom event, so it only reaches callers that
+    consume graph.astream_events; outside a graph run it is a no-op.
+
+    Args:
+        stage (str): Pipeline stage, e.g. "search", "scrape", "generate"
+        status (str): Stage status, e.g. "started", "done"
+        **data: Extra JSON-serializable fields for the event
+    """
+    try:
+        await adispatch_custom_event(
+            PROGRESS_EVENT, {"stage": stage, "status": status, **data}
+        )
+    except RuntimeError:
+        # No parent run: called outside of a graph invocation
+        pass
+    except Exception as e:
+        logger.warning("progress_dispatch_failed", stage=stage, error=str(e))
@@ -0,0 +1,100 @@
+import asyncio
+import os
+import time
+from typing import Dict
+
+from app.graph.utils.metrics import RATE_LIMIT_WAIT_SECONDS
+
+# Longest a call queues for a provider token before failing with 429
+RATE_LIMIT_MAX_WAIT_SECONDS = float(os.getenv("RATE_LIMIT_MAX_WAIT_SECONDS", "30"))
+
+# Requests per second and burst size per provider, 0 disables the limit
+PROVIDER_LIMITS = {
+    provider: (
+        float(os.getenv(f"RATE_LIMIT_{provider.upper()}_PER_SECOND", default_rate)),
+        float(os.getenv(f"RATE_LIMIT_{provider.upper()}_BURST", default_burst)),
+    )
+    for provider, default_rate, default_burst in (
+        ("tavily", "5", "10"),
+        ("jina", "10", "20"),
+        ("openai", "8", "16"),
+    )
+}
+
+
+class RateLimitExceeded(Exception):
+    """A provider's token bucket cannot serve a call within the allowed wait"""
+
+    def __init__(self, provider: str, retry_after: float):
+        super().__init__(
+            f"Rate limit for {provider} exceeded, retry in {retry_after:.1f}s"
+        )
+        self.provider = provider
+        self.retry_after = retry_after
+
+
+class TokenBucket:
+    """
+    Token bucket refilled at a fixed rate. Callers reserve tokens in arrival
+    order, so waits are FIFO and a burst is spread out instead of retried.
+    """
+
+    def __init__(
+        self,
+        provider: str,
+        rate: float,
+        burst: float,
+        max_wait: float = RATE_LIMIT_MAX_WAIT_SECONDS,
+    ):
+        """
+        Initialize a full bucket.
+        Args:
+            provider: Name used in metrics and errors
+            rate: Tokens added per second, 0 disables limiting
+            burst: Bucket capacity
+            max_wait: Longest wait before RateLimitExceeded is raised
+        """
+        self.provider = provider
+        self.rate = rate
+        self.burst = max(burst, 1.0)
+        self.max_wait = max_wait
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self, tokens: float = 1.0) -> None:
+        """
+        Take tokens, sleeping until they are available.
+
+        Raises:
+            RateLimitExceeded: If the wait would exceed max_wait
+        """
+        if self.rate <= 0:
+            return
+        now = time.monotonic()
+        self._refill(now)
+        # Reserve now (the balance may go negative) so later callers queue
+        # behind this one
+        wait = max(0.0, (tokens - self._tokens) / self.rate)
+        if wait > self.max_wait:
+            raise RateLimitExceeded(self.provider, wait)
+        self._tokens -= tokens
+        RATE_LIMIT_WAIT_SECONDS.observe(wait, provider=self.provider)
+        if wait:
+            await asyncio.sleep(wait)
+
+
+_limiters: Dict[str, TokenBucket] = {}
+
+
+def rate_limiter(provider: str) -> TokenBucket:
+    """Token bucket for a provider, shared by every caller in this process"""
+    if provider not in PROVIDER_LIMITS:
+        raise ValueError(f"Unknown rate-limited provider: {provider}")
+    if provider not in _limiters:
+        rate, burst = PROVIDER_LIMITS[provider]
+        _limiters[provider] = TokenBucket(provider, rate, burst)
+    return _limiters[provider]
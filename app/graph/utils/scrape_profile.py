@@ -1,52 +1,115 @@
-import aiohttp
+import hashlib
+import os
 import re
+from typing import Optional
+
+import structlog
+
 from app.db.controllers.bio import get_user_by_profile_url, save_new_user
+from app.graph.utils.executor import cpu_executor
+from app.graph.utils.http_client import FetchResult, http_client
+from app.graph.utils.metrics import track_call
+from app.graph.utils.rate_limit import rate_limiter
+from app.graph.utils.profile_index import profile_index
+from app.graph.utils.shared_state import SharedSingleFlight
+
+logger = structlog.get_logger().bind(module="scrape_profile")
+
+# Reader service that renders a profile page as markdown
+JINA_READER_URL = os.getenv("JINA_READER_URL", "https://r.jina.ai/")
+
+# Concurrent scrapes of the same URL share one fetch and one insert
+scrape_flight: SharedSingleFlight[str] = SharedSingleFlight("scrape")
+
+
+# Cleaning passes, compiled once. Each entry is (trigger, pattern, replacement):
+# a pass is skipped when its trigger substring does not occur in the text,
+# since the pattern cannot match without it. Order matters, as later passes
+# see the output of earlier ones.
+_CLEANING_PASSES = [
+    # Remove HTML tags
+    ("<", re.compile(r"<[^>]+>"), ""),
+    # Remove markdown links but keep link text
+    ("](", re.compile(r"\[([^\]]+)\]\([^\)]+\)"), r"\1"),
+    # Remove reference-style links
+    ("[", re.compile(r"\[\^?\d+\](?:\[[^\]]*\]|\([^\)]*\))?"), ""),
+    # Remove URLs
+    (
+        "://",
+        re.compile(
+            r"http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+"
+        ),
+        "",
+    ),
+    # Remove markdown tables
+    ("|", re.compile(r"\|[^\n]*\|"), ""),
+    ("\n", re.compile(r"[-|]+\s*\n"), ""),
+    # Remove footnotes
+    ("[^", re.compile(r"^\[\^[^\]]*\]:[^\n]*$", re.MULTILINE), ""),
+    # Remove image markdown
+    ("![", re.compile(r"!\[[^\]]*\]\([^\)]+\)"), ""),
+]
+
+# Remove emphasis markers but keep the text
+_EMPHASIS = re.compile(r"[*_]{1,2}([^*_]+)[*_]{1,2}")
+
+# Remove heading markers
+_HEADING = re.compile(r"^#+\s*", re.MULTILINE)
 
 
 def clean_markdown(markdown_content: str) -> str:
     """
     Clean markdown content by removing unnecessary elements while preserving core information.
     """
-    # Remove HTML tags
-    content = re.sub(r"<[^>]+>", "", markdown_content)
+    content = markdown_content
+    for trigger, pattern, replacement in _CLEANING_PASSES:
+        if trigger in content:
+            content = pattern.sub(replacement, content)
 
-    # Remove markdown links but keep link text
-    content = re.sub(r"\[([^\]]+)\]\([^\)]+\)", r"\1", content)
+    if "*" in content or "_" in content:
+        content = _EMPHASIS.sub(r"\1", content)
 
-    # Remove reference-style links
-    content = re.sub(r"\[\^?\d+\](?:\[[^\]]*\]|\([^\)]*\))?", "", content)
+    if "#" in content:
+        content = _HEADING.sub("", content)
 
-    # Remove URLs
-    content = re.sub(
-        r"http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+",
-        "",
-        content,
-    )
-
-    # Remove markdown tables
-    content = re.sub(r"\|[^\n]*\|", "", content)
-    content = re.sub(r"[-|]+\s*\n", "", content)
+    # Collapse every whitespace run (newlines included) to a single space and
+    # trim the ends; str.split() uses the same whitespace set as re's \s
+    return " ".join(content.split())
 
-    # Remove footnotes
-    content = re.sub(r"^\[\^[^\]]*\]:[^\n]*$", "", content, flags=re.MULTILINE)
 
-    # Remove image markdown
-    content = re.sub(r"!\[[^\]]*\]\([^\)]+\)", "", content)
+def content_hash(cleaned_data: str) -> str:
+    """SHA-256 of cleaned profile data, used to detect changed pages"""
+    return hashlib.sha256((cleaned_data or "").encode("utf-8")).hexdigest()
 
-    # Remove emphasis markers but keep the text
-    content = re.sub(r"[*_]{1,2}([^*_]+)[*_]{1,2}", r"\1", content)
 
-    # Remove heading markers
-    content = re.sub(r"^#+\s*", "", content, flags=re.MULTILINE)
+async def fetch_profile(
+    profile_url: str, etag: Optional[str] = None, last_modified: Optional[str] = None
+) -> FetchResult:
+    """
+    Fetch a profile as markdown through the reader service, conditionally
+    when validators from a previous fetch are given.
 
-    # Clean up any remaining artifacts
-    content = re.sub(r"\s+", " ", content)  # Collapse multiple spaces
-    content = re.sub(r"\n\s*\n", "\n\n", content)  # Normalize line breaks
-    content = re.sub(r"^\s+|\s+$", "", content, flags=re.MULTILINE)  # Trim lines
+    Args:
+        profile_url (str): URL of the profile
+        etag (Optional[str]): ETag of the previous fetch
+        last_modified (Optional[str]): Last-Modified of the previous fetch
 
-    # Final cleanup
-    cleaned_paragraphs = [p.strip() for p in content.split("\n\n") if p.strip()]
-    return "\n\n".join(cleaned_paragraphs)
+    Returns:
+        FetchResult: Fetch outcome, with the text cleaned unless it was a 304
+    """
+    with track_call("jina"):
+        result = await http_client.fetch(
+            f"{JINA_READER_URL}{profile_url}",
+            etag=etag,
+            last_modified=last_modified,
+            limiter=rate_limiter("jina"),
+        )
+    if result.text is not None:
+        # Clean the markdown data off the event loop
+        result.text = await cpu_executor.run(
+            clean_markdown, result.text, size_hint=len(result.text)
+        )
+    return result
 
 
 async def scrape_profile(profile_url: str, person: str) -> str:
@@ -61,24 +124,32 @@ async def scrape_profile(profile_url: str, person: str) -> str:
     Returns:
         str: Cleaned markdown content with unnecessary elements removed
     """
-    # Check if the profile already exists in the database
-    user = get_user_by_profile_url(profile_url)
-    if user:
-        return clean_markdown(user.scrapped_data)
-
-    print("Fetching profile in markdown format...")
-    request_url = f"https://r.jina.ai/{profile_url}"
-
-    # Fetch markdown data asynchronously
-    async with aiohttp.ClientSession() as session:
-        async with session.get(request_url) as response:
-            response.raise_for_status()
-            markdown_data = await response.text()
+    return await scrape_flight.do(
+        profile_url, lambda: _scrape_profile(profile_url, person)
+    )
 
-    # Clean the markdown data
-    cleaned_data = clean_markdown(markdown_data)
 
-    # Save the new profile in the database
-    save_new_user(url=profile_url, person=person, scrapped_data=cleaned_data)
+async def _scrape_profile(profile_url: str, person: str) -> str:
+    """Fetch, clean and store a profile; see scrape_profile."""
+    # Check if the profile already exists in the database
+    user = await get_user_by_profile_url(profile_url)
+    if user:
+        # Stored data was cleaned before it was saved
+        return user.scrapped_data
+
+    logger.debug("profile_fetch_started", url=profile_url)
+    result = await fetch_profile(profile_url)
+    cleaned_data = result.text
+
+    # Save the new profile with the validators for later conditional refreshes
+    await save_new_user(
+        url=profile_url,
+        person=person,
+        scrapped_data=cleaned_data,
+        content_hash=content_hash(cleaned_data),
+        etag=result.etag,
+        last_modified=result.last_modified,
+    )
+    profile_index.add(person, profile_url)
 
     return cleaned_data
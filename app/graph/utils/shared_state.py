@@ -0,0 +1,283 @@
+import asyncio
+import json
+import os
+import time
+import uuid
+from abc import ABC, abstractmethod
+from typing import Any, Awaitable, Callable, Hashable, Optional, Tuple, TypeVar
+
+import aiosqlite
+import structlog
+
+from app.graph.utils.single_flight import SingleFlight
+
+logger = structlog.get_logger()
+
+T = TypeVar("T")
+
+# "local" keeps caches and single-flights per process, "sqlite" shares them
+# between the workers of one host through a SQLite file
+SHARED_STATE_BACKEND = os.getenv("SHARED_STATE_BACKEND", "local")
+SHARED_STATE_PATH = os.getenv("SHARED_STATE_PATH", "./shared_state.db")
+# A leader renews its lease while working; a crashed leader's lease lapses
+SHARED_LEASE_SECONDS = float(os.getenv("SHARED_LEASE_SECONDS", "30"))
+SHARED_POLL_INTERVAL_SECONDS = float(os.getenv("SHARED_POLL_INTERVAL_SECONDS", "0.2"))
+# How long a finished flight's result stays readable by waiting workers
+SHARED_RESULT_TTL_SECONDS = float(os.getenv("SHARED_RESULT_TTL_SECONDS", "60"))
+# Purge expired entries and leases after this many writes
+SHARED_PURGE_EVERY = 200
+
+
+def shared_key(key: Hashable) -> str:
+    """Stable string form of a cache or flight key, identical in every process"""
+    return json.dumps(key, sort_keys=True, default=str)
+
+
+class SharedStore(ABC):
+    """Interface of state shared between the worker processes"""
+
+    async def start(self) -> None:
+        return None
+
+    async def close(self) -> None:
+        return None
+
+    @abstractmethod
+    async def get(
+        self, namespace: str, key: str, newer_than: float = 0.0
+    ) -> Optional[Any]:
+        """Return an unexpired value stored after newer_than, or None"""
+
+    @abstractmethod
+    async def set(self, namespace: str, key: str, value: Any, ttl: float) -> None:
+        """Store value under key for ttl seconds"""
+
+    @abstractmethod
+    async def acquire(self, key: str, lease_seconds: float) -> bool:
+        """Take (or renew) the lease on key; False while another process holds it"""
+
+    @abstractmethod
+    async def release(self, key: str) -> None:
+        """Drop this process's lease on key"""
+
+
+class LocalStore(SharedStore):
+    """
+    Nothing is shared: the in-process caches and single-flights already
+    cover a single worker, so every lease is granted and nothing is stored.
+    """
+
+    async def get(
+        self, namespace: str, key: str, newer_than: float = 0.0
+    ) -> Optional[Any]:
+        return None
+
+    async def set(self, namespace: str, key: str, value: Any, ttl: float) -> None:
+        return None
+
+    async def acquire(self, key: str, lease_seconds: float) -> bool:
+        return True
+
+    async def release(self, key: str) -> None:
+        return None
+
+
+class SqliteStore(SharedStore):
+    """
+    Entries and leases in a SQLite file shared by the workers on one host.
+    SQLite's own file locking serializes writers across processes.
+    """
+
+    def __init__(self, path: str = SHARED_STATE_PATH):
+        self.path = path
+        # Identifies this process's leases
+        self.owner = uuid.uuid4().hex
+        self._db: Optional[aiosqlite.Connection] = None
+        self._open_lock = asyncio.Lock()
+        self._writes = 0
+        self.logger = logger.bind(module="shared_state")
+
+    async def start(self) -> None:
+        """Open the connection and create the tables (idempotent)"""
+        async with self._open_lock:
+            if self._db is not None:
+                return
+            db = await aiosqlite.connect(self.path, isolation_level=None)
+            await db.execute("PRAGMA journal_mode=WAL")
+            await db.execute("PRAGMA synchronous=NORMAL")
+            await db.execute("PRAGMA busy_timeout=5000")
+            await db.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                " namespace TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL,"
+                " stored_at REAL NOT NULL, expires_at REAL NOT NULL,"
+                " PRIMARY KEY (namespace, key))"
+            )
+            await db.execute(
+                "CREATE TABLE IF NOT EXISTS leases ("
+                " key TEXT PRIMARY KEY, owner TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+            self._db = db
+
+    async def close(self) -> None:
+        if self._db is not None:
+            await self._db.execute("DELETE FROM leases WHERE owner = ?", (self.owner,))
+            await self._db.close()
+            self._db = None
+
+    async def _conn(self) -> aiosqlite.Connection:
+        if self._db is None:
+            await self.start()
+        return self._db
+
+    async def get(
+        self, namespace: str, key: str, newer_than: float = 0.0
+    ) -> Optional[Any]:
+        db = await self._conn()
+        async with db.execute(
+            "SELECT value FROM entries WHERE namespace = ? AND key = ?"
+            " AND expires_at > ? AND stored_at >= ?",
+            (namespace, key, time.time(), newer_than),
+        ) as cursor:
+            row = await cursor.fetchone()
+        return json.loads(row[0]) if row else None
+
+    async def set(self, namespace: str, key: str, value: Any, ttl: float) -> None:
+        db = await self._conn()
+        now = time.time()
+        await db.execute(
+            "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?)",
+            (namespace, key, json.dumps(value, ensure_ascii=False), now, now + ttl),
+        )
+        await self._maybe_purge(db, now)
+
+    async def acquire(self, key: str, lease_seconds: float) -> bool:
+        db = await self._conn()
+        now = time.time()
+        await db.execute(
+            "INSERT INTO leases VALUES (?, ?, ?) ON CONFLICT(key) DO UPDATE"
+            " SET owner = excluded.owner, expires_at = excluded.expires_at"
+            " WHERE leases.owner = excluded.owner OR leases.expires_at < ?",
+            (key, self.owner, now + lease_seconds, now),
+        )
+        async with db.execute(
+            "SELECT owner FROM leases WHERE key = ?", (key,)
+        ) as cursor:
+            row = await cursor.fetchone()
+        return row is not None and row[0] == self.owner
+
+    async def release(self, key: str) -> None:
+        db = await self._conn()
+        await db.execute(
+            "DELETE FROM leases WHERE key = ? AND owner = ?", (key, self.owner)
+        )
+
+    async def _maybe_purge(self, db: aiosqlite.Connection, now: float) -> None:
+        self._writes += 1
+        if self._writes % SHARED_PURGE_EVERY:
+            return
+        await db.execute("DELETE FROM entries WHERE expires_at < ?", (now,))
+        await db.execute("DELETE FROM leases WHERE expires_at < ?", (now,))
+
+
+def build_shared_store(backend: str = SHARED_STATE_BACKEND) -> SharedStore:
+    """Create the store selected by SHARED_STATE_BACKEND"""
+    if backend == "local":
+        return LocalStore()
+    if backend == "sqlite":
+        return SqliteStore()
+    raise ValueError(f"Unknown SHARED_STATE_BACKEND: {backend}")
+
+
+shared_store = build_shared_store()
+
+
+class SharedSingleFlight(SingleFlight[T]):
+    """
+    SingleFlight that also coalesces across worker processes: the process
+    holding the key's lease runs the work and publishes the JSON-serializable
+    result; the others poll for it instead of repeating the work.
+    """
+
+    def __init__(
+        self,
+        namespace: str,
+        store: Optional[SharedStore] = None,
+        lease_seconds: float = SHARED_LEASE_SECONDS,
+        result_ttl: float = SHARED_RESULT_TTL_SECONDS,
+    ):
+        """
+        Initialize the flight.
+        Args:
+            namespace: Prefix separating this flight's keys from other flights
+            store: Shared store, the process-wide one by default
+            lease_seconds: Lease length, renewed while the work runs
+            result_ttl: Seconds a published result stays readable
+        """
+        super().__init__()
+        self.namespace = namespace
+        self.store = store or shared_store
+        self.lease_seconds = lease_seconds
+        self.result_ttl = result_ttl
+        self.remote_followers = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        return await super().do(key, lambda: self._do_shared(shared_key(key), fn))
+
+    async def _do_shared(self, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        lease_key = f"{self.namespace}:{key}"
+        waiting_since = time.time()
+        followed = False
+        while True:
+            if await self.store.acquire(lease_key, self.lease_seconds):
+                return await self._lead(lease_key, key, fn)
+            if not followed:
+                followed = True
+                self.remote_followers += 1
+            await asyncio.sleep(SHARED_POLL_INTERVAL_SECONDS)
+            result = await self.store.get(self.namespace, key, newer_than=waiting_since)
+            if result is not None:
+                return result
+
+    async def _lead(
+        self, lease_key: str, key: str, fn: Callable[[], Awaitable[T]]
+    ) -> T:
+        renewal = asyncio.create_task(self._renew(lease_key))
+        try:
+            result = await fn()
+            if result is not None:
+                await self.store.set(self.namespace, key, result, self.result_ttl)
+            return result
+        finally:
+            renewal.cancel()
+            await self.store.release(lease_key)
+
+    async def _renew(self, lease_key: str) -> None:
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            try:
+                await self.store.acquire(lease_key, self.lease_seconds)
+            except Exception as e:
+                logger.warning("shared_lease_renew_failed", key=lease_key, error=str(e))
+
+
+class SharedCache:
+    """Read-through view of a namespace in the shared store"""
+
+    def __init__(self, namespace: str, ttl: float, store: Optional[SharedStore] = None):
+        self.namespace = namespace
+        self.ttl = ttl
+        self.store = store or shared_store
+        self.logger = logger.bind(module="shared_cache", namespace=namespace)
+
+    async def get(self, key: Hashable) -> Optional[Any]:
+        try:
+            return await self.store.get(self.namespace, shared_key(key))
+        except Exception as e:
+            self.logger.error("shared_cache_get_failed", error=str(e))
+            return None
+
+    async def set(self, key: Hashable, value: Any) -> None:
+        try:
+            await self.store.set(self.namespace, shared_key(key), value, self.ttl)
+        except Exception as e:
+            self.logger.error("shared_cache_set_failed", error=str(e))
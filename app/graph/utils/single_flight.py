@@ -0,0 +1,150 @@
+import asyncio
+from typing import (
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Generic,
+    Hashable,
+    List,
+    Optional,
+    Set,
+    TypeVar,
+)
+
+T = TypeVar("T")
+
+
+class SingleFlight(Generic[T]):
+    """
+    Coalesce concurrent calls with the same key: the first caller (leader)
+    starts the work and every concurrent caller (follower) awaits its result.
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, "asyncio.Task[T]"] = {}
+        self.leaders = 0
+        self.followers = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """
+        Run fn once per key among concurrent callers.
+
+        The work runs in its own task, so a leader that is cancelled (e.g. the
+        client disconnected) does not cancel it for the followers.
+
+        Args:
+            key: Identity of the work, e.g. a normalized person name or URL
+            fn: Zero-argument coroutine factory performing the work
+
+        Returns:
+            The result of fn, shared by all concurrent callers
+        """
+        task = self._calls.get(key)
+        if task is None:
+            self.leaders += 1
+            task = asyncio.ensure_future(fn())
+            self._calls[key] = task
+            task.add_done_callback(lambda _: self._calls.pop(key, None))
+        else:
+            self.followers += 1
+        return await asyncio.shield(task)
+
+    def in_flight(self) -> int:
+        """Number of keys currently being worked on"""
+        return len(self._calls)
+
+
+class StreamBroadcast(Generic[T]):
+    """Buffer of items produced by one stream, replayable by many subscribers"""
+
+    def __init__(self):
+        self.items: List[T] = []
+        self.done = False
+        self.error: Optional[BaseException] = None
+        self._changed = asyncio.Condition()
+
+    async def publish(self, item: T) -> None:
+        async with self._changed:
+            self.items.append(item)
+            self._changed.notify_all()
+
+    async def close(self, error: Optional[BaseException] = None) -> None:
+        async with self._changed:
+            self.done = True
+            self.error = error
+            self._changed.notify_all()
+
+    async def subscribe(self) -> AsyncIterator[T]:
+        """Yield every item from the start of the stream, then follow it live"""
+        index = 0
+        while True:
+            async with self._changed:
+                await self._changed.wait_for(
+                    lambda: index < len(self.items) or self.done
+                )
+            while index < len(self.items):
+                yield self.items[index]
+                index += 1
+            if self.done and index >= len(self.items):
+                if self.error is not None:
+                    raise self.error
+                return
+
+
+class StreamSingleFlight(Generic[T]):
+    """
+    Coalesce concurrent streams with the same key: the leader's stream is
+    consumed once and followers replay its items as they arrive.
+    """
+
+    def __init__(self):
+        self._streams: Dict[Hashable, StreamBroadcast[T]] = {}
+        self._pumps: Set["asyncio.Task[None]"] = set()
+        self.leaders = 0
+        self.followers = 0
+
+    def stream(
+        self, key: Hashable, factory: Callable[[], AsyncIterator[T]]
+    ) -> AsyncIterator[T]:
+        """
+        Subscribe to the stream for key, starting it if none is in flight.
+
+        Args:
+            key: Identity of the stream
+            factory: Zero-argument callable returning the async iterator to share
+
+        Returns:
+            Async iterator over the shared stream's items
+        """
+        broadcast = self._streams.get(key)
+        if broadcast is None:
+            self.leaders += 1
+            broadcast = StreamBroadcast()
+            self._streams[key] = broadcast
+            pump = asyncio.ensure_future(self._pump(key, broadcast, factory))
+            self._pumps.add(pump)
+            pump.add_done_callback(self._pumps.discard)
+        else:
+            self.followers += 1
+        return broadcast.subscribe()
+
+    async def _pump(
+        self,
+        key: Hashable,
+        broadcast: StreamBroadcast[T],
+        factory: Callable[[], AsyncIterator[T]],
+    ) -> None:
+        error: Optional[BaseException] = None
+        try:
+            async for item in factory():
+                await broadcast.publish(item)
+        except Exception as e:
+            error = e
+        finally:
+            self._streams.pop(key, None)
+            await broadcast.close(error)
+
+    def in_flight(self) -> int:
+        """Number of streams currently being produced"""
+        return len(self._streams)
@@ -0,0 +1,154 @@
+import asyncio
+import os
+import re
+from typing import Optional, Set
+
+import structlog
+from langchain_core.callbacks import adispatch_custom_event
+
+from app.graph.chains.generation import bio_generator
+from app.graph.utils.metrics import SPECULATIVE_DIVERGENCE, SPECULATIVE_DRAFTS
+from app.graph.utils.progress import report_progress
+from app.models.models import BioGeneration
+
+logger = structlog.get_logger().bind(module="speculation")
+
+# Draft a bio from the search snippets while the profile is scraped; requests
+# can override this with GraphState.speculative
+SPECULATIVE_GENERATION = os.getenv("SPECULATIVE_GENERATION", "false").lower() == "true"
+# What to do with the draft once the scrape arrives: "diverge" regenerates
+# only when the scraped text adds enough, "refine" always regenerates and
+# "keep" always keeps the draft
+SPECULATIVE_POLICY = os.getenv("SPECULATIVE_POLICY", "diverge")
+# "diverge" regenerates when more than this share of the scraped words is new
+SPECULATIVE_DIVERGENCE_THRESHOLD = float(
+    os.getenv("SPECULATIVE_DIVERGENCE_THRESHOLD", "0.6")
+)
+# Snippets shorter than this are too thin to draft from
+SPECULATIVE_MIN_SNIPPET_CHARS = int(os.getenv("SPECULATIVE_MIN_SNIPPET_CHARS", "200"))
+
+SPECULATIVE_POLICIES = ("diverge", "refine", "keep")
+
+# Tag on the draft LLM run, so streams can tell its chunks apart
+DRAFT_TAG = "speculative_draft"
+# Custom event carrying the complete draft bio
+DRAFT_EVENT = "draft"
+
+_WORD = re.compile(r"\w{3,}")
+
+
+def content_words(text: str) -> Set[str]:
+    return set(_WORD.findall(text.casefold()))
+
+
+def divergence(snippets: str, scraped: str) -> float:
+    """
+    Share of the distinct words in the scraped text that the snippets did
+    not contain: 0 when the scrape adds nothing, 1 when nothing overlaps.
+    """
+    scraped_words = content_words(scraped)
+    if not scraped_words:
+        return 0.0
+    return len(scraped_words - content_words(snippets)) / len(scraped_words)
+
+
+def should_refine(
+    snippets: str,
+    scraped: str,
+    policy: str = SPECULATIVE_POLICY,
+    threshold: float = SPECULATIVE_DIVERGENCE_THRESHOLD,
+) -> bool:
+    """
+    Decide whether the scraped profile warrants replacing the draft.
+
+    Args:
+        snippets: Search snippets the draft was generated from
+        scraped: Gathered profile text
+        policy: One of SPECULATIVE_POLICIES
+        threshold: Divergence above which the "diverge" policy regenerates
+
+    Returns:
+        bool: True to regenerate from the scraped text
+    """
+    if policy not in SPECULATIVE_POLICIES:
+        raise ValueError(f"Unknown SPECULATIVE_POLICY: {policy}")
+    if not scraped.strip() or policy == "keep":
+        return False
+    if policy == "refine":
+        return True
+    ratio = divergence(snippets, scraped)
+    SPECULATIVE_DIVERGENCE.observe(ratio)
+    return ratio > threshold
+
+
+def speculation_enabled(requested: Optional[bool], snippets: Optional[str]) -> bool:
+    enabled = SPECULATIVE_GENERATION if requested is None else requested
+    return enabled and len(snippets or "") >= SPECULATIVE_MIN_SNIPPET_CHARS
+
+
+class Speculation:
+    """
+    A draft bio generated from search snippets while the profile is being
+    scraped. The draft streams to clients as soon as it is ready; resolve()
+    then keeps it or drops it in favour of a generation from the scrape.
+    """
+
+    def __init__(self, person: str, snippets: str):
+        self.person = person
+        self.snippets = snippets
+        self._task: "asyncio.Task[BioGeneration]" = asyncio.create_task(self._draft())
+
+    async def _draft(self) -> BioGeneration:
+        await report_progress("draft", "started")
+        # Drafts are about latency: the fast tier skips escalation
+        bio = await bio_generator.agenerate(
+            self.person, self.snippets, tags=[DRAFT_TAG], tier="fast"
+        )
+        try:
+            await adispatch_custom_event(DRAFT_EVENT, bio.model_dump())
+        except RuntimeError:
+            # No parent run: called outside of a graph invocation
+            pass
+        await report_progress("draft", "done")
+        return bio
+
+    async def resolve(self, scraped: str) -> Optional[BioGeneration]:
+        """
+        Settle the draft against the scraped profile.
+
+        Args:
+            scraped: Gathered profile text (empty when the scrape failed)
+
+        Returns:
+            Optional[BioGeneration]: The draft to keep, or None to generate
+            from the scraped text
+        """
+        if should_refine(self.snippets, scraped):
+            if not self._task.done():
+                # The scrape won the race: the draft is moot
+                outcome = "superseded"
+            elif self._task.cancelled() or self._task.exception() is not None:
+                outcome = "failed"
+            else:
+                outcome = "replaced"
+            await self.cancel()
+            self._record(outcome)
+            return None
+        try:
+            bio = await self._task
+        except Exception as e:
+            logger.warning("draft_failed", person=self.person, error=str(e))
+            self._record("failed")
+            return None
+        self._record("kept")
+        return bio
+
+    async def cancel(self) -> None:
+        """Stop the draft if it is still running"""
+        if not self._task.done():
+            self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+
+    def _record(self, outcome: str) -> None:
+        SPECULATIVE_DRAFTS.inc(outcome=outcome)
+        logger.info("draft_resolved", person=self.person, outcome=outcome)
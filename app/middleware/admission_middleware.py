@@ -0,0 +1,77 @@
+import asyncio
+import os
+from typing import Tuple
+
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.graph.utils.metrics import ADMISSION_QUEUED, ADMISSION_REJECTED
+
+# Requests doing graph work at once per process, and how many more may wait
+ADMISSION_MAX_IN_FLIGHT = int(os.getenv("ADMISSION_MAX_IN_FLIGHT", "64"))
+ADMISSION_MAX_QUEUE = int(os.getenv("ADMISSION_MAX_QUEUE", "128"))
+ADMISSION_QUEUE_TIMEOUT_SECONDS = float(
+    os.getenv("ADMISSION_QUEUE_TIMEOUT_SECONDS", "10")
+)
+# Routes that start graph work; health, metrics and job status stay unguarded
+ADMISSION_PATHS: Tuple[str, ...] = ("/api/v1/talk_spark", "/api/v1/langserve")
+
+
+class AdmissionMiddleware:
+    """
+    Bound the requests doing graph work: up to max_in_flight run, up to
+    max_queue wait for a slot, and the rest are shed with 503 and Retry-After
+    so latency for admitted requests stays stable under overload. A slot is
+    held until the response body has been fully sent, so streams count too.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        max_in_flight: int = ADMISSION_MAX_IN_FLIGHT,
+        max_queue: int = ADMISSION_MAX_QUEUE,
+        queue_timeout: float = ADMISSION_QUEUE_TIMEOUT_SECONDS,
+    ):
+        self.app = app
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self._slots = asyncio.Semaphore(max_in_flight)
+        self._queued = 0
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not scope["path"].startswith(ADMISSION_PATHS):
+            await self.app(scope, receive, send)
+            return
+
+        if self._slots.locked():
+            if self._queued >= self.max_queue:
+                await self._reject(scope, receive, send, "queue_full")
+                return
+            self._queued += 1
+            ADMISSION_QUEUED.inc()
+            try:
+                await asyncio.wait_for(self._slots.acquire(), self.queue_timeout)
+            except asyncio.TimeoutError:
+                await self._reject(scope, receive, send, "queue_timeout")
+                return
+            finally:
+                self._queued -= 1
+                ADMISSION_QUEUED.dec()
+        else:
+            await self._slots.acquire()
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self._slots.release()
+
+    async def _reject(
+        self, scope: Scope, receive: Receive, send: Send, reason: str
+    ) -> None:
+        ADMISSION_REJECTED.inc(reason=reason)
+        response = JSONResponse(
+            {"detail": "Server is at capacity, retry later"},
+            status_code=503,
+            headers={"Retry-After": str(max(1, round(self.queue_timeout)))},
+        )
+        await response(scope, receive, send)
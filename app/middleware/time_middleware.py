@@ -1,12 +1,49 @@
 import time
+import uuid
+
+import structlog
 from fastapi import Request
 
+from app.graph.utils.metrics import HTTP_REQUEST_SECONDS, HTTP_REQUESTS_IN_FLIGHT
+
+logger = structlog.get_logger()
+
+REQUEST_ID_HEADER = "X-Request-ID"
+
+
+def route_template(request: Request) -> str:
+    """Matched route path, so label cardinality stays bounded"""
+    route = request.scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
 
 async def middleware(request: Request, call_next):
+    request_id = request.headers.get(REQUEST_ID_HEADER) or uuid.uuid4().hex
+    # Every structlog event emitted while handling the request carries its id
+    structlog.contextvars.clear_contextvars()
+    structlog.contextvars.bind_contextvars(request_id=request_id)
+
+    HTTP_REQUESTS_IN_FLIGHT.inc()
     start_time = time.perf_counter()
-    response = await call_next(request)
-    end_time = time.perf_counter()
-    duration = f"{end_time - start_time:.2f}"
-    print(f"Request took {duration} seconds")
-    response.headers["X-Response-Time"] = str(duration)
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+    finally:
+        duration = time.perf_counter() - start_time
+        HTTP_REQUESTS_IN_FLIGHT.dec()
+        route = route_template(request)
+        HTTP_REQUEST_SECONDS.observe(
+            duration, method=request.method, route=route, status=str(status)
+        )
+        logger.info(
+            "request_finished",
+            method=request.method,
+            route=route,
+            status=status,
+            duration_ms=round(duration * 1000, 2),
+        )
+
+    response.headers["X-Response-Time"] = f"{duration:.2f}"
+    response.headers[REQUEST_ID_HEADER] = request_id
     return response
@@ -1,7 +1,10 @@
+from datetime import datetime
 from typing import List, Optional, Dict, Any
 from sqlmodel import SQLModel, Field, JSON
 from pydantic import BaseModel
 
+from app.db.types import CompressedText, PydanticJSON
+
 
 class BioGeneration(BaseModel):
     """Structured bio generated from LinkedIn profile data"""
@@ -22,8 +25,14 @@ class DBProfile(SQLModel, table=True):
     Attributes:
         url: The LinkedIn profile URL (primary key)
         person: Name of the person
-        scrapped_data: Raw scraped data from the profile
-        bio: Generated bio information
+        scrapped_data: Cleaned scraped text, stored compressed
+        bio: Generated bio, stored as compact JSON and loaded as BioGeneration
+        bio_updated_at: When the bio was last generated
+        content_hash: SHA-256 of the cleaned scraped data
+        fetched_at: When the profile page was last fetched or revalidated
+        fetch_failed_at: When the last revalidation failed, if it did
+        etag: ETag of the last fetch, for conditional requests
+        last_modified: Last-Modified of the last fetch, for conditional requests
     """
 
     __tablename__ = "profiles"
@@ -34,10 +43,110 @@ class DBProfile(SQLModel, table=True):
 
     person: str = Field(..., description="Name of the person")
 
-    scrapped_data: Optional[Dict[str, Any]] = Field(
-        default=None, sa_type=JSON, description="Raw scraped profile data"
+    scrapped_data: Optional[str] = Field(
+        default=None, sa_type=CompressedText, description="Cleaned scraped text"
+    )
+
+    bio: Optional[BioGeneration] = Field(
+        default=None,
+        sa_type=PydanticJSON(BioGeneration),
+        description="Generated bio information",
+    )
+
+    bio_updated_at: Optional[datetime] = Field(
+        default=None, index=True, description="When the bio was last generated"
+    )
+
+    content_hash: Optional[str] = Field(
+        default=None, description="SHA-256 of the cleaned scraped data"
+    )
+
+    fetched_at: Optional[datetime] = Field(
+        default=None, index=True, description="When the page was last fetched"
+    )
+
+    fetch_failed_at: Optional[datetime] = Field(
+        default=None, description="When the last revalidation failed"
+    )
+
+    etag: Optional[str] = Field(default=None, description="ETag of the last fetch")
+
+    last_modified: Optional[str] = Field(
+        default=None, description="Last-Modified of the last fetch"
+    )
+
+
+class DBGenerationCache(SQLModel, table=True):
+    """Persistent tier of the content-addressed bio generation cache
+
+    Attributes:
+        key: Hash of the model, prompt version and normalized inputs
+        value: Generated bio
+        size: Serialized size of value in bytes, used for eviction
+        last_accessed: Last read or write time, used for LRU eviction
+    """
+
+    __tablename__ = "generation_cache"
+
+    key: str = Field(primary_key=True, description="Generation cache key")
+
+    value: Dict[str, Any] = Field(sa_type=JSON, description="Generated bio")
+
+    size: int = Field(default=0, description="Serialized size in bytes")
+
+    last_accessed: float = Field(
+        default=0.0, index=True, description="Last access as a UNIX timestamp"
     )
 
-    bio: Optional[Dict[str, Any]] = Field(
-        default=None, sa_type=JSON, description="Generated bio information"
+
+class DBJob(SQLModel, table=True):
+    """Persistent queue entry for a background bio generation
+
+    Attributes:
+        id: Job identifier returned to the client
+        dedup_key: Profile URL, or normalized name when the URL is unknown
+        person: Name of the person
+        url: Profile URL, if known
+        force_refresh: Regenerate the bio even if a fresh one is stored
+        status: queued, running, succeeded, not_found or failed
+        priority: Higher priorities are claimed first
+        attempts: Number of runs started so far
+        max_attempts: Runs allowed before the job fails
+        result: Final bio and URL of a finished job
+        error: Last error message
+        created_at: When the job was submitted
+        updated_at: When the job last changed status
+        available_at: Earliest time a queued job may be claimed
+    """
+
+    __tablename__ = "jobs"
+
+    id: str = Field(primary_key=True, description="Job identifier")
+
+    dedup_key: str = Field(index=True, description="Key used to dedupe active jobs")
+
+    person: str = Field(..., description="Name of the person")
+
+    url: Optional[str] = Field(default=None, description="Profile URL")
+
+    force_refresh: bool = Field(default=False, description="Bypass the bio cache")
+
+    status: str = Field(default="queued", index=True, description="Job status")
+
+    priority: int = Field(default=0, description="Higher runs first")
+
+    attempts: int = Field(default=0, description="Runs started so far")
+
+    max_attempts: int = Field(default=3, description="Runs allowed before failing")
+
+    result: Optional[Dict[str, Any]] = Field(
+        default=None, sa_type=JSON, description="Bio and URL of a finished job"
     )
+
+    error: Optional[str] = Field(default=None, description="Last error message")
+
+    created_at: datetime = Field(description="When the job was submitted")
+
+    updated_at: datetime = Field(description="When the job last changed status")
+
+    available_at: datetime = Field(description="Earliest time the job may run")
@@ -1,4 +1,5 @@
-from typing import Optional
+from datetime import datetime
+from typing import Any, Dict, List, Literal, Optional
 from pydantic import BaseModel, Field
 
 
@@ -14,3 +15,95 @@ class UserProfile(BaseModel):
         None, description="The data scraped from the user's profile in markdown format"
     )
     bio: Optional[str] = Field(None, description="The user's bio in markdown format")
+
+
+class BatchItem(BaseModel):
+    """
+    A single person (and optionally their profile URL) in a batch request.
+    """
+
+    person: str = Field(..., description="The person to generate a bio for")
+    url: Optional[str] = Field(None, description="Profile URL, if already known")
+    force_refresh: bool = Field(
+        False, description="Regenerate the bio even if a cached one exists"
+    )
+
+
+class BatchRequest(BaseModel):
+    """
+    A batch of people to generate bios for.
+    """
+
+    items: List[BatchItem] = Field(..., description="People to process")
+    max_concurrency: Optional[int] = Field(
+        None, ge=1, description="Maximum number of graph runs in flight"
+    )
+    item_timeout: Optional[float] = Field(
+        None, gt=0, description="Per-item timeout in seconds"
+    )
+
+
+class BatchItemResult(BaseModel):
+    """
+    The outcome for one batch item, streamed back as a line of NDJSON.
+    """
+
+    index: int = Field(-1, description="Position of the item in the request")
+    person: str
+    url: Optional[str] = None
+    status: Literal["cached", "generated", "not_found", "timeout", "error"]
+    bio: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+
+
+class JobRequest(BaseModel):
+    """
+    A bio generation to run in the background.
+    """
+
+    person: str = Field(..., description="The person to generate a bio for")
+    url: Optional[str] = Field(None, description="Profile URL, if already known")
+    force_refresh: bool = Field(
+        False, description="Regenerate the bio even if a cached one exists"
+    )
+    priority: int = Field(0, description="Higher priorities run first")
+
+
+class JobStatus(BaseModel):
+    """
+    The state of a background bio generation.
+    """
+
+    id: str
+    person: str
+    url: Optional[str] = None
+    status: Literal["queued", "running", "succeeded", "not_found", "failed"]
+    priority: int = 0
+    attempts: int = 0
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
+
+
+class ProfileSearchResult(BaseModel):
+    """
+    A stored profile matching a search, best matches first.
+    """
+
+    url: str
+    person: str
+    score: float = Field(..., description="Relevance, higher is better")
+    snippet: str = Field("", description="Matched text with terms in [brackets]")
+    has_bio: bool
+
+
+class ProfileSearchResponse(BaseModel):
+    """
+    One page of profile search results.
+    """
+
+    results: List[ProfileSearchResult]
+    next_offset: Optional[int] = Field(
+        None, description="Offset of the next page, if there may be one"
+    )
@@ -1,17 +1,52 @@
-from fastapi import FastAPI, APIRouter
-from fastapi.responses import RedirectResponse, JSONResponse, StreamingResponse
+from fastapi import FastAPI, APIRouter, HTTPException, Query, Request
+from fastapi.responses import (
+    JSONResponse,
+    PlainTextResponse,
+    RedirectResponse,
+    StreamingResponse,
+)
 from fastapi.middleware.cors import CORSMiddleware
 from dotenv import load_dotenv, find_dotenv
 from langserve import add_routes
 from typing import AsyncGenerator
 from contextlib import asynccontextmanager
-from app.db.database import engine, init_db
+from app.db.controllers.jobs import get_job
+from app.db.controllers.search import search_profiles
+from app.db.database import async_engine, engine, init_db
+from app.graph.batch import BATCH_MAX_ITEMS, run_batch
+from app.graph.checkpoints import graph_runner
+from app.graph.jobs import job_queue, job_status
+from app.graph.observability import register_runtime_metrics
 from app.graph.state import GraphState
+from app.graph.streaming import bio_event_stream
 from app.graph.graph import graph
+from app.graph.chains.generation import OPENAI_MODEL, bio_generator
+from app.graph.utils.context import count_tokens, get_token_counter
+from app.graph.utils.bio_stream import format_sse
+from app.graph.utils.executor import cpu_executor
+from app.graph.utils.http_client import http_client
+from app.graph.utils.metrics import registry
+from app.graph.utils.profile_index import normalize_name
+from app.graph.utils.profile_refresh import profile_refresher
+from app.graph.utils.shared_state import shared_store
+from app.graph.utils.single_flight import StreamSingleFlight
+from app.graph.utils.structured_logging import configure_logging, shutdown_logging
+from app.graph.utils.rate_limit import RateLimitExceeded
 from app.middleware import time_middleware
+from app.middleware.admission_middleware import AdmissionMiddleware
+from app.schemas.schema import (
+    BatchRequest,
+    JobRequest,
+    JobStatus,
+    ProfileSearchResponse,
+    ProfileSearchResult,
+)
 import asyncio
+import math
+import os
 
 load_dotenv(find_dotenv())
+configure_logging()
 
 # API versioning
 api_v1_router = APIRouter(prefix="/api/v1")
@@ -21,15 +56,45 @@ api_v1_router = APIRouter(prefix="/api/v1")
 async def lifespan(app: FastAPI):
     """Handle startup and shutdown events for the FastAPI application."""
     # Initialize database tables
-    init_db()
+    await init_db()
+    await shared_store.start()
+    await graph_runner.start()
+    await http_client.start()
+    cpu_executor.start()
+    # Load the tokenizer off the event loop before the first request needs it
+    await asyncio.to_thread(get_token_counter, OPENAI_MODEL)
+    if cpu_executor.kind == "process":
+        # Pool children cache their own tokenizer; the counter itself cannot
+        # be pickled back, so warm them through a call that returns an int
+        await asyncio.gather(
+            *(
+                cpu_executor.run(count_tokens, "warm up", OPENAI_MODEL)
+                for _ in range(cpu_executor.max_workers)
+            )
+        )
+    # Build the OpenAI client here rather than at import time
+    bio_generator.warm_up()
+    # Revalidate stale profiles in the background
+    profile_refresher.start()
+    job_queue.start()
     yield
-    await engine.dispose()
+    await job_queue.stop()
+    await profile_refresher.stop()
+    await http_client.close()
+    await graph_runner.close()
+    await shared_store.close()
+    cpu_executor.shutdown()
+    await async_engine.dispose()
+    engine.dispose()
+    shutdown_logging()
 
 
 app = FastAPI(lifespan=lifespan)
 
 
-# Middleware configuration
+# Middleware configuration (the last added runs first); admission control
+# sits inside CORS so shed responses still carry CORS headers
+app.add_middleware(AdmissionMiddleware)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],  # Adjust as needed for production
@@ -40,6 +105,16 @@ app.add_middleware(
 app.middleware("http")(time_middleware.middleware)
 
 
+@app.exception_handler(RateLimitExceeded)
+async def rate_limit_exceeded(request: Request, exc: RateLimitExceeded) -> JSONResponse:
+    """Tell clients when a provider quota will have room again."""
+    return JSONResponse(
+        content={"detail": str(exc)},
+        status_code=429,
+        headers={"Retry-After": str(math.ceil(exc.retry_after))},
+    )
+
+
 @app.head("/health")
 @app.get("/health")
 async def health_check() -> JSONResponse:
@@ -53,17 +128,37 @@ async def redirect_root_to_docs() -> RedirectResponse:
     return RedirectResponse("/docs")
 
 
+# Concurrent streams for the same person replay the leader's events
+stream_flight: StreamSingleFlight[str] = StreamSingleFlight()
+
+register_runtime_metrics(registry, {"stream": stream_flight})
+
+
+@app.get("/metrics")
+async def metrics() -> PlainTextResponse:
+    """Expose metrics in the Prometheus text format."""
+    return PlainTextResponse(
+        registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
+
 async def stream_response(request: GraphState) -> AsyncGenerator[str, None]:
-    """Generate streamed response from graph in 'messages' stream mode."""
-    async for chunk in graph.astream(request.dict(), stream_mode="messages"):
-        if chunk.content:
-            yield chunk.content
+    """Generate streamed SSE response, sharing one graph run per person/URL."""
+    key = (
+        normalize_name(request.person),
+        request.url,
+        request.force_refresh,
+        request.speculative,
+        request.tier,
+    )
+    async for event in stream_flight.stream(key, lambda: bio_event_stream(request)):
+        yield event
 
 
 @api_v1_router.post("/talk_spark")
 async def talk_spark(request: GraphState) -> JSONResponse:
     """Handle a asynchronous conversation request."""
-    return await graph.ainvoke(request)
+    return await graph_runner.ainvoke(request.model_dump())
 
 
 @api_v1_router.post("/talk_spark/stream")
@@ -72,6 +167,72 @@ async def talk_spark_stream(request: GraphState) -> StreamingResponse:
     return StreamingResponse(stream_response(request), media_type="text/event-stream")
 
 
+async def batch_response(request: BatchRequest) -> AsyncGenerator[str, None]:
+    """Stream batch results as NDJSON, one line per input item."""
+    async for result in run_batch(
+        request.items, request.max_concurrency, request.item_timeout
+    ):
+        yield result.model_dump_json() + "\n"
+
+
+@api_v1_router.post("/talk_spark/batch")
+async def talk_spark_batch(request: BatchRequest) -> StreamingResponse:
+    """Handle a batch of conversation requests, streaming results as NDJSON."""
+    if len(request.items) > BATCH_MAX_ITEMS:
+        raise HTTPException(
+            status_code=413, detail=f"Batch exceeds {BATCH_MAX_ITEMS} items"
+        )
+    return StreamingResponse(batch_response(request), media_type="application/x-ndjson")
+
+
+@api_v1_router.post("/jobs", status_code=202)
+async def submit_job(request: JobRequest) -> JobStatus:
+    """Queue a bio generation and return its job right away."""
+    return job_status(await job_queue.submit(request))
+
+
+@api_v1_router.get("/jobs/{job_id}")
+async def get_job_status(job_id: str) -> JobStatus:
+    """Return the current status of a job."""
+    job = await get_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job_status(job)
+
+
+async def job_events(job_id: str) -> AsyncGenerator[str, None]:
+    """Generate SSE status events for a job until it finishes."""
+    async for status in job_queue.watch(job_id):
+        yield format_sse("status", status.model_dump(mode="json"))
+
+
+@api_v1_router.get("/jobs/{job_id}/events")
+async def stream_job_status(job_id: str) -> StreamingResponse:
+    """Subscribe to the status of a job over SSE."""
+    if await get_job(job_id) is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return StreamingResponse(job_events(job_id), media_type="text/event-stream")
+
+
+@api_v1_router.get("/profiles/search")
+async def search_stored_profiles(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0, le=10_000),
+) -> ProfileSearchResponse:
+    """Search stored profiles by name, company or keyword, ranked by relevance."""
+    rows = await search_profiles(q, limit, offset)
+    return ProfileSearchResponse(
+        results=[
+            ProfileSearchResult(
+                url=url, person=person, score=score, snippet=snippet, has_bio=has_bio
+            )
+            for url, person, score, snippet, has_bio in rows
+        ],
+        next_offset=offset + limit if len(rows) == limit else None,
+    )
+
+
 # Include API v1 router
 app.include_router(api_v1_router)
 
@@ -85,8 +246,21 @@ add_routes(
 if __name__ == "__main__":
     import uvicorn
 
-    # Start FastAPI server and hit the stream route
-    async def main():
-        uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True, workers=4)
-
-    asyncio.run(main())
+    # Production entry point: python -m app.server
+    workers = int(os.getenv("SERVER_WORKERS", "1"))
+    reload = os.getenv("SERVER_RELOAD", "false").lower() == "true"
+    if reload and workers > 1:
+        raise SystemExit("SERVER_RELOAD cannot be combined with SERVER_WORKERS > 1")
+    uvicorn.run(
+        "app.server:app",
+        host=os.getenv("SERVER_HOST", "0.0.0.0"),
+        port=int(os.getenv("SERVER_PORT", "8000")),
+        workers=workers,
+        reload=reload,
+        # Let in-flight requests and the lifespan shutdown finish on SIGTERM
+        timeout_graceful_shutdown=float(
+            os.getenv("SERVER_GRACEFUL_SHUTDOWN_SECONDS", "30")
+        ),
+        # Request logging goes through the structured time middleware
+        access_log=False,
+    )
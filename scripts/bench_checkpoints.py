@@ -0,0 +1,154 @@
+"""
+Measure what graph checkpointing costs and what resuming saves: per-run
+latency with and without the SQLite checkpointer on the hot path (stored
+bio) and the cold path (search, scrape, generate), and a retry after a
+failed GENERATE resumed from its checkpoint versus rerun from scratch.
+
+External services are the local fakes of scripts/fake_services.py; with the
+default zero latencies the numbers are the pipeline's own overhead.
+
+Usage:
+    python -m scripts.bench_checkpoints [--runs 200]
+        [--tavily-latency fixed:0] [--jina-latency fixed:0]
+        [--llm-latency fixed:0]
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from typing import Awaitable, Callable, List
+
+# Point the app at throwaway databases before any app module reads the env
+_tmp = tempfile.mkdtemp(prefix="talk_spark_checkpoints_")
+os.environ["DATABASE_URL"] = f"sqlite:///{_tmp}/bench.db"
+os.environ["CHECKPOINT_PATH"] = f"{_tmp}/checkpoints.db"
+os.environ.setdefault("PROFILE_REFRESH_INTERVAL_SECONDS", "0")
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+from langchain_core.runnables import RunnableLambda
+
+from scripts.fake_services import (
+    Distribution,
+    FakeConfig,
+    FakeJinaServer,
+    FakeTavilySearchResults,
+    fake_bio_chain,
+)
+
+
+def percentile(values: List[float], pct: float) -> float:
+    return values[min(len(values) - 1, int(len(values) * pct))]
+
+
+async def timed_runs(run: Callable[[int], Awaitable[None]], runs: int) -> List[float]:
+    latencies = []
+    for i in range(runs):
+        start = time.perf_counter()
+        await run(i)
+        latencies.append((time.perf_counter() - start) * 1000)
+    return sorted(latencies)
+
+
+def report(name: str, latencies: List[float]) -> None:
+    print(
+        f"{name:<24} p50={percentile(latencies, 0.50):8.2f}ms "
+        f"p95={percentile(latencies, 0.95):8.2f}ms "
+        f"mean={sum(latencies) / len(latencies):8.2f}ms"
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=200)
+    parser.add_argument("--tavily-latency", default="fixed:0")
+    parser.add_argument("--jina-latency", default="fixed:0")
+    parser.add_argument("--llm-latency", default="fixed:0")
+    args = parser.parse_args()
+
+    config = FakeConfig(
+        tavily_latency=Distribution.parse(args.tavily_latency),
+        jina_latency=Distribution.parse(args.jina_latency),
+        llm_latency=Distribution.parse(args.llm_latency),
+    )
+    jina = FakeJinaServer(config)
+    os.environ["JINA_READER_URL"] = await jina.start()
+
+    # Import the app only now: the scraper reads JINA_READER_URL at import,
+    # so nothing imported above may pull it in
+    from app.db.database import async_engine, init_db
+    from app.graph.chains.generation import bio_generator
+    from app.graph.checkpoints import GraphRunner
+    from app.graph.nodes import web_search
+    from app.graph.utils.http_client import http_client
+    from app.graph.utils.shared_state import shared_store
+
+    FakeTavilySearchResults.config = config
+    web_search.TavilySearchResults = FakeTavilySearchResults
+    working_chain = fake_bio_chain(config)
+    bio_generator.chain = working_chain
+
+    async def llm_down(inputs):
+        raise TimeoutError("LLM timed out")
+
+    await init_db()
+    await shared_store.start()
+    await http_client.start()
+    plain = GraphRunner(backend="none")
+    checkpointed = GraphRunner(backend="sqlite")
+    await checkpointed.start()
+
+    for mode, runner in (("plain", plain), ("checkpointed", checkpointed)):
+        # Hot path: one person whose bio is stored after the first run
+        hot = {"person": f"Hot Person {mode}"}
+        await runner.ainvoke(hot)
+        report(
+            f"hot/{mode}", await timed_runs(lambda i: runner.ainvoke(hot), args.runs)
+        )
+
+        # Cold path: a new person every run
+        report(
+            f"cold/{mode}",
+            await timed_runs(
+                lambda i: runner.ainvoke({"person": f"Cold Person {mode} {i}"}),
+                args.runs,
+            ),
+        )
+
+    # Retry after GENERATE failed: resumed from the checkpoint vs from scratch
+    for mode, runner in (("rerun", plain), ("resumed", checkpointed)):
+
+        async def retry(i: int, mode=mode, runner=runner) -> None:
+            request = {"person": f"Retry Person {mode} {i}"}
+            bio_generator.chain = RunnableLambda(llm_down)
+            try:
+                await runner.ainvoke(request)
+            except Exception:
+                pass
+            bio_generator.chain = working_chain
+            start = time.perf_counter()
+            state = await runner.ainvoke(request)
+            retry_latencies.append((time.perf_counter() - start) * 1000)
+            assert state.get("bio"), "retry produced no bio"
+
+        retry_latencies: List[float] = []
+        for i in range(args.runs):
+            await retry(i)
+        report(f"retry/{mode}", sorted(retry_latencies))
+
+    print(f"checkpoint runs collected: {await checkpointed.collect_garbage()}")
+    print(f"fake calls: tavily={FakeTavilySearchResults.calls} jina={jina.requests}")
+    await checkpointed.close()
+    await http_client.close()
+    await shared_store.close()
+    await async_engine.dispose()
+    await jina.stop()
+    if not jina.requests:
+        raise SystemExit(
+            "The fake Jina server was never called: scrapes went elsewhere"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,146 @@
+"""
+Benchmark clean_markdown on LinkedIn-style markdown pages from 10KB to 2MB and
+check that its output is identical to the original 14-pass implementation on
+a golden corpus (hand-written edge cases, generated pages and any profiles
+stored in the local database).
+
+Usage:
+    python -m scripts.bench_clean_markdown [--sizes 10000 100000 2000000]
+"""
+
+import argparse
+import json
+import random
+import re
+import sqlite3
+import sys
+import time
+from typing import Callable, Iterable, List
+
+from app.graph.utils.scrape_profile import clean_markdown
+from scripts.fake_services import linkedin_page
+
+
+def legacy_clean_markdown(markdown_content: str) -> str:
+    """The original cleaner, kept as the reference for output equivalence."""
+    content = re.sub(r"<[^>]+>", "", markdown_content)
+    content = re.sub(r"\[([^\]]+)\]\([^\)]+\)", r"\1", content)
+    content = re.sub(r"\[\^?\d+\](?:\[[^\]]*\]|\([^\)]*\))?", "", content)
+    content = re.sub(
+        r"http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+",
+        "",
+        content,
+    )
+    content = re.sub(r"\|[^\n]*\|", "", content)
+    content = re.sub(r"[-|]+\s*\n", "", content)
+    content = re.sub(r"^\[\^[^\]]*\]:[^\n]*$", "", content, flags=re.MULTILINE)
+    content = re.sub(r"!\[[^\]]*\]\([^\)]+\)", "", content)
+    content = re.sub(r"[*_]{1,2}([^*_]+)[*_]{1,2}", r"\1", content)
+    content = re.sub(r"^#+\s*", "", content, flags=re.MULTILINE)
+    content = re.sub(r"\s+", " ", content)
+    content = re.sub(r"\n\s*\n", "\n\n", content)
+    content = re.sub(r"^\s+|\s+$", "", content, flags=re.MULTILINE)
+    cleaned_paragraphs = [p.strip() for p in content.split("\n\n") if p.strip()]
+    return "\n\n".join(cleaned_paragraphs)
+
+
+EDGE_CASES = [
+    "",
+    "   \n\t ",
+    "plain text",
+    "# Title\n\nBody",
+    "##\n##x",
+    "a\n#\nb",
+    " # not a heading",
+    "text # mid-line hash",
+    "[link](https://example.com) and [^1] and [2][ref] and [3](x)",
+    "[[2]](u)",
+    "![](https://img.example.com/a.png) ![alt](https://x.y/z.png)",
+    "--|x|\n| a | b |\n|---|---|\n| 1 | 2 |\n",
+    "foo -\nbar\n---\n\nbaz",
+    "[^note]: footnote text\n[^1]: numbered",
+    "**bold** _it_ __u__ *a* ***b*** *unclosed",
+    "<div class='x'>html <b>tags</b></div>",
+    "visit http://a.b/c?d=e&f=(g) now https://x.y",
+    "line\r\nwindows\r\n\r\nparagraph nbsp em",
+    "Title: Jane Doe URL Source: https://www.linkedin.com/in/jane Markdown Content:",
+]
+
+
+def random_markup(count: int, length: int = 200) -> List[str]:
+    """Random strings over markdown-significant characters, for fuzzing."""
+    rng = random.Random(42)
+    alphabet = "[]()!#*_|-<>^:/. \n\t\r\u00a0https1aZ%"
+    return [
+        "".join(rng.choice(alphabet) for _ in range(rng.randint(0, length)))
+        for _ in range(count)
+    ]
+
+
+def stored_pages(db_path: str = "sql_app.db") -> Iterable[str]:
+    """Yield stored scraped pages, if a local database is available."""
+    try:
+        connection = sqlite3.connect(db_path)
+        rows = connection.execute("SELECT scrapped_data FROM profiles").fetchall()
+    except sqlite3.Error:
+        return
+    for (data,) in rows:
+        if data:
+            value = json.loads(data)
+            if isinstance(value, str):
+                yield value
+
+
+def check_golden(corpus: Iterable[str]) -> int:
+    """Assert clean_markdown matches the legacy cleaner on every document."""
+    checked = 0
+    for document in corpus:
+        expected = legacy_clean_markdown(document)
+        actual = clean_markdown(document)
+        if actual != expected:
+            print(f"MISMATCH on document starting {document[:60]!r}")
+            print(f"  expected {expected[:120]!r}")
+            print(f"  actual   {actual[:120]!r}")
+            sys.exit(1)
+        checked += 1
+    return checked
+
+
+def best_of(fn: Callable[[str], str], document: str, rounds: int) -> float:
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        fn(document)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=[10_000, 100_000, 500_000, 2_000_000],
+    )
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    generated = [linkedin_page(size, seed) for seed, size in enumerate(args.sizes)]
+    fuzz = [linkedin_page(2_000, seed) for seed in range(200)]
+    fuzz += random_markup(5_000)
+    fuzz += [document.replace("http", "https://") for document in random_markup(500)]
+    checked = check_golden([*EDGE_CASES, *fuzz, *generated, *stored_pages()])
+    print(f"golden corpus: {checked} documents identical")
+
+    for size, document in zip(args.sizes, generated):
+        legacy = best_of(legacy_clean_markdown, document, args.rounds)
+        current = best_of(clean_markdown, document, args.rounds)
+        print(
+            f"{size / 1000:>8.0f}KB  legacy={legacy * 1000:8.2f}ms  "
+            f"current={current * 1000:8.2f}ms  speedup={legacy / current:5.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
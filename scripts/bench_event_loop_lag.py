@@ -0,0 +1,106 @@
+"""
+Measure event-loop lag while serving concurrent profile lookups through the
+blocking Session(engine) path versus the async controller API.
+
+Usage:
+    DATABASE_URL=sqlite:///./bench.db python -m scripts.bench_event_loop_lag
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from typing import Awaitable, Callable, List
+
+from dotenv import load_dotenv, find_dotenv
+
+_ = load_dotenv(find_dotenv())
+from app.db.controllers.bio import get_user_by_profile_url
+from app.db.database import async_engine, engine, get_async_db, get_db, init_db
+from app.models.models import DBProfile
+
+
+async def seed(rows: int, payload_size: int) -> None:
+    await init_db()
+    async with get_async_db() as db:
+        for i in range(rows):
+            await db.merge(
+                DBProfile(
+                    url=f"https://bench.local/{i}",
+                    person=f"Bench Person {i}",
+                    scrapped_data="x" * payload_size,
+                )
+            )
+        await db.commit()
+
+
+def sync_lookup(url: str):
+    with get_db() as db:
+        return db.get(DBProfile, url)
+
+
+async def blocking_lookup(url: str):
+    # What the graph nodes did before: a sync query straight on the loop
+    return sync_lookup(url)
+
+
+async def measure_lag(
+    lookup: Callable[[str], Awaitable], rows: int, requests: int, concurrency: int
+) -> List[float]:
+    """Run lookups while a 1ms ticker records how late each tick fires."""
+    lags: List[float] = []
+    done = asyncio.Event()
+
+    async def ticker():
+        interval = 0.001
+        while not done.is_set():
+            start = time.perf_counter()
+            await asyncio.sleep(interval)
+            lags.append((time.perf_counter() - start - interval) * 1000)
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(i: int):
+        async with semaphore:
+            await lookup(f"https://bench.local/{i % rows}")
+
+    tick = asyncio.create_task(ticker())
+    await asyncio.gather(*(one(i) for i in range(requests)))
+    done.set()
+    await tick
+    return lags
+
+
+def report(name: str, lags: List[float], elapsed: float, requests: int) -> None:
+    lags = sorted(lags) or [0.0]
+    p99 = lags[min(len(lags) - 1, int(len(lags) * 0.99))]
+    print(
+        f"{name:<10} rps={requests / elapsed:>8.0f} "
+        f"lag_mean={statistics.mean(lags):.2f}ms lag_p99={p99:.2f}ms "
+        f"lag_max={lags[-1]:.2f}ms"
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--payload-size", type=int, default=50_000)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    args = parser.parse_args()
+
+    await seed(args.rows, args.payload_size)
+    for name, lookup in (
+        ("blocking", blocking_lookup),
+        ("async", get_user_by_profile_url),
+    ):
+        start = time.perf_counter()
+        lags = await measure_lag(lookup, args.rows, args.requests, args.concurrency)
+        report(name, lags, time.perf_counter() - start, args.requests)
+
+    await async_engine.dispose()
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,92 @@
+"""
+Load test for the CPU executor: serve small and large profiles concurrently
+and compare small-request latency when clean_markdown runs inline on the event
+loop versus in the thread or process pool.
+
+Usage:
+    python -m scripts.bench_executor_load [--small 400] [--large 8]
+"""
+
+import argparse
+import asyncio
+import random
+import time
+from typing import Awaitable, Callable, List
+
+from app.graph.utils.executor import CpuExecutor
+from app.graph.utils.scrape_profile import clean_markdown
+from scripts.bench_clean_markdown import linkedin_page
+
+Cleaner = Callable[[str], Awaitable[str]]
+
+
+async def inline_clean(document: str) -> str:
+    return clean_markdown(document)
+
+
+async def serve(cleaner: Cleaner, document: str, io_seconds: float) -> float:
+    """Simulate one request: outbound I/O followed by cleaning."""
+    start = time.perf_counter()
+    await asyncio.sleep(io_seconds)
+    await cleaner(document)
+    return time.perf_counter() - start
+
+
+async def scenario(cleaner: Cleaner, small: int, large: int, seed: int) -> List[float]:
+    rng = random.Random(seed)
+    small_page = linkedin_page(10_000, 1)
+    large_page = linkedin_page(2_000_000, 2)
+    jobs = [("small", small_page)] * small + [("large", large_page)] * large
+    rng.shuffle(jobs)
+
+    async def run(kind: str, document: str, delay: float):
+        await asyncio.sleep(delay)
+        return kind, await serve(cleaner, document, rng.uniform(0.005, 0.02))
+
+    results = await asyncio.gather(
+        *(run(kind, doc, rng.uniform(0, 1.0)) for kind, doc in jobs)
+    )
+    return sorted(latency for kind, latency in results if kind == "small")
+
+
+def percentile(values: List[float], pct: float) -> float:
+    return values[min(len(values) - 1, int(len(values) * pct))] * 1000
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--small", type=int, default=400)
+    parser.add_argument("--large", type=int, default=8)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    modes = {"inline": None}
+    for kind in ("thread", "process"):
+        modes[kind] = CpuExecutor(kind=kind, max_workers=args.workers)
+
+    for name, executor in modes.items():
+        cleaner = inline_clean if executor is None else partial_run(executor)
+        latencies = await scenario(cleaner, args.small, args.large, seed=7)
+        line = (
+            f"{name:<8} small p50={percentile(latencies, 0.50):7.1f}ms "
+            f"p95={percentile(latencies, 0.95):7.1f}ms "
+            f"p99={percentile(latencies, 0.99):7.1f}ms"
+        )
+        if executor is not None:
+            line += (
+                f"  wait_mean={executor.stats.mean_wait_seconds * 1000:.1f}ms"
+                f" wait_max={executor.stats.max_wait_seconds * 1000:.1f}ms"
+            )
+            executor.shutdown()
+        print(line)
+
+
+def partial_run(executor: CpuExecutor) -> Cleaner:
+    async def clean(document: str) -> str:
+        return await executor.run(clean_markdown, document, size_hint=len(document))
+
+    return clean
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
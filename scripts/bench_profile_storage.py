@@ -0,0 +1,120 @@
+"""
+Compare the legacy profile storage (scraped text and bio as JSON columns)
+with the compact one (compressed scraped text, bio validated straight from
+compact JSON): database file size and point-read latency including decoding
+into (str, BioGeneration).
+
+Usage:
+    python -m scripts.bench_profile_storage [--rows 2000] [--page-size 50000]
+        [--reads 5000] [--codec zlib|zstd|none]
+"""
+
+import argparse
+import json
+import os
+import random
+import sqlite3
+import tempfile
+import time
+from typing import Callable, List, Tuple
+
+from app.db.types import compress_text, decompress_text
+from app.graph.utils.scrape_profile import clean_markdown
+from app.models.models import BioGeneration
+from scripts.bench_clean_markdown import linkedin_page
+
+SCHEMA = (
+    "CREATE TABLE profiles (url TEXT PRIMARY KEY, person TEXT,"
+    " scrapped_data {scrapped_type}, bio {bio_type})"
+)
+
+
+def sample_bio(i: int) -> BioGeneration:
+    return BioGeneration(
+        summary=f"Person {i} is a staff engineer who led several product launches.",
+        interesting_facts=[f"Fact {n} about person {i}" for n in range(4)],
+        topics_of_interest=["distributed systems", "startups", "hiring"],
+        ice_breakers=[f"How did launch {n} go?" for n in range(3)],
+    )
+
+
+def build(path: str, compact: bool, rows: int, page_size: int, codec: str) -> None:
+    conn = sqlite3.connect(path)
+    conn.execute(
+        SCHEMA.format(
+            scrapped_type="BLOB" if compact else "JSON",
+            bio_type="TEXT" if compact else "JSON",
+        )
+    )
+    batch = []
+    for i in range(rows):
+        page = clean_markdown(linkedin_page(page_size, i))
+        bio = sample_bio(i)
+        if compact:
+            values = (compress_text(page, codec=codec), bio.model_dump_json())
+        else:
+            # What SQLAlchemy's JSON type wrote
+            values = (json.dumps(page), json.dumps(bio.model_dump()))
+        batch.append((f"https://bench.local/{i}", f"Person {i}", *values))
+    conn.executemany("INSERT INTO profiles VALUES (?, ?, ?, ?)", batch)
+    conn.commit()
+    conn.execute("VACUUM")
+    conn.close()
+
+
+def legacy_decode(scrapped_data, bio) -> Tuple[str, BioGeneration]:
+    return json.loads(scrapped_data), BioGeneration.model_validate(json.loads(bio))
+
+
+def compact_decode(scrapped_data, bio) -> Tuple[str, BioGeneration]:
+    return decompress_text(scrapped_data), BioGeneration.model_validate_json(bio)
+
+
+def read_latencies(
+    path: str, decode: Callable, rows: int, reads: int, seed: int
+) -> List[float]:
+    rng = random.Random(seed)
+    conn = sqlite3.connect(path)
+    latencies = []
+    for _ in range(reads):
+        url = f"https://bench.local/{rng.randrange(rows)}"
+        start = time.perf_counter()
+        row = conn.execute(
+            "SELECT scrapped_data, bio FROM profiles WHERE url = ?", (url,)
+        ).fetchone()
+        decode(*row)
+        latencies.append((time.perf_counter() - start) * 1e6)
+    conn.close()
+    return sorted(latencies)
+
+
+def percentile(values: List[float], pct: float) -> float:
+    return values[min(len(values) - 1, int(len(values) * pct))]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=2000)
+    parser.add_argument("--page-size", type=int, default=50_000)
+    parser.add_argument("--reads", type=int, default=5000)
+    parser.add_argument("--codec", choices=["zlib", "zstd", "none"], default="zlib")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, compact, decode in (
+            ("legacy", False, legacy_decode),
+            ("compact", True, compact_decode),
+        ):
+            path = os.path.join(tmp, f"{name}.db")
+            build(path, compact, args.rows, args.page_size, args.codec)
+            latencies = read_latencies(path, decode, args.rows, args.reads, seed=7)
+            print(
+                f"{name:<8} size={os.path.getsize(path) / 1024 / 1024:7.1f}MB "
+                f"read p50={percentile(latencies, 0.50):7.1f}us "
+                f"p95={percentile(latencies, 0.95):7.1f}us "
+                f"p99={percentile(latencies, 0.99):7.1f}us"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Measure how long importing the app takes in a fresh interpreter, using
+`python -X importtime`, and fail when it exceeds a budget so slow imports
+are caught before they slow down worker spawns.
+
+Usage:
+    python -m scripts.bench_startup [--module app.server] [--budget-ms 4000]
+        [--runs 3] [--top 15]
+"""
+
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List, Tuple
+
+# import time: self [us] | cumulative | imported package
+_IMPORTTIME = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S.*)$")
+
+
+def import_once(module: str) -> Tuple[float, Dict[str, int], str]:
+    """Import module in a subprocess; return wall ms, cumulative us per module, stderr."""
+    env = {**os.environ, "PYTHONDONTWRITEBYTECODE": "1"}
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        env=env,
+    )
+    wall_ms = (time.perf_counter() - start) * 1000
+    if proc.returncode != 0:
+        raise SystemExit(f"Importing {module} failed:\n{proc.stderr[-2000:]}")
+
+    cumulative: Dict[str, int] = {}
+    for line in proc.stderr.splitlines():
+        match = _IMPORTTIME.match(line)
+        if match:
+            cumulative[match.group(4).strip()] = int(match.group(2))
+    return wall_ms, cumulative, proc.stderr
+
+
+def top_level(cumulative: Dict[str, int], top: int) -> List[Tuple[str, int]]:
+    """Slowest third-party and app packages by cumulative import time."""
+    roots: Dict[str, int] = {}
+    for name, micros in cumulative.items():
+        root = name.split(".")[0]
+        roots[root] = max(roots.get(root, 0), micros)
+    return sorted(roots.items(), key=lambda item: item[1], reverse=True)[:top]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--module", default="app.server")
+    parser.add_argument("--budget-ms", type=float, default=4000)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    walls = []
+    cumulative: Dict[str, int] = {}
+    for _ in range(args.runs):
+        wall_ms, cumulative, _ = import_once(args.module)
+        walls.append(wall_ms)
+
+    print(f"import {args.module}: runs={args.runs}")
+    for name, micros in top_level(cumulative, args.top):
+        print(f"  {name:<28} {micros / 1000:8.1f}ms")
+
+    median = statistics.median(walls)
+    print(
+        f"wall median={median:.0f}ms min={min(walls):.0f}ms max={max(walls):.0f}ms "
+        f"budget={args.budget_ms:.0f}ms"
+    )
+    if median > args.budget_ms:
+        print("FAIL: startup exceeds budget")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+"""
+Check the shared HTTP client against a local stub server: the cap on
+concurrent requests, retries on 503, the read timeout, conditional GETs
+and keep-alive connection reuse. Exits non-zero on the first failed check.
+
+Usage:
+    python -m scripts.check_http_client [--concurrency 4] [--requests 32]
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from collections import Counter
+from typing import Awaitable, Callable, Optional, Set, Tuple
+
+import aiohttp
+from aiohttp import web
+
+from app.graph.utils.http_client import HttpClient, HttpClientConfig
+
+
+class StubServer:
+    """HTTP server whose routes misbehave on purpose, recording what it saw"""
+
+    def __init__(self, host: str = "127.0.0.1"):
+        self.host = host
+        self.active = 0
+        self.max_active = 0
+        self.hits: Counter = Counter()
+        self.connections: Set[Tuple[str, int]] = set()
+        self._runner: Optional[web.AppRunner] = None
+
+    def _seen(self, request: web.Request, route: str) -> None:
+        self.hits[route] += 1
+        self.connections.add(request.transport.get_extra_info("peername"))
+
+    async def slow(self, request: web.Request) -> web.Response:
+        """Hold the request open so concurrent callers overlap"""
+        self._seen(request, "slow")
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await asyncio.sleep(float(request.query.get("delay", "0.05")))
+        finally:
+            self.active -= 1
+        return web.Response(text="ok")
+
+    async def flaky(self, request: web.Request) -> web.Response:
+        """Answer 503 to the first `fail` requests of a key, then 200"""
+        key = request.match_info["key"]
+        self._seen(request, f"flaky/{key}")
+        if self.hits[f"flaky/{key}"] <= int(request.query.get("fail", "1")):
+            return web.Response(status=503)
+        return web.Response(text="recovered")
+
+    async def hang(self, request: web.Request) -> web.StreamResponse:
+        """Send headers, then stall the body past the read timeout"""
+        self._seen(request, "hang")
+        response = web.StreamResponse()
+        await response.prepare(request)
+        await asyncio.sleep(float(request.query.get("delay", "5")))
+        await response.write(b"too late")
+        return response
+
+    async def etag(self, request: web.Request) -> web.Response:
+        self._seen(request, "etag")
+        if request.headers.get("If-None-Match") == '"v1"':
+            return web.Response(status=304, headers={"ETag": '"v1"'})
+        return web.Response(text="page", headers={"ETag": '"v1"'})
+
+    async def start(self) -> str:
+        """Start serving and return the base URL"""
+        app = web.Application()
+        app.router.add_get("/slow", self.slow)
+        app.router.add_get("/flaky/{key}", self.flaky)
+        app.router.add_get("/hang", self.hang)
+        app.router.add_get("/etag", self.etag)
+        self._runner = web.AppRunner(app, access_log=None, shutdown_timeout=0.1)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, 0)
+        await site.start()
+        port = self._runner.addresses[0][1]
+        return f"http://{self.host}:{port}"
+
+    async def stop(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+
+def check(name: str, ok: bool, detail: str) -> None:
+    print(f"{'PASS' if ok else 'FAIL'} {name:<20} {detail}")
+    if not ok:
+        sys.exit(1)
+
+
+async def with_client(
+    config: HttpClientConfig, body: Callable[[HttpClient], Awaitable[None]]
+) -> None:
+    client = HttpClient(config)
+    await client.start()
+    try:
+        await body(client)
+    finally:
+        await client.close()
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--requests", type=int, default=32)
+    args = parser.parse_args()
+
+    server = StubServer()
+    base = await server.start()
+    config = HttpClientConfig(
+        max_concurrency=args.concurrency,
+        read_timeout=0.3,
+        total_timeout=5,
+        retry_attempts=3,
+        retry_max_wait=0.05,
+    )
+
+    async def concurrency_cap(client: HttpClient) -> None:
+        await asyncio.gather(
+            *(client.get_text(f"{base}/slow") for _ in range(args.requests))
+        )
+        check(
+            "concurrency cap",
+            server.max_active <= args.concurrency,
+            f"max {server.max_active} in flight, cap {args.concurrency}",
+        )
+        # Sequential batches through the cap reuse the pooled connections
+        check(
+            "connection reuse",
+            len(server.connections) <= args.concurrency,
+            f"{len(server.connections)} connections for {args.requests} requests",
+        )
+
+    async def retry_on_503(client: HttpClient) -> None:
+        text = await client.get_text(f"{base}/flaky/once?fail=2")
+        check(
+            "retry on 503",
+            text == "recovered" and server.hits["flaky/once"] == 3,
+            f"{server.hits['flaky/once']} attempts",
+        )
+        try:
+            await client.get_text(f"{base}/flaky/always?fail=100")
+            raised = None
+        except aiohttp.ClientResponseError as e:
+            raised = e.status
+        check(
+            "retries give up",
+            raised == 503 and server.hits["flaky/always"] == config.retry_attempts,
+            f"raised {raised} after {server.hits['flaky/always']} attempts",
+        )
+
+    async def read_timeout(client: HttpClient) -> None:
+        start = time.perf_counter()
+        try:
+            await client.get_text(f"{base}/hang")
+            timed_out = False
+        except asyncio.TimeoutError:
+            timed_out = True
+        elapsed = time.perf_counter() - start
+        budget = config.retry_attempts * (config.read_timeout + config.retry_max_wait)
+        check(
+            "read timeout",
+            timed_out and elapsed < budget + 0.5,
+            f"gave up after {elapsed:.2f}s and {server.hits['hang']} attempts",
+        )
+
+    async def conditional_get(client: HttpClient) -> None:
+        first = await client.fetch(f"{base}/etag")
+        second = await client.fetch(f"{base}/etag", etag=first.etag)
+        check(
+            "conditional get",
+            first.text == "page" and second.not_modified and second.etag == '"v1"',
+            f"statuses {first.status}, {second.status}",
+        )
+
+    try:
+        for body in (concurrency_cap, retry_on_503, read_timeout, conditional_get):
+            await with_client(config, body)
+    finally:
+        await server.stop()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
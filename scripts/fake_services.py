@@ -0,0 +1,201 @@
+"""
+Local stand-ins for the external services, for benchmarks that must not
+depend on live APIs: a fake r.jina.ai reader served over HTTP, and fake
+runnables for TavilySearchResults and the structured ChatOpenAI chain. Each
+draws its latency and payload size from a configurable distribution.
+
+Distributions are given as strings:
+    fixed:0.05                 always 0.05
+    uniform:0.02,0.2           uniform between the bounds
+    lognormal:-3,0.5           exp(normal(mu, sigma))
+    choice:10000,1000000       one of the values, equally likely
+"""
+
+import asyncio
+import hashlib
+import random
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from aiohttp import web
+from langchain_core.runnables import RunnableLambda
+
+from app.models.models import BioGeneration
+
+
+@dataclass
+class Distribution:
+    """Random variable parsed from a "kind:arg,arg" spec"""
+
+    kind: str
+    args: List[float]
+
+    @classmethod
+    def parse(cls, spec: str) -> "Distribution":
+        kind, _, raw = spec.partition(":")
+        args = [float(arg) for arg in raw.split(",") if arg]
+        expected = {"fixed": 1, "uniform": 2, "lognormal": 2}
+        if kind == "choice" and args:
+            return cls(kind, args)
+        if expected.get(kind) != len(args):
+            raise ValueError(f"Invalid distribution: {spec}")
+        return cls(kind, args)
+
+    def sample(self, rng: random.Random) -> float:
+        if self.kind == "fixed":
+            return self.args[0]
+        if self.kind == "uniform":
+            return rng.uniform(*self.args)
+        if self.kind == "lognormal":
+            return rng.lognormvariate(*self.args)
+        return rng.choice(self.args)
+
+
+def slugify(person: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "-", person.lower()).strip("-") or "unknown"
+
+
+def stable_rng(seed: int, key: str) -> random.Random:
+    """RNG seeded by key, so a URL always yields the same page across runs"""
+    digest = hashlib.sha256(f"{seed}:{key}".encode("utf-8")).digest()
+    return random.Random(int.from_bytes(digest[:8], "big"))
+
+
+HEADLINES = ["Experience", "Education", "About", "Skills", "Activity", "Licenses"]
+WORDS = (
+    "engineer product leader machine learning scaling teams platform data "
+    "strategy growth startup founder research cloud distributed systems"
+).split()
+
+
+def linkedin_page(size: int, seed: int = 0) -> str:
+    """Generate a LinkedIn-style markdown page of roughly size characters."""
+    rng = random.Random(seed)
+    parts: List[str] = [
+        "Title: Jane Doe - Staff Engineer | LinkedIn\n\n",
+        "URL Source: https://www.linkedin.com/in/jane-doe\n\nMarkdown Content:\n",
+    ]
+    length = sum(map(len, parts))
+    while length < size:
+        kind = rng.randrange(8)
+        words = " ".join(rng.choice(WORDS) for _ in range(rng.randint(5, 40)))
+        if kind == 0:
+            block = f"\n## {rng.choice(HEADLINES)}\n\n"
+        elif kind == 1:
+            block = f"* [{words[:30]}](https://www.linkedin.com/company/{rng.randint(1, 9999)}?trk=public)\n"
+        elif kind == 2:
+            block = f"![Image {rng.randint(1, 99)}](https://media.licdn.com/dms/image/{rng.randint(1, 10**9)})\n"
+        elif kind == 3:
+            block = f"| {words[:20]} | {rng.randint(2000, 2024)} |\n|---|---|\n"
+        elif kind == 4:
+            block = f"**{words[:25]}** _{words[25:50]}_ {words}\n\n"
+        elif kind == 5:
+            block = f'<span class="t-14">{words}</span>\n'
+        elif kind == 6:
+            block = f"{words} [^{rng.randint(1, 20)}]\n\n---\n"
+        else:
+            block = f"{words}.\n"
+        parts.append(block)
+        length += len(block)
+    return "".join(parts)
+
+
+@dataclass
+class FakeConfig:
+    """Latency and payload distributions of the fake services"""
+
+    tavily_latency: Distribution = field(
+        default_factory=lambda: Distribution.parse("uniform:0.3,0.8")
+    )
+    jina_latency: Distribution = field(
+        default_factory=lambda: Distribution.parse("uniform:0.5,2")
+    )
+    jina_page_bytes: Distribution = field(
+        default_factory=lambda: Distribution.parse("fixed:50000")
+    )
+    llm_latency: Distribution = field(
+        default_factory=lambda: Distribution.parse("uniform:1,3")
+    )
+    seed: int = 7
+
+
+class FakeJinaServer:
+    """HTTP server answering r.jina.ai-style GET /<profile url> with markdown"""
+
+    def __init__(self, config: FakeConfig, host: str = "127.0.0.1", port: int = 0):
+        self.config = config
+        self.host = host
+        self.port = port
+        self.requests = 0
+        self._rng = random.Random(config.seed)
+        self._runner: Optional[web.AppRunner] = None
+
+    async def handle(self, request: web.Request) -> web.Response:
+        self.requests += 1
+        target = request.match_info["target"]
+        page_rng = stable_rng(self.config.seed, target)
+        size = int(self.config.jina_page_bytes.sample(page_rng))
+        etag = f'"{hashlib.sha256(f"{target}:{size}".encode()).hexdigest()[:16]}"'
+        await asyncio.sleep(self.config.jina_latency.sample(self._rng))
+        if request.headers.get("If-None-Match") == etag:
+            return web.Response(status=304, headers={"ETag": etag})
+        body = linkedin_page(size, page_rng.randrange(1 << 30))
+        return web.Response(
+            text=body, content_type="text/markdown", headers={"ETag": etag}
+        )
+
+    async def start(self) -> str:
+        """Start serving and return the reader base URL"""
+        app = web.Application()
+        app.router.add_get("/{target:.*}", self.handle)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        self.port = self._runner.addresses[0][1]
+        return f"http://{self.host}:{self.port}/"
+
+    async def stop(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+
+class FakeTavilySearchResults:
+    """Drop-in for TavilySearchResults returning one LinkedIn-style result"""
+
+    config = FakeConfig()
+    calls = 0
+
+    def __init__(self, max_results: int = 5, **kwargs: Any):
+        self.max_results = max_results
+        self._rng = random.Random(self.config.seed + FakeTavilySearchResults.calls)
+
+    async def ainvoke(self, input: Dict[str, str]) -> List[Dict[str, str]]:
+        FakeTavilySearchResults.calls += 1
+        person = input["query"]
+        await asyncio.sleep(self.config.tavily_latency.sample(self._rng))
+        return [
+            {
+                "url": f"https://www.linkedin.com/in/{slugify(person)}",
+                "content": f"{person} is a software engineer and founder.",
+            }
+        ]
+
+
+def fake_bio_chain(config: FakeConfig) -> RunnableLambda:
+    """Runnable standing in for prompt | ChatOpenAI.with_structured_output"""
+    rng = random.Random(config.seed)
+
+    async def generate(inputs: Dict[str, Any]) -> BioGeneration:
+        await asyncio.sleep(config.llm_latency.sample(rng))
+        person = inputs["person"]
+        return BioGeneration(
+            summary=f"{person} builds software.",
+            interesting_facts=[f"{person} has {len(inputs['scrapped_data'])} chars"],
+            topics_of_interest=["startups", "engineering"],
+            ice_breakers=[f"What are you working on these days, {person}?"],
+        )
+
+    return RunnableLambda(generate)
@@ -0,0 +1,251 @@
+"""
+Drive the FastAPI app under concurrency with Tavily, r.jina.ai and OpenAI
+replaced by local fakes (see scripts/fake_services.py), and report throughput,
+latency percentiles and event-loop lag per scenario.
+
+Scenarios:
+    cold      every request is a person never seen before
+    warm      the same people again after an untimed warm-up pass
+    hot_key   every request is for one new person at once
+    mixed     new people with small and large profile pages
+    trace     replay a JSONL trace (--trace), one request per line:
+              {"person": "...", "url": null, "force_refresh": false, "offset": 0.5}
+              offset (seconds from the start) is optional; without it lines
+              are sent as fast as the concurrency allows
+
+Usage:
+    python -m scripts.load_test [--scenarios cold warm hot_key mixed]
+        [--requests 200] [--concurrency 20] [--endpoint invoke|stream]
+        [--llm-latency uniform:1,3] [--jina-latency uniform:0.5,2]
+        [--jina-bytes fixed:50000] [--tavily-latency uniform:0.3,0.8]
+    python -m scripts.load_test --scenarios trace --trace scripts/traces/sample.jsonl
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import tempfile
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+# Point the app at a throwaway database before any app module reads the env
+_db_dir = tempfile.mkdtemp(prefix="talk_spark_load_")
+os.environ["DATABASE_URL"] = f"sqlite:///{_db_dir}/load_test.db"
+os.environ.setdefault("PROFILE_REFRESH_INTERVAL_SECONDS", "0")
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+import httpx
+
+from scripts.fake_services import (
+    Distribution,
+    FakeConfig,
+    FakeJinaServer,
+    FakeTavilySearchResults,
+    fake_bio_chain,
+)
+
+ENDPOINTS = {
+    "invoke": "/api/v1/talk_spark",
+    "stream": "/api/v1/talk_spark/stream",
+}
+
+
+@dataclass
+class TraceItem:
+    person: str
+    url: Optional[str] = None
+    force_refresh: bool = False
+    offset: Optional[float] = None
+
+    def body(self) -> Dict[str, Any]:
+        return {
+            "person": self.person,
+            "url": self.url,
+            "force_refresh": self.force_refresh,
+        }
+
+
+@dataclass
+class RunResult:
+    latencies: List[float] = field(default_factory=list)
+    errors: int = 0
+    lags: List[float] = field(default_factory=list)
+    elapsed: float = 0.0
+
+
+def load_trace(path: str) -> List[TraceItem]:
+    """Read a JSONL trace, ignoring fields other than those of TraceItem."""
+    items = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            items.append(
+                TraceItem(
+                    **{
+                        k: v
+                        for k, v in record.items()
+                        if k in TraceItem.__dataclass_fields__
+                    }
+                )
+            )
+    return items
+
+
+def new_people(count: int, prefix: str) -> List[TraceItem]:
+    run = uuid.uuid4().hex[:6]
+    return [TraceItem(person=f"{prefix} {run} {i}") for i in range(count)]
+
+
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, int(len(values) * pct))]
+
+
+async def drive(
+    client: httpx.AsyncClient, path: str, items: List[TraceItem], concurrency: int
+) -> RunResult:
+    """Send the items with bounded concurrency while a 1ms ticker measures loop lag."""
+    result = RunResult()
+    semaphore = asyncio.Semaphore(concurrency)
+    done = asyncio.Event()
+
+    async def ticker():
+        interval = 0.001
+        while not done.is_set():
+            start = time.perf_counter()
+            await asyncio.sleep(interval)
+            result.lags.append((time.perf_counter() - start - interval) * 1000)
+
+    async def one(item: TraceItem, started: float):
+        if item.offset is not None:
+            await asyncio.sleep(max(0.0, started + item.offset - time.perf_counter()))
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                response = await client.post(path, json=item.body())
+                await response.aread()
+                if response.status_code >= 400:
+                    result.errors += 1
+            except Exception:
+                result.errors += 1
+            result.latencies.append((time.perf_counter() - start) * 1000)
+
+    tick = asyncio.create_task(ticker())
+    started = time.perf_counter()
+    await asyncio.gather(*(one(item, started) for item in items))
+    result.elapsed = time.perf_counter() - started
+    done.set()
+    await tick
+    return result
+
+
+def report(name: str, result: RunResult) -> None:
+    latencies = sorted(result.latencies)
+    lags = sorted(result.lags) or [0.0]
+    rps = len(latencies) / result.elapsed if result.elapsed else 0.0
+    print(
+        f"{name:<8} n={len(latencies):<5} err={result.errors:<4} rps={rps:>7.1f} "
+        f"p50={percentile(latencies, 0.50):8.1f}ms "
+        f"p95={percentile(latencies, 0.95):8.1f}ms "
+        f"p99={percentile(latencies, 0.99):8.1f}ms "
+        f"lag_mean={statistics.mean(lags):.2f}ms "
+        f"lag_p99={percentile(lags, 0.99):.2f}ms"
+    )
+
+
+async def run_scenario(
+    name: str, client: httpx.AsyncClient, path: str, args: argparse.Namespace
+) -> RunResult:
+    if name == "cold":
+        return await drive(
+            client, path, new_people(args.requests, "Cold"), args.concurrency
+        )
+    if name == "warm":
+        people = new_people(max(1, args.requests // 4), "Warm")
+        await drive(client, path, people, args.concurrency)
+        items = [people[i % len(people)] for i in range(args.requests)]
+        return await drive(client, path, items, args.concurrency)
+    if name == "hot_key":
+        person = new_people(1, "Hot")[0]
+        return await drive(client, path, [person] * args.requests, args.concurrency)
+    if name == "mixed":
+        return await drive(
+            client, path, new_people(args.requests, "Mixed"), args.concurrency
+        )
+    if name == "trace":
+        if not args.trace:
+            raise SystemExit("--trace is required for the trace scenario")
+        return await drive(client, path, load_trace(args.trace), args.concurrency)
+    raise SystemExit(f"Unknown scenario: {name}")
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--scenarios", nargs="+", default=["cold", "warm", "hot_key", "mixed"]
+    )
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--endpoint", choices=sorted(ENDPOINTS), default="invoke")
+    parser.add_argument("--trace")
+    parser.add_argument("--tavily-latency", default="uniform:0.3,0.8")
+    parser.add_argument("--jina-latency", default="uniform:0.5,2")
+    parser.add_argument("--jina-bytes", default="fixed:50000")
+    parser.add_argument(
+        "--mixed-jina-bytes", default="choice:10000,10000,10000,1000000"
+    )
+    parser.add_argument("--llm-latency", default="uniform:1,3")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    config = FakeConfig(
+        tavily_latency=Distribution.parse(args.tavily_latency),
+        jina_latency=Distribution.parse(args.jina_latency),
+        jina_page_bytes=Distribution.parse(args.jina_bytes),
+        llm_latency=Distribution.parse(args.llm_latency),
+        seed=args.seed,
+    )
+    jina = FakeJinaServer(config)
+    os.environ["JINA_READER_URL"] = await jina.start()
+
+    # Import the app only now: the scraper reads JINA_READER_URL at import,
+    # so nothing imported above may pull it in
+    from app.graph.chains.generation import bio_generator
+    from app.graph.nodes import web_search
+    from app.server import app
+
+    FakeTavilySearchResults.config = config
+    web_search.TavilySearchResults = FakeTavilySearchResults
+    bio_generator.chain = fake_bio_chain(config)
+
+    path = ENDPOINTS[args.endpoint]
+    limits = httpx.Limits(max_connections=args.concurrency)
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(
+            app=app, base_url="http://loadtest", timeout=None, limits=limits
+        ) as client:
+            for name in args.scenarios:
+                page_bytes = (
+                    args.mixed_jina_bytes if name == "mixed" else args.jina_bytes
+                )
+                config.jina_page_bytes = Distribution.parse(page_bytes)
+                result = await run_scenario(name, client, path, args)
+                report(name, result)
+
+    await jina.stop()
+    print(f"fake calls: tavily={FakeTavilySearchResults.calls} jina={jina.requests}")
+    if not jina.requests:
+        raise SystemExit(
+            "The fake Jina server was never called: scrapes went elsewhere"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,153 @@
+"""
+Rewrite stored profiles into the compact format: scrapped_data compressed in
+a BLOB and bio as compact JSON text, then index bio_updated_at and reclaim
+the freed space. Rows already in the compact format are left alone, so the
+migration can be re-run safely. The app reads unmigrated rows as well.
+
+Usage:
+    python -m scripts.migrate_compact_storage [--batch-size 500] [--no-vacuum]
+"""
+
+import argparse
+import os
+import time
+from typing import Any, Optional, Tuple
+
+from dotenv import load_dotenv, find_dotenv
+
+_ = load_dotenv(find_dotenv())
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Connection
+
+from app.db.database import DATABASE_URL, engine, is_sqlite
+from app.db.types import compress_text, decompress_text
+from app.models.models import BioGeneration
+
+# Column type changes for servers with a real JSON type; SQLite needs none
+ALTER_STATEMENTS = {
+    "postgresql": [
+        "ALTER TABLE profiles ALTER COLUMN scrapped_data TYPE bytea"
+        " USING convert_to(scrapped_data::text, 'UTF8')",
+        "ALTER TABLE profiles ALTER COLUMN bio TYPE text USING bio::text",
+    ],
+    "mysql": [
+        "ALTER TABLE profiles MODIFY scrapped_data LONGBLOB",
+        "ALTER TABLE profiles MODIFY bio LONGTEXT",
+    ],
+}
+
+
+def is_compact(value: Any) -> bool:
+    if isinstance(value, memoryview):
+        value = value.tobytes()
+    return isinstance(value, bytes) and value[:1] in (b"z", b"s", b"r")
+
+
+def convert_row(scrapped_data: Any, bio: Any) -> Tuple[Optional[bytes], Optional[str]]:
+    """Return the compact (scrapped_data, bio) for a stored row"""
+    if is_compact(scrapped_data):
+        new_scrapped = scrapped_data
+    else:
+        cleaned = decompress_text(scrapped_data)
+        new_scrapped = compress_text(cleaned) if cleaned is not None else None
+
+    if isinstance(bio, (bytes, memoryview)):
+        bio = bytes(bio).decode("utf-8")
+    if bio is None or bio == "null":
+        new_bio = None
+    elif isinstance(bio, dict):
+        new_bio = BioGeneration.model_validate(bio).model_dump_json()
+    else:
+        new_bio = BioGeneration.model_validate_json(bio).model_dump_json()
+    return new_scrapped, new_bio
+
+
+def alter_columns(conn: Connection) -> None:
+    statements = ALTER_STATEMENTS.get(conn.dialect.name, [])
+    columns = {c["name"]: c["type"] for c in inspect(conn).get_columns("profiles")}
+    if statements and "JSON" in str(columns.get("scrapped_data", "")).upper():
+        for statement in statements:
+            conn.execute(text(statement))
+
+
+def migrate(batch_size: int) -> Tuple[int, int]:
+    """Rewrite every profile row; returns (converted, invalid bios dropped)"""
+    converted = invalid = 0
+    last_url = ""
+    with engine.begin() as conn:
+        alter_columns(conn)
+    while True:
+        with engine.begin() as conn:
+            rows = conn.execute(
+                text(
+                    "SELECT url, scrapped_data, bio FROM profiles"
+                    " WHERE url > :last ORDER BY url LIMIT :limit"
+                ),
+                {"last": last_url, "limit": batch_size},
+            ).all()
+            if not rows:
+                break
+            updates = []
+            for url, scrapped_data, bio in rows:
+                try:
+                    new_scrapped, new_bio = convert_row(scrapped_data, bio)
+                except ValueError:
+                    # Bios that no longer validate are regenerated on demand
+                    new_scrapped, _ = convert_row(scrapped_data, None)
+                    new_bio = None
+                    invalid += 1
+                updates.append(
+                    {"url": url, "scrapped_data": new_scrapped, "bio": new_bio}
+                )
+            conn.execute(
+                text(
+                    "UPDATE profiles SET scrapped_data = :scrapped_data, bio = :bio"
+                    " WHERE url = :url"
+                ),
+                updates,
+            )
+            converted += len(updates)
+            last_url = rows[-1][0]
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                "CREATE INDEX IF NOT EXISTS ix_profiles_bio_updated_at"
+                " ON profiles (bio_updated_at)"
+            )
+        )
+    return converted, invalid
+
+
+def database_size() -> Optional[int]:
+    if not is_sqlite(DATABASE_URL):
+        return None
+    path = engine.url.database
+    return sum(os.path.getsize(p) for p in (path, f"{path}-wal") if os.path.exists(p))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--no-vacuum", action="store_true")
+    args = parser.parse_args()
+
+    before = database_size()
+    start = time.perf_counter()
+    converted, invalid = migrate(args.batch_size)
+    if is_sqlite(DATABASE_URL) and not args.no_vacuum:
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            conn.execute(text("PRAGMA wal_checkpoint(TRUNCATE)"))
+            conn.execute(text("VACUUM"))
+    elapsed = time.perf_counter() - start
+
+    print(
+        f"Migrated {converted} profiles in {elapsed:.1f}s ({invalid} invalid bios dropped)"
+    )
+    after = database_size()
+    if before is not None and after is not None:
+        print(f"Database size: {before / 1024:.0f}KB -> {after / 1024:.0f}KB")
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,28 @@
+"""
+Rebuild the profile full-text index from the profiles table, e.g. after a
+bulk import or migration that wrote rows directly.
+
+Usage:
+    python -m scripts.rebuild_search_index
+"""
+
+import asyncio
+import time
+
+from dotenv import load_dotenv, find_dotenv
+
+_ = load_dotenv(find_dotenv())
+from app.db.controllers.search import rebuild_search_index
+from app.db.database import async_engine, init_db
+
+
+async def main() -> None:
+    await init_db()
+    start = time.perf_counter()
+    indexed = await rebuild_search_index()
+    print(f"Indexed {indexed} profiles in {time.perf_counter() - start:.1f}s")
+    await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
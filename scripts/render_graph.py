@@ -0,0 +1,29 @@
+"""
+Render the compiled graph. PNG rendering goes through the mermaid.ink web
+service by default, so this is an explicit step rather than part of startup.
+
+Usage:
+    python -m scripts.render_graph [--output graph.png] [--format png|mermaid]
+"""
+
+import argparse
+
+from app.graph.graph import graph, save_graph_visualization
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--output", default="graph.png")
+    parser.add_argument("--format", choices=["png", "mermaid"], default="png")
+    args = parser.parse_args()
+
+    if args.format == "png":
+        save_graph_visualization(graph, args.output)
+    else:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(graph.get_graph().draw_mermaid())
+    print(f"Wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
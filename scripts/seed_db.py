@@ -1,27 +1,177 @@
-import os
+"""
+Seed the profiles table from a JSON file, streaming it so large files are
+never held in memory, and writing through the bulk upsert controller.
+
+Accepted formats:
+    - a JSON object mapping profile URL -> profile data (scripts/response.json)
+    - JSON lines, one {"url", "person", "scrapped_data", "bio"?} object per line
+
+Usage:
+    python -m scripts.seed_db [path] [--batch-size 1000]
+    python -m scripts.seed_db --synthetic 100000
+"""
+
+import argparse
+import asyncio
 import json
-from sqlalchemy.orm import Session
+import os
+import time
+from typing import Any, Dict, Iterator, Tuple
+
 from dotenv import load_dotenv, find_dotenv
 
 _ = load_dotenv(find_dotenv())
-from app.db.controllers.bio import save_new_user
-from app.db.database import get_db
-from app.models import models
-from app.db.database import engine
+from app.db.controllers.bio import UPSERT_BATCH_SIZE, upsert_profiles
+from app.db.database import async_engine, init_db
+
+CHUNK_SIZE = 1 << 16
+
+_decoder = json.JSONDecoder()
+# Characters that can continue a JSON number
+_NUMBER_CHARS = frozenset("0123456789+-.eE")
+
+
+def iter_json_object(path: str) -> Iterator[Tuple[str, Any]]:
+    """
+    Yield (key, value) pairs of a top-level JSON object, reading the file in
+    chunks and decoding one member at a time.
+    """
+    with open(path, "r", encoding="utf-8") as file:
+        buffer = ""
+        position = 0
+        eof = False
+
+        def fill() -> bool:
+            nonlocal buffer, position, eof
+            chunk = file.read(CHUNK_SIZE)
+            if not chunk:
+                eof = True
+                return False
+            buffer = buffer[position:] + chunk
+            position = 0
+            return True
+
+        def skip(chars: str = " \t\r\n") -> str:
+            """Skip chars and return the next character without consuming it."""
+            nonlocal position
+            while True:
+                while position < len(buffer) and buffer[position] in chars:
+                    position += 1
+                if position < len(buffer):
+                    return buffer[position]
+                if not fill():
+                    return ""
+
+        def decode() -> Any:
+            nonlocal position
+            while True:
+                try:
+                    value, end = _decoder.raw_decode(buffer, position)
+                except json.JSONDecodeError:
+                    if eof or not fill():
+                        raise
+                    continue
+                # A number may continue in the next chunk; a tail such as "1."
+                # or "1e+" decodes as the number before it, so refill while
+                # everything after the decoded part could still belong to it
+                if (
+                    type(value) in (int, float)
+                    and not eof
+                    and all(char in _NUMBER_CHARS for char in buffer[end:])
+                    and fill()
+                ):
+                    continue
+                position = end
+                return value
+
+        if skip() != "{":
+            raise ValueError(f"{path} does not contain a JSON object")
+        position += 1
+        while True:
+            next_char = skip(" \t\r\n,")
+            if next_char == "}":
+                return
+            if next_char == "":
+                raise ValueError(f"{path} ended inside the top-level object")
+            key = decode()
+            if skip() != ":":
+                raise ValueError(f"Expected ':' after key {key!r} in {path}")
+            position += 1
+            skip()
+            yield key, decode()
+
+
+def iter_json_lines(path: str) -> Iterator[Tuple[str, Any]]:
+    """Yield (url, row) pairs from a JSON lines file."""
+    with open(path, "r", encoding="utf-8") as file:
+        for line in file:
+            if line.strip():
+                row = json.loads(line)
+                yield row["url"], row
+
+
+def to_profile_row(url: str, data: Any) -> Dict[str, Any]:
+    """Map a seed entry onto DBProfile columns."""
+    if isinstance(data, dict) and "scrapped_data" in data:
+        row = {"url": url, "person": data.get("person") or url}
+        row["scrapped_data"] = data["scrapped_data"]
+        if data.get("bio") is not None:
+            row["bio"] = data["bio"]
+        return row
+
+    person = url
+    if isinstance(data, dict):
+        person = (
+            data.get("full_name")
+            or " ".join(filter(None, (data.get("first_name"), data.get("last_name"))))
+            or url
+        )
+    scrapped_data = data if isinstance(data, str) else json.dumps(data)
+    return {"url": url, "person": person, "scrapped_data": scrapped_data}
+
+
+def iter_seed_rows(path: str) -> Iterator[Dict[str, Any]]:
+    entries = (
+        iter_json_lines(path)
+        if path.endswith((".jsonl", ".ndjson"))
+        else (iter_json_object(path))
+    )
+    for url, data in entries:
+        yield to_profile_row(url, data)
+
+
+def iter_synthetic_rows(count: int) -> Iterator[Dict[str, Any]]:
+    """Generate count synthetic profiles, for load and timing checks."""
+    for i in range(count):
+        yield {
+            "url": f"https://www.linkedin.com/in/seed-{i}/",
+            "person": f"Seed Person {i}",
+            "scrapped_data": f"Seed Person {i} is a software engineer. " * 20,
+        }
 
-db: Session = get_db()
-models.Base.metadata.create_all(bind=engine)
 
-# Get the current working directory
-cwd = os.getcwd()
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "path",
+        nargs="?",
+        default=os.path.join(os.getcwd(), "scripts", "response.json"),
+    )
+    parser.add_argument("--batch-size", type=int, default=UPSERT_BATCH_SIZE)
+    parser.add_argument("--synthetic", type=int, help="Seed N generated profiles")
+    args = parser.parse_args()
 
-# Construct the full path to the JSON file
-file_path = os.path.join(cwd, "scripts", "response.json")
+    await init_db()
+    rows = (
+        iter_synthetic_rows(args.synthetic)
+        if args.synthetic
+        else iter_seed_rows(args.path)
+    )
+    start = time.perf_counter()
+    written = await upsert_profiles(rows, batch_size=args.batch_size)
+    print(f"Seeded {written} profiles in {time.perf_counter() - start:.2f}s")
+    await async_engine.dispose()
 
-# Load the JSON data from the file
-with open(file_path, "r") as file:
-    data = json.load(file)
 
-# Iterate over the data and save each user to the database
-for url, user_data in data.items():
-    save_new_user(url=url, scrapped_data=user_data)
+if __name__ == "__main__":
+    asyncio.run(main())